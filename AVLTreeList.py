@@ -1,641 +1,6213 @@
-#username1 - argov
-#id1       - 308447382
-#name1     - Yael Argov
-#username2 - amitrosen
-#id2       - 208279489
-#name2     - Amit Rosen
-
-"""A class representing a node in an AVL tree"""
-
-
-class AVLNode(object):
-    """Constructor. Constructs a virtual node which can be made real later.
-    @type value: str
-    @param value: data of your node
-    runtime complexity: O(1)
-    """
-    def __init__(self, value):
-        self.value = value
-        self.left = None
-        self.right = None
-        self.parent = None
-        self.height = -1
-        self.size = 0  # the size of this node's subtree
-
-    """returns the left child
-    @rtype: AVLNode
-    @returns: the left child of self, None if there is no left child
-    runtime complexity: O(1)
-    """
-    def getLeft(self):
-        if self.height != -1:
-            return self.left
-        return None
-
-    """returns the right child
-    @rtype: AVLNode
-    @returns: the right child of self, None if there is no right child
-    runtime complexity: O(1)
-    """
-    def getRight(self):
-        if self.height != -1:
-            return self.right
-        return None
-
-    """returns the parent 
-    @rtype: AVLNode
-    @returns: the parent of self, None if there is no parent
-    runtime complexity: O(1)
-    """
-    def getParent(self):
-        return self.parent
-
-    """return the value
-    @rtype: str
-    @returns: the value of self, None if the node is virtual
-    runtime complexity: O(1)
-    """
-    def getValue(self):
-        if self.height != -1:
-            return self.value
-        return None
-
-    """returns the height
-    @rtype: int
-    @returns: the height of self, -1 if the node is virtual
-    runtime complexity: O(1)
-    """
-    def getHeight(self):
-        return self.height
-
-    """returns the size
-    @rtype: int
-    @returns: the size of self, 0 if the node is virtual
-    runtime complexity: O(1)
-    """
-    def getSize(self):
-        return self.size
-
-    """sets left child
-    @type node: AVLNode
-    @param node: a node
-    runtime complexity: O(1)
-    """
-    def setLeft(self, node):
-        self.left = node
-
-    """sets right child
-    @type node: AVLNode
-    @param node: a node
-    runtime complexity: O(1)
-    """
-    def setRight(self, node):
-        self.right = node
-
-    """sets parent
-    @type node: AVLNode
-    @param node: a node
-    runtime complexity: O(1)
-    """
-    def setParent(self, node):
-        self.parent = node
-
-    """sets value
-    @type value: str
-    @param value: data
-    runtime complexity: O(1)
-    """
-    def setValue(self, value):
-        self.value = value
-
-    """sets the height of the node
-    @type h: int
-    @param h: the height
-    runtime complexity: O(1)
-    """
-    def setHeight(self, h):
-        self.height = h
-
-    """sets the size of the node
-    @type s: int
-    @param s: the size
-    runtime complexity: O(1)
-    """
-
-    def setSize(self, s):
-        self.size = s
-
-    """returns whether self is not a virtual node 
-    @rtype: bool
-    @returns: False if self is a virtual node, True otherwise.
-    runtime complexity: O(1)
-    """
-    def isRealNode(self):
-        return self.height != -1
-
-    """returns whether self is a virtual node 
-    @rtype: bool
-    @returns: True if self is a virtual node, False otherwise.
-    runtime complexity: O(1)
-    """
-    def isVirtual(self):
-        return self.height == -1
-
-    """turns a virtual node real
-    @pre: self is virtual
-    runtime complexity: O(1)
-    """
-    def makeReal(self):
-        self.height += 1
-        self.size = 1
-        self.right = AVLNode(None)
-        self.right.setParent(self)
-        self.left = AVLNode(None)
-        self.left.setParent(self)
-
-    """turns a real node virtual
-    @pre: self is virtual
-    runtime complexity: O(1)
-    """
-    def makeVirtual(self):
-        self.height = -1
-        self.size = 0
-        self.value = None
-        self.right.setParent(None)
-        self.left.setParent(None)
-        self.right = None
-        self.left = None
-
-    """updates the height of the (non-virtual) node
-    runtime complexity: O(1)
-    """
-    def updateHeight(self):
-        if self.height != -1:
-            self.height = max(self.right.getHeight(), self.left.getHeight()) + 1
-
-    """updates the size of the (non-virtual) node
-    runtime complexity: O(1)
-    """
-    def updateSize(self):
-        if self.height != -1:
-            self.size = self.right.getSize() + self.left.getSize() + 1
-
-
-"""
-A class implementing the ADT list, using an AVL tree.
-"""
-
-
-class AVLTreeList(object):
-
-    """
-    Constructor.
-    runtime complexity: O(1)
-    """
-    def __init__(self):
-        self.root = AVLNode(None)  # constructs a virtual node as the root
-
-    """returns whether the list is empty
-    @rtype: bool
-    @returns: True if the list is empty, False otherwise
-    runtime complexity: O(1)
-    """
-    def empty(self):
-        return self.root.isVirtual()
-
-    """retrieves the i'th item in the list
-    @type i: int
-    @pre: 0 <= i < self.length()
-    @param i: index in the list
-    @rtype: AVLNode
-    @returns: the i'th item in the list
-    runtime complexity: O(logn) where n is the size of the tree
-    """
-    def retrieveNode(self, i):
-        index = i + 1
-        current = self.root
-        while current.isRealNode():  # current will never be virtual so current.child will never be None
-            currentRank = current.getLeft().getSize() + 1
-            if currentRank == index:
-                return current
-            if currentRank > index:
-                current = current.getLeft()
-            else:
-                index = index - currentRank
-                current = current.getRight()
-
-    """retrieves the value of the i'th item in the list
-    @type i: int
-    @pre: 0 <= i < self.length()
-    @param i: index in the list
-    @rtype: str
-    @returns: the value of the i'th item in the list
-    runtime complexity: O(logn) where n is the size of the tree
-    """
-    def retrieve(self, i):
-        return self.retrieveNode(i).getValue()
-
-    """returns the rightmost node in the given node's subtree
-    @type node: AVLNode
-    @pre: node.isRealNode == True
-    @param node: The given node
-    @rtype: AVLNode
-    @returns: the rightmost node in the given node's subtree
-    runtime complexity: O(logn) where n is the size of the (sub)tree
-    """
-    def getMax(self, node):
-        current = node
-        while current.getRight().isRealNode():
-            current = current.getRight()
-        return current
-
-    """returns the leftmost node in the given node's subtree
-    @type node: AVLNode
-    @pre: node.isRealNode == True
-    @param node: The given node
-    @rtype: AVLNode
-    @returns: the leftmost node in the given node's subtree
-    runtime complexity: O(logn) where n is the size of the (sub)tree
-    """
-    def getMin(self, node):
-        current = node
-        while current.getLeft().isRealNode():
-            current = current.getLeft()
-        return current
-
-    """returns the predecessor of the given node, None if the given node is the min-ranked node in the tree
-    @type node: AVLNode
-    @pre: node.isRealNode == True
-    @param node: The given node
-    @rtype: AVLNode
-    @returns: the predecessor of the given node, None if the given node is the min-ranked node in the tree
-    runtime complexity: O(logn) where n is the size of the tree
-    """
-    def getPredecessor(self, node):
-        if node.getLeft().isRealNode():
-            return self.getMax(node.getLeft())
-        current = node
-        parent = current.getParent()
-        while (parent is not None) and (current is parent.getLeft()):
-            current = parent
-            parent = parent.getParent()
-        return parent
-
-    """returns the successor of the given node, None if the given node is the max-ranked node in the tree
-    @type node: AVLNode
-    @pre: node.isRealNode == True
-    @param node: The given node
-    @rtype: AVLNode
-    @returns: the successor of the given node, None if the given node is the max-ranked node in the tree
-    runtime complexity: O(logn) where n is the size of the tree
-    """
-    def getSuccessor(self, node):
-        if node.getRight().isRealNode():
-            return self.getMin(node.getRight())
-        current = node
-        parent = current.getParent()
-        while (parent is not None) and (current is parent.getRight()):
-            current = parent
-            parent = parent.getParent()
-        return parent
-
-    """inserts val at position i in the list
-    @type i: int
-    @pre: 0 <= i <= self.length()
-    @param i: The intended index in the list to which we insert val
-    @type val: str
-    @param val: the value we insert
-    @rtype: list
-    @returns: the number of rebalancing operation due to AVL rebalancing
-    runtime complexity: O(logn) where n is the size of the tree
-    """
-    def insert(self, i, val):
-        if i == self.root.getSize():
-            if i == 0:
-                newNode = self.root
-            else:
-                newNode = self.getMax(self.root).getRight()
-        else:  # i < self.root.getSize()
-            current = self.retrieveNode(i)
-            if current.getLeft().isVirtual():
-                newNode = current.getLeft()
-            else:
-                current = self.getPredecessor(current)
-                newNode = current.getRight()
-        newNode.setValue(val)
-        newNode.makeReal()
-        return self.FixTree(newNode.getParent())
-
-    """rotates the given node left
-    @type node: AVLNode
-    @pre: node and node.left are real nodes
-    @param i: The given node
-    runtime complexity: O(1)
-    """
-    def rotateRight(self, node):
-        pivot = node.getLeft()
-        node.setLeft(pivot.getRight())
-        node.getLeft().setParent(node)
-        pivot.setRight(node)
-        pivot.setParent(node.getParent())
-        if pivot.getParent() is None:
-            self.root = pivot
-        elif pivot.getParent().getRight() is node:
-            pivot.getParent().setRight(pivot)
-        else:
-            pivot.getParent().setLeft(pivot)
-        node.setParent(pivot)
-        node.updateHeight()
-        node.updateSize()
-        pivot.updateHeight()
-        pivot.updateSize()
-
-    """rotates the given node right
-    @type node: AVLNode
-    @pre: node and node.right are real nodes
-    @param i: The given node
-    runtime complexity: O(1)
-    """
-    def rotateLeft(self, node):
-        pivot = node.getRight()
-        node.setRight(pivot.getLeft())
-        node.getRight().setParent(node)
-        pivot.setLeft(node)
-        pivot.setParent(node.getParent())
-        if pivot.getParent() is None:
-            self.root = pivot
-        elif pivot.getParent().getLeft() is node:
-            pivot.getParent().setLeft(pivot)
-        else:
-            pivot.getParent().setRight(pivot)
-        node.setParent(pivot)
-        node.updateHeight()
-        node.updateSize()
-        pivot.updateHeight()
-        pivot.updateSize()
-
-    """receives two nodes, the first of which is the second's ancestor and makes the first node the parent of 
-    the second. The function does not change toBypass's pointers to other nodes
-    @type parent: AVLNode
-    @pre: parent is the ancestor of child, or None
-    @param parent: The given ancestor
-    @type child: AVLNode
-    @pre: child.isReal() == True
-    @param child: The given descendant
-    @type toBypass: AVLNode
-    @pre: toBypass.isReal() == True
-    @param toBypass: The parent's original child (left or right) which is to be replaced
-    runtime complexity: O(1)
-    """
-    def bypassHelper(self, parent, child, toBypass):
-        if parent is None:
-            self.root = child
-        elif parent.getLeft() is toBypass:
-            parent.setLeft(child)
-        else:
-            parent.setRight(child)
-        child.setParent(parent)
-
-    """deletes the given node
-    @type toDelete: the given node
-    @pre: toDelete.isRealNode() == True
-    @param toDelete: The given node
-    @rtype: int
-    @returns: the number of rebalancing operation due to AVL rebalancing
-    runtime complexity: O(logn)
-    """
-    def deleteNode(self, toDelete):
-        parent = toDelete.getParent()
-        if toDelete.getLeft().isVirtual() and toDelete.getRight().isVirtual():  # no children
-            toDelete.makeVirtual()
-        elif toDelete.getLeft().isVirtual() or toDelete.getRight().isVirtual():  # one child
-            child = toDelete.getLeft() if toDelete.getLeft().isRealNode() else toDelete.getRight()
-            toDelete.setParent(None)
-            toDelete.makeVirtual()
-            self.bypassHelper(parent, child, toDelete)
-            toDelete = child  # ensures that fixTree begins at the right spot
-        else:  # two children
-            # the next 4 lines save successor's information
-            successor = self.getSuccessor(toDelete)
-            sParent = successor.getParent()
-            sHeight = successor.getHeight()
-            sSize = successor.getSize()
-            # the next 2 lines save successor's new children
-            tdLeft = toDelete.getLeft()
-            tdRight = toDelete if toDelete.getRight() is successor else toDelete.getRight()
-
-            # the next 4 lines set successor's new parent(including root handling), and toDelete's if it is not\
-            # successor's new right child
-            self.bypassHelper(parent, successor, toDelete)
-            if toDelete.getRight() is not successor:
-                sParent.setLeft(toDelete)  # toDelete's new parent is successor's parent
-                toDelete.setParent(sParent)
-            # the next 8 lines set toDelete's and successor's new children
-            toDelete.setLeft(successor.getLeft())
-            toDelete.getLeft().setParent(toDelete)
-            toDelete.setRight(successor.getRight())
-            toDelete.getRight().setParent(toDelete)
-            successor.setLeft(tdLeft)
-            successor.getLeft().setParent(successor)
-            successor.setRight(tdRight)
-            successor.getRight().setParent(successor)
-            # the next 4 lines update toDelete's and successor's new heights and sizes
-            successor.setHeight(toDelete.getHeight())
-            successor.setSize(toDelete.getSize())
-            toDelete.setHeight(sHeight)
-            toDelete.setSize(sSize)
-
-            return self.deleteNode(toDelete)  # recursive call - deletes according to "no children" or "one child"
-        return self.FixTree(toDelete.getParent())
-
-    """deletes the i'th item in the list
-    @type i: int
-    @pre: 0 <= i < self.length()
-    @param i: The intended index in the list to be deleted
-    @rtype: int
-    @returns: the number of rebalancing operation due to AVL rebalancing
-    runtime complexity: O(logn)
-    """
-    def delete(self, i):
-        toDelete = self.retrieveNode(i)
-        return self.deleteNode(toDelete)
-
-    """Fixes the tree's balance, heights and sizes of node after insertion or deletion
-    @type node: AVLNode
-    @pre: node is not virtual (can be real or None)
-    @param node: the first node to be fixed
-    @rtype: int
-    @returns: the number of rebalancing operation due to AVL rebalancing
-    runtime complexity: O(logn)
-    """
-    def FixTree(self, node):
-        current = node
-        counter = 0
-        while current is not None:
-            BF = current.getLeft().getHeight() - current.getRight().getHeight()  # checks balance
-            if BF == -2:
-                pivot = current.getRight()
-                pivotBF = pivot.getLeft().getHeight() - pivot.getRight().getHeight()
-                if pivotBF == 1:
-                    self.rotateRight(pivot)
-                    counter += 1
-                self.rotateLeft(current)
-                counter += 1
-            elif BF == 2:
-                pivot = current.getLeft()
-                pivotBF = pivot.getLeft().getHeight() - pivot.getRight().getHeight()
-                if pivotBF == -1:
-                    self.rotateLeft(pivot)
-                    counter += 1
-                self.rotateRight(current)
-                counter += 1
-            else:  # new balance ops required - checks height
-                newHeight = max(current.getLeft().getHeight(), current.getRight().getHeight()) + 1
-                if newHeight is not current.getHeight():
-                    current.setHeight(newHeight)
-                    counter += 1
-            current.updateSize()
-            current = current.getParent()
-        return counter
-
-    """returns the value of the first item in the list
-    @rtype: str
-    @returns: the value of the first item, None if the list is empty
-    runtime complexity: O(logn)
-    """
-    def first(self):
-        if self.root.isVirtual():
-            return None
-        return self.retrieveNode(0).getValue()
-
-    """returns the value of the last item in the list
-    @rtype: str
-    @returns: the value of the last item, None if the list is empty
-    runtime complexity: O(logn)
-    """
-    def last(self):
-        if self.root.isVirtual():
-            return None
-        return self.retrieveNode(self.root.getSize() - 1).getValue()
-
-    """returns an array representing list 
-
-    @rtype: list
-    @returns: a list of strings representing the data structure
-    runtime complexity: O(n)
-    """
-    def listToArray(self):
-        list = []
-        if self.root.isVirtual():
-            return list
-        current = self.getMin(self.root)
-        while current is not None:
-            list.append(current.getValue())
-            current = self.getSuccessor(current)
-        return list
-
-    """returns the size of the list 
-
-    @rtype: int
-    @returns: the size of the list
-    runtime complexity: O(1)
-    """
-    def length(self):
-        return self.root.getSize()
-
-    """splits the list at the i'th index
-    @type i: int
-    @pre: 0 <= i < self.length()
-    @param i: The intended index in the list according to which we split the tree
-    @rtype: list
-    @returns: a list [left, val, right], where left is an AVLTreeList representing the list until index i-1,
-    right is an AVLTreeList representing the list from index i+1, and val is the value at the i'th index.
-    runtime complexity: O(log^2(n))
-    """
-    def split(self, i):
-        left = AVLTreeList()
-        right = AVLTreeList()
-        x = self.retrieveNode(i)
-        val = x.getValue()
-        left.root = x.getLeft()
-        right.root = x.getRight()
-        x.makeVirtual()
-        current = x
-        while current.getParent() is not None:
-            parent = current.getParent()
-            tempVal = parent.getValue()
-            subtree = AVLTreeList()
-            subtree.root = parent.getLeft() if parent.getRight() is current else parent.getRight()
-            dir = 0 if parent.getRight() is current else 1  # remembers the order in which the trees should be joined \
-                                                            # once parent is made virtual
-            parent.makeVirtual()
-            if dir == 0:
-                subtree.insert(subtree.length(), tempVal)
-                subtree.concat(left)
-                left.root = subtree.root  # since concat always updates self and destroys the given list
-            else:
-                right.insert(right.length(), tempVal)
-                right.concat(subtree)
-            current = parent
-        return [left, val, right]
-
-    """concatenates lst to self
-    @type lst: AVLTreeList
-    @param lst: a list to be concatenated after self
-    @rtype: int
-    @returns: the absolute value of the difference between the height of the AVL trees joined
-    runtime complexity: O(logn)
-    """
-    def concat(self, lst):
-        diff = abs(self.root.getHeight() - lst.root.getHeight())
-        smallTree = self if self.root.getHeight() <= lst.root.getHeight() else lst
-        bigTree = lst if self.root.getHeight() <= lst.root.getHeight() else self
-        if smallTree.root.getSize() != 0:  # neither of the trees are empty
-            # the next 3 lines create a copy of the last node in self and delete the original node
-            x = AVLNode(self.last())
-            x.makeReal()
-            self.delete(self.root.getSize() - 1)
-            current = bigTree.root
-
-            while current.getHeight() > smallTree.root.getHeight():
-                current = current.getLeft() if smallTree is self else current.getRight()
-            # the next 5 lines "plant" the copied node in big tree and set its children
-            bigTree.bypassHelper(current.getParent(), x, current)
-            x.setLeft(self.root) if smallTree is self else x.setLeft(current)
-            x.getLeft().setParent(x)
-            x.setRight(current) if smallTree is self else x.setRight(lst.root)
-            x.getRight().setParent(x)
-
-            bigTree.FixTree(x)
-        self.root = bigTree.root
-        lst.root = AVLNode(None)
-        return diff
-
-    """searches for a *value* in the list
-    @type val: str
-    @param val: a value to be searched
-    @rtype: int
-    @returns: the first index that contains val, -1 if not found.
-    runtime complexity: O(n)
-    """
-    def search(self, val):
-        counter = 0
-        if self.root.isVirtual():
-            return -1
-        current = self.getMin(self.root)
-        while current is not None:
-            if current.getValue() is val:
-                return counter
-            current = self.getSuccessor(current)
-            counter += 1
-        return -1
-
-    """returns the root of the tree representing the list
-    @rtype: AVLNode
-    @returns: the root, None if the list is empty
-    runtime complexity: O(1)
-    """
-    def getRoot(self):
-        if self.root.isVirtual():
-            return None
-        return self.root
+#username1 - argov
+#id1       - 308447382
+#name1     - Yael Argov
+#username2 - amitrosen
+#id2       - 208279489
+#name2     - Amit Rosen
+
+import asyncio
+import inspect
+import os
+import pickle
+import random
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import accumulate, chain
+from mmap import ACCESS_READ, mmap as memoryMap
+from operator import attrgetter, methodcaller
+from weakref import WeakSet
+
+"""A class representing a node in an AVL tree"""
+
+
+class AVLNode(object):
+    __slots__ = ('value', 'left', 'right', 'parent', 'height', 'size', 'epoch')
+    currentEpoch = 0  # the epoch of the latest snapshot of any list, see AVLTreeList.snapshot
+
+    """Constructor. Constructs a virtual node which can be made real later.
+    @type value: str
+    @param value: data of your node
+    runtime complexity: O(1)
+    """
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+        self.parent = None
+        self.height = -1
+        self.size = 0  # the size of this node's subtree
+        self.epoch = AVLNode.currentEpoch  # no snapshot taken so far holds the node, see AVLTreeList.own
+
+    """returns the left child
+    @rtype: AVLNode
+    @returns: the left child of self, None if there is no left child
+    runtime complexity: O(1)
+    """
+    def getLeft(self):
+        if self.height != -1:
+            return self.left
+        return None
+
+    """returns the right child
+    @rtype: AVLNode
+    @returns: the right child of self, None if there is no right child
+    runtime complexity: O(1)
+    """
+    def getRight(self):
+        if self.height != -1:
+            return self.right
+        return None
+
+    """returns the parent 
+    @rtype: AVLNode
+    @returns: the parent of self, None if there is no parent
+    runtime complexity: O(1)
+    """
+    def getParent(self):
+        return self.parent
+
+    """return the value
+    @rtype: str
+    @returns: the value of self, None if the node is virtual
+    runtime complexity: O(1)
+    """
+    def getValue(self):
+        if self.height != -1:
+            return self.value
+        return None
+
+    """returns the height
+    @rtype: int
+    @returns: the height of self, -1 if the node is virtual
+    runtime complexity: O(1)
+    """
+    def getHeight(self):
+        return self.height
+
+    """returns the size
+    @rtype: int
+    @returns: the size of self, 0 if the node is virtual
+    runtime complexity: O(1)
+    """
+    def getSize(self):
+        return self.size
+
+    """sets left child
+    @type node: AVLNode
+    @param node: a node
+    runtime complexity: O(1)
+    """
+    def setLeft(self, node):
+        self.left = node
+
+    """sets right child
+    @type node: AVLNode
+    @param node: a node
+    runtime complexity: O(1)
+    """
+    def setRight(self, node):
+        self.right = node
+
+    """sets parent
+    @type node: AVLNode
+    @param node: a node
+    runtime complexity: O(1)
+    """
+    def setParent(self, node):
+        self.parent = node
+
+    """sets value
+    @type value: str
+    @param value: data
+    runtime complexity: O(1)
+    """
+    def setValue(self, value):
+        self.value = value
+
+    """sets the height of the node
+    @type h: int
+    @param h: the height
+    runtime complexity: O(1)
+    """
+    def setHeight(self, h):
+        self.height = h
+
+    """sets the size of the node
+    @type s: int
+    @param s: the size
+    runtime complexity: O(1)
+    """
+
+    def setSize(self, s):
+        self.size = s
+
+    """returns whether self is not a virtual node 
+    @rtype: bool
+    @returns: False if self is a virtual node, True otherwise.
+    runtime complexity: O(1)
+    """
+    def isRealNode(self):
+        return self.height != -1
+
+    """returns whether self is a virtual node 
+    @rtype: bool
+    @returns: True if self is a virtual node, False otherwise.
+    runtime complexity: O(1)
+    """
+    def isVirtual(self):
+        return self.height == -1
+
+    """turns a virtual node real, both of its children are the shared virtual leaf
+    @pre: self is virtual
+    runtime complexity: O(1)
+    """
+    def makeReal(self):
+        self.height = 0
+        self.size = 1
+        self.right = VIRTUAL
+        self.left = VIRTUAL
+
+    """turns a real node virtual
+    @pre: self is real
+    runtime complexity: O(1)
+    """
+    def makeVirtual(self):
+        self.height = -1
+        self.size = 0
+        self.value = None
+        if self.right.isRealNode():
+            self.right.setParent(None)
+        if self.left.isRealNode():
+            self.left.setParent(None)
+        self.right = None
+        self.left = None
+
+    """updates the height of the (non-virtual) node
+    runtime complexity: O(1)
+    """
+    def updateHeight(self):
+        if self.height != -1:
+            self.height = max(self.right.getHeight(), self.left.getHeight()) + 1
+
+    """updates the size of the (non-virtual) node
+    runtime complexity: O(1)
+    """
+    def updateSize(self):
+        if self.height != -1:
+            self.size = self.right.getSize() + self.left.getSize() + 1
+
+    """returns a new node with the same fields as self, pointing to the same children and parent
+    @rtype: AVLNode
+    @returns: the copy
+    runtime complexity: O(1)
+    """
+    def copy(self):
+        node = object.__new__(type(self))
+        node.value = self.value
+        AVLNode.left.__set__(node, AVLNode.left.__get__(self))  # the slots themselves, under any child properties
+        AVLNode.right.__set__(node, AVLNode.right.__get__(self))
+        node.parent = self.parent
+        node.height = self.height
+        node.size = self.size
+        node.epoch = self.epoch
+        return node
+
+
+"""A class representing the virtual leaf shared by all the trees. Every real node whose child is missing points to
+the single instance VIRTUAL, so a list of n items holds n nodes instead of 3n. The instance is immutable, so a
+forgotten write to a leaf fails loudly instead of corrupting every tree at once.
+"""
+
+
+class VirtualNode(AVLNode):
+    __slots__ = ()
+
+    """Constructor. Constructs the shared virtual leaf, should only be called once (see VIRTUAL)
+    runtime complexity: O(1)
+    """
+    def __init__(self):
+        for attr, val in (('value', None), ('left', None), ('right', None), ('parent', None), ('height', -1),
+                          ('size', 0), ('epoch', 0)):
+            object.__setattr__(self, attr, val)
+
+    """refuses any change of the shared virtual leaf
+    @raises AttributeError: always
+    runtime complexity: O(1)
+    """
+    def __setattr__(self, name, value):
+        raise AttributeError("the shared virtual leaf is immutable")
+
+
+VIRTUAL = VirtualNode()
+
+
+"""the default measure of an Augmentation, which maps a value to itself. It is defined at the top of the module so
+that augmentations using it can be pickled
+@type val: object
+@param val: a value
+@rtype: object
+@returns: val
+runtime complexity: O(1)
+"""
+def identityMeasure(val):
+    return val
+
+
+"""A class representing a monoid maintained over every subtree of a tree: the aggregate of a subtree is the
+combination, in order, of the measures of its values. The size of a subtree is the instance
+Augmentation(operator.add, 0, lambda val: 1), which is kept in its own field since every operation needs it.
+"""
+
+
+class Augmentation(object):
+
+    """Constructor.
+    @type combine: function
+    @param combine: an associative function of two aggregates
+    @type identity: object
+    @param identity: the aggregate of an empty subtree, the identity element of combine
+    @type measure: function
+    @param measure: maps a value to its aggregate (optional, the value itself by default)
+    runtime complexity: O(1)
+    """
+    def __init__(self, combine, identity, measure=None):
+        self.combine = combine
+        self.identity = identity
+        self.measure = measure if measure is not None else identityMeasure
+        # every augmentation gets its own node class, so nodes find it without a pointer of their own
+        self.nodeClass = type('AugmentedNode', (AugmentedNode,), {'__slots__': (), 'augmentation': self})
+
+    """returns the state of the augmentation for pickle, without its node class, which is made at runtime
+    @rtype: dict
+    @returns: the state of the augmentation
+    runtime complexity: O(1)
+    """
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['nodeClass']
+        return state
+
+    """restores the augmentation from a state made by __getstate__, with a node class of its own
+    @type state: dict
+    @param state: the state of the augmentation
+    runtime complexity: O(1)
+    """
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.nodeClass = type('AugmentedNode', (AugmentedNode,), {'__slots__': (), 'augmentation': self})
+
+    """returns the aggregate of the given subtree
+    @type node: AVLNode
+    @param node: the root of the subtree (may be virtual)
+    @rtype: object
+    @returns: the aggregate of node's subtree, the identity if node is virtual
+    runtime complexity: O(1)
+    """
+    def aggregate(self, node):
+        if node.height == -1:
+            return self.identity
+        return node.agg
+
+
+"""A class representing a node that also keeps the aggregate of its subtree under the augmentation of its class"""
+
+
+class AugmentedNode(AVLNode):
+    __slots__ = ('agg',)
+    augmentation = None  # set on the node class of each Augmentation
+
+    """turns a virtual node real, its aggregate is the measure of its value
+    @pre: self is virtual
+    runtime complexity: O(1)
+    """
+    def makeReal(self):
+        AVLNode.makeReal(self)
+        self.agg = self.augmentation.measure(self.value)
+
+    """updates the size and the aggregate of the (non-virtual) node
+    runtime complexity: O(1), not counting the augmentation's functions
+    """
+    def updateSize(self):
+        if self.height != -1:
+            self.size = self.right.size + self.left.size + 1
+            aug = self.augmentation
+            self.agg = aug.combine(aug.combine(aug.aggregate(self.left), aug.measure(self.value)),
+                                   aug.aggregate(self.right))
+
+    """returns a new node with the same fields and aggregate as self, see AVLNode.copy
+    @rtype: AugmentedNode
+    @returns: the copy
+    runtime complexity: O(1)
+    """
+    def copy(self):
+        node = AVLNode.copy(self)
+        node.agg = self.agg
+        return node
+
+
+"""A class representing a node of a list balanced as a treap (see AVLTreeList): on top of the tree order, the nodes
+are heap ordered by a random priority, so no parent has a lower priority than its children. Its height is the true
+height of its subtree, which the treap does not bound by itself.
+"""
+
+
+class TreapNode(AVLNode):
+    __slots__ = ('priority',)
+
+    """Constructor. Constructs a virtual node which can be made real later.
+    @type value: str
+    @param value: data of your node
+    runtime complexity: O(1)
+    """
+    def __init__(self, value):
+        self.priority = random.random()
+        AVLNode.__init__(self, value)
+
+    """returns a new node with the same fields and priority as self, see AVLNode.copy
+    @rtype: TreapNode
+    @returns: the copy
+    runtime complexity: O(1)
+    """
+    def copy(self):
+        node = AVLNode.copy(self)
+        node.priority = self.priority
+        return node
+
+
+"""A class representing a node whose value is a chunk of consecutive items of a ChunkedAVLTreeList (a python list or
+an array). The size of a chunk node counts items, not nodes.
+"""
+
+
+class ChunkNode(AVLNode):
+    __slots__ = ()
+
+    """turns a virtual node real, its size is the length of its chunk
+    @pre: self is virtual
+    runtime complexity: O(1)
+    """
+    def makeReal(self):
+        AVLNode.makeReal(self)
+        self.size = len(self.value)
+
+    """updates the size of the (non-virtual) node
+    runtime complexity: O(1)
+    """
+    def updateSize(self):
+        if self.height != -1:
+            self.size = self.right.size + self.left.size + len(self.value)
+
+    """returns a new node with the same fields as self and a copy of its chunk, which is edited in place
+    @rtype: ChunkNode
+    @returns: the copy
+    runtime complexity: O(k) where k is the length of the chunk
+    """
+    def copy(self):
+        node = AVLNode.copy(self)
+        node.value = self.value[:]
+        return node
+
+
+"""A class representing the affine map x -> a * x + b, a value transform of TaggedAVLTreeList.mapRange whose
+compositions stay a single affine map instead of a chain of functions.
+"""
+
+
+class AffineMap(object):
+    __slots__ = ('a', 'b')
+
+    """Constructor.
+    @type a: number
+    @param a: the factor
+    @type b: number
+    @param b: the offset
+    runtime complexity: O(1)
+    """
+    def __init__(self, a, b):
+        self.a = a
+        self.b = b
+
+    """applies the map
+    @type x: number
+    @param x: a value
+    @rtype: number
+    @returns: a * x + b
+    runtime complexity: O(1)
+    """
+    def __call__(self, x):
+        return self.a * x + self.b
+
+    """returns the map applying f after self
+    @type f: AffineMap
+    @param f: an affine map
+    @rtype: AffineMap
+    @returns: the composition x -> f(self(x))
+    runtime complexity: O(1)
+    """
+    def then(self, f):
+        return AffineMap(f.a * self.a, f.a * self.b + f.b)
+
+
+"""A class representing the composition of two value transforms of TaggedAVLTreeList.mapRange, applied without
+recursion so that a long chain of pending transforms cannot overflow the stack.
+"""
+
+
+class ChainedMap(object):
+    __slots__ = ('first', 'second')
+
+    """Constructor.
+    @type first: function
+    @param first: the transform applied first (may itself be a ChainedMap)
+    @type second: function
+    @param second: the transform applied to the result of first
+    runtime complexity: O(1)
+    """
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+
+    """applies the chain
+    @type x: object
+    @param x: a value
+    @rtype: object
+    @returns: second(first(x))
+    runtime complexity: O(k) where k is the number of transforms in the chain
+    """
+    def __call__(self, x):
+        transforms = []
+        current = self
+        while isinstance(current, ChainedMap):
+            transforms.append(current.second)
+            current = current.first
+        x = current(x)
+        for transform in reversed(transforms):
+            x = transform(x)
+        return x
+
+
+"""A class representing a node of a TaggedAVLTreeList. Its own value and the order of its own children are up to
+date, while its tags are pending for the nodes below it: flipped says that both of its subtrees must be mirrored,
+transform is a function still to be applied to every value below it (None if there is none). Reading or writing a
+child first pushes the tags one level down, so every walk of the tree, including the rotations, join and split
+inherited from AVLTreeList, sees the subtrees it passes through up to date.
+"""
+
+
+class TaggedNode(AVLNode):
+    __slots__ = ('flipped', 'transform')
+
+    """Constructor. Constructs a virtual node which can be made real later.
+    @type value: str
+    @param value: data of your node
+    runtime complexity: O(1)
+    """
+    def __init__(self, value):
+        self.flipped = False
+        self.transform = None
+        AVLNode.__init__(self, value)
+
+    """applies tags to the whole subtree of self: mirrors it and transforms its values. Self is updated at once, the
+    nodes below it later, when pushDown reaches them
+    @type flipped: bool
+    @param flipped: whether to mirror the subtree
+    @type transform: function
+    @param transform: a function of a value (may be None)
+    runtime complexity: O(1)
+    """
+    def tag(self, flipped, transform):
+        if flipped:
+            left = AVLNode.left.__get__(self)
+            AVLNode.left.__set__(self, AVLNode.right.__get__(self))
+            AVLNode.right.__set__(self, left)
+            self.flipped = not self.flipped
+        if transform is not None:
+            self.value = transform(self.value)
+            if self.transform is None:
+                self.transform = transform
+            elif isinstance(transform, AffineMap) and isinstance(self.transform, AffineMap):
+                self.transform = self.transform.then(transform)
+            else:
+                self.transform = ChainedMap(self.transform, transform)
+
+    """pushes the tags of self to its children and clears them. A child of an earlier epoch than self may be shared
+    with a snapshot that does not hold self, so it is replaced by a copy of the epoch of self first
+    runtime complexity: O(1)
+    """
+    def pushDown(self):
+        if self.flipped or self.transform is not None:
+            for slot in (AVLNode.left, AVLNode.right):
+                child = slot.__get__(self)
+                if child is not None and child.height != -1:
+                    if child.epoch < self.epoch:
+                        child = child.copy()
+                        child.epoch = self.epoch
+                        child.parent = self
+                        for grandchild in (AVLNode.left.__get__(child), AVLNode.right.__get__(child)):
+                            if grandchild.height != -1:
+                                grandchild.parent = child
+                        slot.__set__(self, child)
+                    child.tag(self.flipped, self.transform)
+            self.flipped = False
+            self.transform = None
+
+    """returns a new node with the same fields and tags as self, see AVLNode.copy
+    @rtype: TaggedNode
+    @returns: the copy
+    runtime complexity: O(1)
+    """
+    def copy(self):
+        node = AVLNode.copy(self)
+        node.flipped = self.flipped
+        node.transform = self.transform
+        return node
+
+    """returns the left child, pushing the tags of self first
+    @rtype: AVLNode
+    @returns: the left child of self
+    runtime complexity: O(1)
+    """
+    def getTaggedLeft(self):
+        self.pushDown()
+        return AVLNode.left.__get__(self)
+
+    """sets the left child, pushing the tags of self to the former children first
+    @type node: AVLNode
+    @param node: a node
+    runtime complexity: O(1)
+    """
+    def setTaggedLeft(self, node):
+        self.pushDown()
+        AVLNode.left.__set__(self, node)
+
+    """returns the right child, pushing the tags of self first
+    @rtype: AVLNode
+    @returns: the right child of self
+    runtime complexity: O(1)
+    """
+    def getTaggedRight(self):
+        self.pushDown()
+        return AVLNode.right.__get__(self)
+
+    """sets the right child, pushing the tags of self to the former children first
+    @type node: AVLNode
+    @param node: a node
+    runtime complexity: O(1)
+    """
+    def setTaggedRight(self, node):
+        self.pushDown()
+        AVLNode.right.__set__(self, node)
+
+    left = property(getTaggedLeft, setTaggedLeft)
+    right = property(getTaggedRight, setTaggedRight)
+
+
+"""A class representing a node loaded from a dump whose children are still only in the file. Its left slot holds the
+pair [source, lo], where source is the ListFile and lo the index of the first item of the subtree, whose shape is
+implied by its size (see ListFile.node). Reading or writing a child loads both children and turns the node into a
+plain AVLNode, so the tree pays for laziness only on nodes that were never reached.
+"""
+
+
+class LazyNode(AVLNode):
+    __slots__ = ()
+
+    """loads both children of the node from the file and turns it into a plain AVLNode. The children are of the
+    epoch of the node, so a snapshot that shares the node shares them too
+    runtime complexity: O(1)
+    """
+    def expand(self):
+        source, lo = AVLNode.left.__get__(self)
+        hi = lo + self.size
+        mid = (lo + hi) // 2
+        self.__class__ = AVLNode
+        self.left = source.node(lo, mid, self)
+        self.right = source.node(mid + 1, hi, self)
+        for child in (self.left, self.right):
+            if child.height != -1:
+                child.epoch = self.epoch
+        source.pending -= 1
+        if not source.pending:
+            source.close()
+
+    """returns the left child, loading it first
+    @rtype: AVLNode
+    @returns: the left child of self
+    runtime complexity: O(1)
+    """
+    def getLazyLeft(self):
+        self.expand()
+        return self.left
+
+    """sets the left child, loading the children first
+    @type node: AVLNode
+    @param node: a node
+    runtime complexity: O(1)
+    """
+    def setLazyLeft(self, node):
+        self.expand()
+        self.left = node
+
+    """returns the right child, loading it first
+    @rtype: AVLNode
+    @returns: the right child of self
+    runtime complexity: O(1)
+    """
+    def getLazyRight(self):
+        self.expand()
+        return self.right
+
+    """sets the right child, loading the children first
+    @type node: AVLNode
+    @param node: a node
+    runtime complexity: O(1)
+    """
+    def setLazyRight(self, node):
+        self.expand()
+        self.right = node
+
+    left = property(getLazyLeft, setLazyLeft)
+    right = property(getLazyRight, setLazyRight)
+
+
+"""A class representing a list file written by AVLTreeList.dump. The file starts with a header (see HEADER). With a
+typecode, the values follow as the raw buffer of an array. Without one, an array of n + 1 offsets follows, then the
+pickled values: the i'th value is the bytes between offsets i and i + 1 of the data following the offsets. Both
+layouts find any value in O(1), so a memory mapped file can be read one node at a time. The memory map is closed
+once the last node still in the file is loaded (see AVLTreeList.close), or else when the nodes holding it are freed.
+"""
+
+
+class ListFile(object):
+    MAGIC = b'AVLL'
+    VERSION = 1
+    HEADER = struct.Struct('<4sBccq')  # magic, version, byte order ('l' or 'b'), typecode (b'\0' for pickled), n
+    OFFSET = struct.Struct('q')
+
+    """Constructor. Reads the header of a list file
+    @type buffer: bytes or mmap
+    @param buffer: the content of the file
+    @raises ValueError: if buffer is not a list file written on a machine of the same byte order
+    runtime complexity: O(1)
+    """
+    def __init__(self, buffer):
+        magic, version, byteorder, typecode, n = self.HEADER.unpack_from(buffer, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("not a list file")
+        if byteorder.decode() != sys.byteorder[0]:
+            raise ValueError("the list file was written on a machine of another byte order")
+        self.buffer = buffer
+        self.length = n
+        self.typecode = None if typecode == b'\0' else typecode.decode()
+        self.start = self.HEADER.size  # where the values, or their offsets, begin
+        self.pending = 0  # the number of lazy nodes whose children are still in the file, see node
+        if self.typecode is not None:
+            self.item = struct.Struct(self.typecode)
+        else:
+            self.data = self.start + self.OFFSET.size * (n + 1)  # where the pickled values begin
+
+    """writes the values of a list to a list file. The values are written to a temporary file next to it, which then
+    replaces the file, so a list still loading its nodes from a memory map of the file keeps reading the old one
+    @type path: str
+    @param path: the path of the file
+    @type values: iterable
+    @param values: the values of the list, in order
+    @type n: int
+    @param n: the number of values
+    @type typecode: str
+    @param typecode: the typecode of the array module to write the values with (optional, pickled otherwise)
+    runtime complexity: O(n)
+    """
+    @classmethod
+    def write(cls, path, values, n, typecode=None):
+        temporary = '%s.%d.%d.tmp' % (path, os.getpid(), threading.get_ident())
+        try:
+            with open(temporary, 'wb') as f:
+                f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, sys.byteorder[0].encode(),
+                                        b'\0' if typecode is None else typecode.encode(), n))
+                if typecode is not None:
+                    f.write(array(typecode, values).tobytes())
+                else:
+                    blobs = [pickle.dumps(val, pickle.HIGHEST_PROTOCOL) for val in values]
+                    offsets = array('q', [0])
+                    for blob in blobs:
+                        offsets.append(offsets[-1] + len(blob))
+                    f.write(offsets.tobytes())
+                    f.writelines(blobs)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    """closes the memory map of the file, if the file is memory mapped. No node may be loaded from it afterwards
+    runtime complexity: O(1)
+    """
+    def close(self):
+        if isinstance(self.buffer, memoryMap):
+            self.buffer.close()
+
+    """reads the i'th value of the file
+    @type i: int
+    @pre: 0 <= i < self.length
+    @param i: index in the list
+    @rtype: object
+    @returns: the i'th value
+    runtime complexity: O(1), not counting unpickling
+    """
+    def read(self, i):
+        if self.typecode is not None:
+            return self.item.unpack_from(self.buffer, self.start + self.item.size * i)[0]
+        begin = self.OFFSET.unpack_from(self.buffer, self.start + self.OFFSET.size * i)[0]
+        end = self.OFFSET.unpack_from(self.buffer, self.start + self.OFFSET.size * (i + 1))[0]
+        return pickle.loads(self.buffer[self.data + begin:self.data + end])
+
+    """generates all the values of the file, in order
+    @rtype: generator
+    runtime complexity: O(n)
+    """
+    def values(self):
+        if self.typecode is not None:
+            values = array(self.typecode)
+            values.frombytes(self.buffer[self.start:self.start + self.item.size * self.length])
+            return iter(values)
+        return (self.read(i) for i in range(self.length))
+
+    """creates the node of the subtree holding the items lo..hi-1. The subtree is shaped by midpoints: its root holds
+    item (lo + hi) // 2, so its height is floor(log2(hi - lo)) and its children are made only when first reached
+    @type lo: int
+    @type hi: int
+    @param lo: the index of the first item
+    @param hi: one past the index of the last item
+    @type parent: AVLNode
+    @param parent: the parent of the new node (may be None)
+    @rtype: AVLNode
+    @returns: the root of the subtree, VIRTUAL if lo >= hi
+    runtime complexity: O(1)
+    """
+    def node(self, lo, hi, parent):
+        if lo >= hi:
+            return VIRTUAL
+        node = AVLNode(self.read((lo + hi) // 2))
+        node.makeReal()
+        node.parent = parent
+        if hi - lo > 1:
+            node.left = [self, lo]
+            node.right = None
+            node.__class__ = LazyNode
+            node.height = (hi - lo).bit_length() - 1
+            node.size = hi - lo
+            self.pending += 1
+        return node
+
+
+"""A class representing the journal of an AVLTreeList, see AVLTreeList.enableJournal: it writes the changes of the
+list to a file and hands them to the subscribers of AVLTreeList.changes. A change is a tuple (name, args...):
+("insert", i, val), ("delete", i), ("split", i), ("concat", values) and ("build", values), which replaces all the
+items of the list, are written as compact records, any other change as a pickled tuple. The file starts with a
+header (see HEADER), then every record is a RECORD followed by its pickled payload, if any.
+"""
+
+
+class Journal(object):
+    MAGIC = b'AVLJ'
+    VERSION = 1
+    HEADER = struct.Struct('<4sB')  # magic, version
+    RECORD = struct.Struct('<cqq')  # opcode, index, length of the payload
+    OPCODES = {'insert': b'I', 'delete': b'D', 'split': b'S', 'concat': b'C', 'build': b'B'}
+    NAMES = dict((code, name) for name, code in OPCODES.items())
+
+    """Constructor. Constructs a journal without a file
+    runtime complexity: O(1)
+    """
+    def __init__(self):
+        self.file = None  # the binary file the changes are written to, see open
+        self.subscribers = []  # pairs [loop, queue], see AVLTreeList.changes
+        self.depth = 0  # the number of journaled operations running, only the outermost one is recorded
+
+    """opens a journal file, starting with the given values as a "build" change. The subscribers are not handed the
+    build change, which only records the items the file starts from
+    @type path: str
+    @param path: the path of the file, overwritten if it exists
+    @type values: list
+    @param values: the values of the list when the file starts
+    runtime complexity: O(n)
+    """
+    def openFile(self, path, values):
+        self.close()
+        self.file = open(path, 'wb')
+        self.file.write(self.HEADER.pack(self.MAGIC, self.VERSION))
+        self.file.write(self.encode(('build', values)))
+        self.file.flush()
+
+    """runs a write and records its change once it succeeds. The change is encoded first, so a change that cannot be
+    pickled raises before the write runs. Writes run by the write are not recorded, the change covers them
+    @type change: tuple
+    @param change: the change the write makes, None if the write records its changes itself
+    @type write: function
+    @param write: runs the write, with no arguments
+    @rtype: object
+    @returns: what write returns
+    runtime complexity: O(1) more than the write, not counting pickling
+    """
+    def run(self, change, write):
+        data = self.encode(change) if change is not None else None
+        self.depth += 1
+        try:
+            result = write()
+        finally:
+            self.depth -= 1
+        if change is not None:
+            self.record(change, data)
+        return result
+
+    """returns whether a recorded change goes anywhere, to the file or to a subscriber
+    @rtype: bool
+    @returns: True if the journal has a file or a subscriber
+    runtime complexity: O(1)
+    """
+    def active(self):
+        return self.file is not None or bool(self.subscribers)
+
+    """writes a change to the file, flushing it, and hands the change to the subscribers
+    @type change: tuple
+    @param change: the change
+    @type data: bytes
+    @param data: the change as encoded by encode
+    runtime complexity: O(1), not counting the write of data
+    """
+    def record(self, change, data):
+        if self.file is not None and data is not None:
+            self.file.write(data)
+            self.file.flush()  # a crash loses no recorded change
+        for subscriber in list(self.subscribers):
+            loop, queue = subscriber
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, change)
+            except RuntimeError:  # the loop of the subscriber is closed
+                self.subscribers.remove(subscriber)
+
+    """encodes a change as a record of the file, if there is one
+    @type change: tuple
+    @param change: the change
+    @rtype: bytes
+    @returns: the record, None if the journal has no file
+    runtime complexity: O(1), not counting pickling
+    """
+    def encode(self, change):
+        if self.file is None:
+            return None
+        opcode = self.OPCODES.get(change[0], b'M')
+        if opcode == b'M':
+            index, payload = 0, pickle.dumps(change, pickle.HIGHEST_PROTOCOL)
+        elif opcode in (b'D', b'S'):
+            index, payload = change[1], b''
+        elif opcode == b'I':
+            index, payload = change[1], pickle.dumps(change[2], pickle.HIGHEST_PROTOCOL)
+        else:
+            index, payload = 0, pickle.dumps(change[1], pickle.HIGHEST_PROTOCOL)
+        return self.RECORD.pack(opcode, index, len(payload)) + payload
+
+    """closes the file of the journal, the subscribers keep receiving changes
+    runtime complexity: O(1)
+    """
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    """generates the changes written to a journal file, in order
+    @type path: str
+    @param path: the path of the file
+    @rtype: generator
+    @raises ValueError: if the file is not a journal file
+    runtime complexity: O(m) where m is the size of the file
+    """
+    @classmethod
+    def read(cls, path):
+        with open(path, 'rb') as f:
+            buffer = f.read()
+        magic, version = cls.HEADER.unpack_from(buffer, 0)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("not a journal file")
+        position = cls.HEADER.size
+        while position < len(buffer):
+            opcode, index, length = cls.RECORD.unpack_from(buffer, position)
+            position += cls.RECORD.size
+            payload = buffer[position:position + length]
+            position += length
+            if opcode == b'M':
+                yield pickle.loads(payload)
+            elif opcode in (b'D', b'S'):
+                yield (cls.NAMES[opcode], index)
+            elif opcode == b'I':
+                yield ('insert', index, pickle.loads(payload))
+            else:
+                yield (cls.NAMES[opcode], pickle.loads(payload))
+
+
+"""
+A class implementing the ADT list, using an AVL tree.
+"""
+
+
+class AVLTreeList(object):
+    STATS_OPERATIONS = ('insert', 'delete', 'retrieve', 'split', 'concat', 'search', 'first', 'last', 'listToArray',
+                        'insertMany', 'deleteRange', 'applyBatch', 'append', 'appendleft', 'pop',
+                        'popleft', 'concatAll', 'concatStream')  # the operations timed by enableStats
+    STATS_METHODS = STATS_OPERATIONS + ('retrieveNode', 'getSuccessor', 'rotateLeft', 'rotateRight')
+    JOURNAL_OPERATIONS = ('insert', 'delete', 'split', 'concat', 'append', 'appendleft', 'pop', 'popleft',
+                          'insertMany', 'deleteRange', 'extractRange', 'applyBatch', 'setMany', 'concatAll',
+                          'concatStream')  # see enableJournal
+    JOURNAL_ITERABLES = {'insertMany': (1,), 'applyBatch': (0,), 'setMany': (0, 1)}  # arguments read only once
+    REPLAY_RUN = 8  # the shortest run of replayRun applied at once, shorter ones measure faster one at a time
+    BATCH_PLACES = 4  # a batch with more than one place per BATCH_PLACES operations is applied one at a time
+    BALANCES = ('avl', 'wavl', 'treap')  # the balancing policies, see the constructor
+    LEAF = VIRTUAL  # the virtual leaf, the child of a node that has none
+    NO_PARENT = None  # the parent of a root
+    leftOf = attrgetter('left')  # the node accessors, through which getMin, getMax, the rotations, FixTree, join
+    rightOf = attrgetter('right')  # and splitAtNode reach the nodes, so ArrayAVLTreeList runs them over its columns
+    parentOf = attrgetter('parent')  # (see ArrayAVLTreeList.bindColumns). They write through setLeftOf and the
+    heightOf = attrgetter('height')  # accessors next to it
+    updateSize = methodcaller('updateSize')  # updates the size of a node, and the rest it keeps of its subtree
+
+    """
+    Constructor.
+    @type iterable: iterable
+    @param iterable: values to fill the list with, in order (optional)
+    @type augmentation: Augmentation
+    @param augmentation: an aggregate to maintain over every subtree, for rangeQuery (optional)
+    @type balance: str
+    @param balance: how the tree is kept balanced. "avl" keeps the heights of siblings at most 1 apart. "wavl" keeps
+    ranks in the height fields instead, whose children are 1 or 2 ranks below them: it rebalances inserts exactly as
+    "avl" does, and deletes with at most 2 rotations. "treap" heap orders the nodes by random priorities, rotating
+    about 2 times per insert or delete on average, for an expected O(logn) depth. Positions, sizes, split and concat
+    work the same under every policy
+    @raises ValueError: if balance is not in BALANCES, or is "treap" with an augmentation
+    runtime complexity: O(1), O(n) when given an iterable of n values
+    """
+    def __init__(self, iterable=None, augmentation=None, balance="avl"):
+        if balance not in self.BALANCES:
+            raise ValueError("unknown balance %r, expected one of %s" % (balance, ", ".join(self.BALANCES)))
+        if balance == "treap" and augmentation is not None:
+            raise ValueError("a treap does not support augmentations")
+        self.root = VIRTUAL  # the shared virtual leaf is the root of an empty list
+        self.augmentation = augmentation
+        self.balance = balance
+        self.nodeClass = TreapNode if balance == "treap" else AVLNode if augmentation is None else \
+            augmentation.nodeClass
+        self.valueIndex = None  # maps the values (or their ids) to the set of nodes holding them, see enableIndex
+        self.byEquality = False  # whether values are matched with == rather than by identity
+        self.frozen = False  # True for the read-only lists returned by snapshot
+        self.generation = 0  # incremented whenever a node of self is replaced by a copy, see own
+        self.epoch = 0  # the nodes of an earlier epoch may be shared with a snapshot, see own
+        self.snapshots = None  # a WeakSet of the live snapshots that may share nodes with self, see snapshot
+        self.statistics = None  # the counters of enableStats, None while the stats are off
+        self.minNode = None  # the first node, None if unknown. Every write forgets it, see prepareWrite
+        self.maxNode = None  # the last node, None if unknown
+        self.journal = None  # the Journal of enableJournal and changes, None while the list is not journaled
+        self.lazy = False  # True if the list was loaded lazily, so reading it may still load nodes, see load
+        if iterable is not None:
+            self.build(iterable)
+
+    """constructs a list holding the values of the given iterable
+    @type iterable: iterable
+    @param iterable: the values of the list, in order. May be a generator of unknown length
+    @rtype: AVLTreeList
+    @returns: a new list
+    runtime complexity: O(n) where n is the number of values
+    """
+    @classmethod
+    def fromIterable(cls, iterable):
+        return cls(iterable)
+
+    """constructs a list with the same configuration as self, for the lists that operations on self return
+    @type iterable: iterable
+    @param iterable: values to fill the list with, in order (optional)
+    @rtype: AVLTreeList
+    @returns: a new list
+    runtime complexity: O(1), O(n) when given an iterable of n values
+    """
+    def newList(self, iterable=None):
+        return self.shareEpoch(AVLTreeList(iterable, self.augmentation, self.balance))
+
+    """builds a balanced tree bottom-up from the values of the given iterable, consuming it only once.
+    The values are gathered into perfect trees like the digits of a binary counter: the stack holds perfect trees
+    of decreasing heights, each either complete or a root still waiting for a right subtree as tall as its left one.
+    The trees left on the stack at the end are joined from right to left.
+    @type iterable: iterable
+    @param iterable: the values of the list, in order
+    @pre: self.empty() == True
+    runtime complexity: O(n) where n is the number of values
+    """
+    def build(self, iterable):
+        if self.balance == "treap":  # shapes an AVL tree, then deals the priorities out
+            shape = AVLTreeList()
+            shape.nodeClass = self.nodeClass
+            shape.build(iterable)
+            self.root = shape.root
+            self.dealPriorities()
+            return
+        stack = []  # pairs [node, waiting], waiting is True if node still has no right subtree
+        customNodes = self.nodeClass is not AVLNode  # nodes whose size or aggregate updateSize must compute
+        for val in iterable:
+            node = self.nodeClass(val)
+            node.makeReal()
+            if stack and not stack[-1][1]:  # val is the root above the last complete tree
+                left = stack.pop()[0]
+                node.setLeft(left)
+                left.setParent(node)
+                node.setHeight(left.getHeight() + 1)
+                node.setSize(left.getSize() + 1)
+                if customNodes:
+                    node.updateSize()
+                stack.append([node, True])
+            else:  # val is a leaf, which completes every waiting root as tall as the trees merged so far
+                while stack and stack[-1][0].getLeft().getHeight() == node.getHeight():
+                    parent = stack.pop()[0]
+                    parent.setRight(node)
+                    node.setParent(parent)
+                    parent.setSize(parent.getSize() + node.getSize())
+                    if customNodes:
+                        parent.updateSize()
+                    node = parent
+                stack.append([node, False])
+        right = VIRTUAL
+        if stack and not stack[-1][1]:
+            right = stack.pop()[0]
+        while stack:
+            node = stack.pop()[0]
+            self.join(node.getLeft(), node, right)
+            right = self.root
+        self.root = right
+
+    """joins two trees using a middle node, the result is placed in self. All the nodes are reused
+    @type left: AVLNode
+    @param left: the root of a tree (may be virtual) holding the items that come before mid
+    @type mid: AVLNode
+    @pre: mid is a real node of the current epoch which is not a part of any tree
+    @param mid: the node that comes between the two trees
+    @type right: AVLNode
+    @param right: the root of a tree (may be virtual) holding the items that come after mid
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(|left.height - right.height| + 1), O(logn) expected for a treap
+    """
+    def join(self, left, mid, right):
+        if self.balance == "treap":
+            return self.joinByPriority(left, mid, right)
+        heightOf, setParentOf = self.heightOf, self.setParentOf
+        if heightOf(left) != -1:
+            setParentOf(left, self.NO_PARENT)
+        if heightOf(right) != -1:
+            setParentOf(right, self.NO_PARENT)
+        parent = self.NO_PARENT
+        if heightOf(left) > heightOf(right) + 1:  # mid replaces the first node on left's right spine that is low
+                                                  # enough to be right's sibling
+            self.root = left
+            while heightOf(left) > heightOf(right) + 1:
+                parent = self.own(left)
+                left = self.rightOf(parent)
+            self.setRightOf(parent, mid)
+        elif heightOf(right) > heightOf(left) + 1:  # symmetric, on right's left spine
+            self.root = right
+            while heightOf(right) > heightOf(left) + 1:
+                parent = self.own(right)
+                right = self.leftOf(parent)
+            self.setLeftOf(parent, mid)
+        else:
+            self.root = mid
+        setParentOf(mid, parent)
+        self.setLeftOf(mid, left)
+        if heightOf(left) != -1:
+            setParentOf(left, mid)
+        self.setRightOf(mid, right)
+        if heightOf(right) != -1:
+            setParentOf(right, mid)
+        self.update(mid)
+        return self.FixTree(parent)
+
+    """joins two treaps using a middle node, the result is placed in self. The nodes of both right spines and left
+    spines that outrank mid are interleaved by priority above it, as in the merge of two treaps, then the heights and
+    sizes are fixed from mid up. All the nodes are reused
+    @type left: TreapNode
+    @param left: the root of a treap (may be virtual) holding the items that come before mid
+    @type mid: TreapNode
+    @pre: mid is a real node of the current epoch which is not a part of any tree
+    @param mid: the node that comes between the two trees
+    @type right: TreapNode
+    @param right: the root of a treap (may be virtual) holding the items that come after mid
+    @rtype: int
+    @returns: 0, a treap join makes no rotations
+    runtime complexity: O(logn) expected
+    """
+    def joinByPriority(self, left, mid, right):
+        if left.isRealNode():
+            left.setParent(None)
+        if right.isRealNode():
+            right.setParent(None)
+        parent = None
+        asLeft = False  # the side of parent the next node hangs on
+        while True:
+            if left.isRealNode() and left.priority > mid.priority and \
+                    (not right.isRealNode() or left.priority >= right.priority):
+                node = self.own(left)  # keeps its left subtree, its right one is joined further down
+                left = node.getRight()
+                nextAsLeft = False
+            elif right.isRealNode() and right.priority > mid.priority:
+                node = self.own(right)
+                right = node.getLeft()
+                nextAsLeft = True
+            else:
+                node = mid
+            node.setParent(parent)
+            if parent is None:
+                self.root = node
+            elif asLeft:
+                parent.setLeft(node)
+            else:
+                parent.setRight(node)
+            if node is mid:
+                break
+            parent = node
+            asLeft = nextAsLeft
+        mid.setLeft(left)
+        if left.isRealNode():
+            left.setParent(mid)
+        mid.setRight(right)
+        if right.isRealNode():
+            right.setParent(mid)
+        node = mid
+        while node is not None:
+            node.updateHeight()
+            node.updateSize()
+            node = node.getParent()
+        return 0
+
+    """gives the nodes of self new random priorities in heap order, so a tree of any shape becomes a treap. The
+    priorities are distributed as n independent uniform draws, handed out in decreasing order level by level, so a
+    node inserted later finds its place among them as it would in a treap grown one node at a time. The draws come
+    out already sorted, as the running sums of n + 1 exponential gaps over their total, so no sort is needed
+    runtime complexity: O(n)
+    """
+    def dealPriorities(self):
+        nodes = [] if self.root.isVirtual() else [self.root]
+        for node in nodes:  # nodes grows level by level as it is walked
+            if node.getLeft().isRealNode():
+                nodes.append(node.getLeft())
+            if node.getRight().isRealNode():
+                nodes.append(node.getRight())
+        gaps = [random.expovariate(1.0) for _ in range(len(nodes) + 1)]
+        total = sum(gaps)
+        priority = 1.0
+        for node, gap in zip(nodes, gaps):
+            priority -= gap / total
+            node.priority = priority
+
+    """splits the tree around the given node, by joining the subtrees hanging off the path from the node to the
+    root. The nodes on the path are reused as the joining nodes, and self is left empty. A treap instead rotates the
+    node up to the root, as if its priority were the highest, and its subtrees are the two treaps
+    @type x: AVLNode
+    @pre: x is a real node of self, of the current epoch (see own)
+    @param x: the node to split around
+    @rtype: list
+    @returns: a list [left, right, counter] where left is the root of the tree holding the items before x, right is
+    the root of the tree holding the items after x and counter is the number of rebalancing operation due to AVL
+    rebalancing. x is detached from both and made a single real node with the same value
+    runtime complexity: O(logn), O(logn) expected for a treap
+    """
+    def splitAtNode(self, x):
+        if self.balance == "treap":
+            return self.splitByRotations(x)
+        leftOf, rightOf, parentOf = self.leftOf, self.rightOf, self.parentOf
+        leftTree = self.fragmentList()
+        rightTree = self.fragmentList()
+        leftTree.root = leftOf(x)
+        rightTree.root = rightOf(x)
+        counter = 0
+        current = x
+        parent = parentOf(x)
+        while parent:
+            grandparent = parentOf(parent)  # saved since join detaches parent
+            if rightOf(parent) == current:
+                counter += leftTree.join(leftOf(parent), parent, leftTree.root)
+            else:
+                counter += rightTree.join(rightTree.root, parent, rightOf(parent))
+            current = parent
+            parent = grandparent
+        for root in (leftTree.root, rightTree.root):
+            if self.heightOf(root) != -1:
+                self.setParentOf(root, self.NO_PARENT)
+        self.setParentOf(x, self.NO_PARENT)
+        self.setLeftOf(x, self.LEAF)
+        self.setRightOf(x, self.LEAF)
+        self.update(x)
+        self.root = self.LEAF
+        self.generation += leftTree.generation + rightTree.generation
+        return [leftTree.root, rightTree.root, counter]
+
+    """splits a treap around the given node, see splitAtNode, by rotating the node up to the root. The rotations keep
+    the heap order of the other nodes, so both subtrees of the node are treaps. Joining the subtrees off the path
+    instead would fix the heights up to the root of every join, O(log^2 n) expected
+    @type x: TreapNode
+    @pre: x is a real node of self, of the current epoch (see own)
+    @param x: the node to split around
+    @rtype: list
+    @returns: a list [left, right, counter] as splitAtNode does, where counter is the number of rotations
+    runtime complexity: O(logn) expected
+    """
+    def splitByRotations(self, x):
+        counter = 0
+        while x.getParent() is not None:
+            parent = x.getParent()
+            if parent.getLeft() is x:
+                self.rotateRight(parent)
+            else:
+                self.rotateLeft(parent)
+            counter += 1
+        left, right = x.getLeft(), x.getRight()
+        if left.isRealNode():
+            left.setParent(None)
+        if right.isRealNode():
+            right.setParent(None)
+        x.setLeft(VIRTUAL)
+        x.setRight(VIRTUAL)
+        x.setHeight(0)
+        x.updateSize()
+        self.root = VIRTUAL
+        return [left, right, counter]
+
+    """returns whether the list is empty
+    @rtype: bool
+    @returns: True if the list is empty, False otherwise
+    runtime complexity: O(1)
+    """
+    def empty(self):
+        return self.root.isVirtual()
+
+    """retrieves the i'th item in the list
+    @type i: int
+    @pre: 0 <= i < self.length()
+    @param i: index in the list
+    @rtype: AVLNode
+    @returns: the i'th item in the list
+    runtime complexity: O(logn) where n is the size of the tree
+    """
+    def retrieveNode(self, i):
+        index = i + 1
+        current = self.root
+        while current.isRealNode():  # current will never be virtual so current.child will never be None
+            currentRank = current.getLeft().getSize() + 1
+            if currentRank == index:
+                return current
+            if currentRank > index:
+                current = current.getLeft()
+            else:
+                index = index - currentRank
+                current = current.getRight()
+
+    """retrieves the value of the i'th item in the list
+    @type i: int
+    @pre: 0 <= i < self.length()
+    @param i: index in the list
+    @rtype: str
+    @returns: the value of the i'th item in the list
+    runtime complexity: O(logn) where n is the size of the tree
+    """
+    def retrieve(self, i):
+        return self.retrieveNode(i).getValue()
+
+    """returns the rightmost node in the given node's subtree
+    @type node: AVLNode
+    @pre: node.isRealNode == True
+    @param node: The given node
+    @rtype: AVLNode
+    @returns: the rightmost node in the given node's subtree
+    runtime complexity: O(logn) where n is the size of the (sub)tree
+    """
+    def getMax(self, node):
+        rightOf, heightOf = self.rightOf, self.heightOf
+        current = node
+        while heightOf(rightOf(current)) != -1:
+            current = rightOf(current)
+        return current
+
+    """returns the leftmost node in the given node's subtree
+    @type node: AVLNode
+    @pre: node.isRealNode == True
+    @param node: The given node
+    @rtype: AVLNode
+    @returns: the leftmost node in the given node's subtree
+    runtime complexity: O(logn) where n is the size of the (sub)tree
+    """
+    def getMin(self, node):
+        leftOf, heightOf = self.leftOf, self.heightOf
+        current = node
+        while heightOf(leftOf(current)) != -1:
+            current = leftOf(current)
+        return current
+
+    """returns the predecessor of the given node, None if the given node is the min-ranked node in the tree
+    @type node: AVLNode
+    @pre: node.isRealNode == True
+    @param node: The given node
+    @rtype: AVLNode
+    @returns: the predecessor of the given node, None if the given node is the min-ranked node in the tree
+    runtime complexity: O(logn) where n is the size of the tree
+    """
+    def getPredecessor(self, node):
+        if node.getLeft().isRealNode():
+            return self.getMax(node.getLeft())
+        current = node
+        parent = current.getParent()
+        while (parent is not None) and (current is parent.getLeft()):
+            current = parent
+            parent = parent.getParent()
+        return parent
+
+    """returns the successor of the given node, None if the given node is the max-ranked node in the tree
+    @type node: AVLNode
+    @pre: node.isRealNode == True
+    @param node: The given node
+    @rtype: AVLNode
+    @returns: the successor of the given node, None if the given node is the max-ranked node in the tree
+    runtime complexity: O(logn) where n is the size of the tree
+    """
+    def getSuccessor(self, node):
+        if node.getRight().isRealNode():
+            return self.getMin(node.getRight())
+        current = node
+        parent = current.getParent()
+        while (parent is not None) and (current is parent.getRight()):
+            current = parent
+            parent = parent.getParent()
+        return parent
+
+    """returns the index of the given node by climbing to the root and summing the sizes of the subtrees on its left
+    @type node: AVLNode
+    @pre: node is a real node of self
+    @param node: The given node
+    @rtype: int
+    @returns: the index of node's item in the list
+    @raises TypeError: if self is a snapshot, whose parent pointers belong to the list it was taken of
+    runtime complexity: O(logn) where n is the size of the tree
+    """
+    def rank(self, node):
+        if self.frozen:
+            raise TypeError("a snapshot cannot rank its nodes")
+        index = node.left.size
+        parent = node.parent
+        while parent is not None:
+            if parent.right is node:
+                index += parent.left.size + 1
+            node = parent
+            parent = node.parent
+        return index
+
+    """inserts val at position i in the list
+    @type i: int
+    @pre: 0 <= i <= self.length()
+    @param i: The intended index in the list to which we insert val
+    @type val: str
+    @param val: the value we insert
+    @rtype: list
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn) where n is the size of the tree
+    """
+    def insert(self, i, val):
+        if i == self.root.getSize():
+            return self.insertEnd(val, True)
+        if i == 0:
+            return self.insertEnd(val, False)
+        self.prepareWrite()
+        if self.augmentation is not None:  # the aggregates are recomputed on the way up anyway
+            return self.insertBeforeNode(self.retrieveNode(i), val)  # i < self.root.getSize()
+        node = self.root
+        epoch = self.epoch
+        while True:  # descends to the gap before the i'th item, counting the new node in the sizes on the way
+            if node.epoch < epoch:  # the path below a snapshot is copied as it is walked
+                node = self.own(node)
+            leftSize = node.left.size  # reads the child first, a lazy node loads its children by its size
+            node.size += 1
+            if i <= leftSize:
+                if node.left.height == -1:
+                    asLeft = True
+                    break
+                node = node.left
+            else:
+                i -= leftSize + 1
+                if node.right.height == -1:
+                    asLeft = False
+                    break
+                node = node.right
+        if self.statistics is not None:  # the descent does not go through retrieveNode, which counts the others
+            self.countDescent(node)
+        return self.attachLeaf(node, asLeft, val, True)[1]
+
+    """inserts val right before the given node, as its predecessor
+    @type node: AVLNode
+    @pre: node is a real node of self
+    @param node: the node that will follow val
+    @type val: str
+    @param val: the value we insert
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn) where n is the size of the tree
+    """
+    def insertBeforeNode(self, node, val):
+        self.prepareWrite()
+        if node.getLeft().isVirtual():
+            return self.attachLeaf(node, True, val)[1]
+        return self.attachLeaf(self.getMax(node.getLeft()), False, val)[1]
+
+    """inserts val right after the given node, as its successor
+    @type node: AVLNode
+    @pre: node is a real node of self
+    @param node: the node that will precede val
+    @type val: str
+    @param val: the value we insert
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn) where n is the size of the tree
+    """
+    def insertAfterNode(self, node, val):
+        self.prepareWrite()
+        if node.getRight().isVirtual():
+            return self.attachLeaf(node, False, val)[1]
+        return self.attachLeaf(self.getMin(node.getRight()), True, val)[1]
+
+    """hangs a new node as a missing child of the given node and rebalances
+    @type parent: AVLNode
+    @pre: parent is a real node of self whose child on the chosen side is virtual
+    @param parent: the parent of the new node
+    @type asLeft: bool
+    @param asLeft: True to hang the new node as the left child, False as the right child
+    @type val: str
+    @param val: the value of the new node
+    @type sized: bool
+    @param sized: whether the sizes of parent and its ancestors already count the new node, which then only needs
+    the heights fixed, see fixHeights. The sizes are recomputed by FixTree otherwise
+    @rtype: list
+    @returns: a list [node, counter] where node is the new node and counter is the number of rebalancing operation
+    due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def attachLeaf(self, parent, asLeft, val, sized=False):
+        parent = self.own(parent)
+        newNode = self.nodeClass(val)
+        newNode.makeReal()
+        if asLeft:
+            parent.setLeft(newNode)
+        else:
+            parent.setRight(newNode)
+        newNode.setParent(parent)
+        if self.valueIndex is not None:
+            self.indexAdd(newNode)
+        return [newNode, self.fixHeights(parent) if sized else self.FixTree(parent)]
+
+    """prepares the list to be written to at one of its ends, see prepareWrite, keeping the cached first and last
+    nodes unless a snapshot shares them: both are then found again and copied with their paths, see own
+    @rtype: list
+    @returns: a list [first, last] of the first and last nodes of the list, found again if they were not cached
+    (None if the list is empty)
+    runtime complexity: O(1) if the nodes were cached and are not shared, O(logn) otherwise
+    """
+    def prepareEndWrite(self):
+        first, last = self.minNode, self.maxNode
+        self.prepareWrite()
+        if self.root.isVirtual():
+            return [None, None]
+        epoch = self.epoch
+        if first is None or first.epoch < epoch:
+            first = self.own(self.getMin(self.root))
+        if last is None or last.epoch < epoch:  # after first, whose copies may have replaced it
+            last = self.own(self.getMax(self.root))
+        return [first, last]
+
+    """inserts val at one end of the list
+    @type val: str
+    @param val: the value we insert
+    @type atEnd: bool
+    @param atEnd: True to insert after the last item, False to insert before the first item
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn) for the sizes of the ancestors, the descent is O(1) once the ends are cached
+    """
+    def insertEnd(self, val, atEnd):
+        first, last = self.prepareEndWrite()
+        if first is None:
+            self.root = self.nodeClass(val)
+            self.root.makeReal()
+            if self.valueIndex is not None:
+                self.indexAdd(self.root)
+            self.minNode = self.maxNode = self.root
+            return 0
+        sized = self.augmentation is None
+        if sized:
+            self.addToSizes(last if atEnd else first, 1)
+        if atEnd:
+            last, counter = self.attachLeaf(last, False, val, sized)
+        else:
+            first, counter = self.attachLeaf(first, True, val, sized)
+        self.minNode, self.maxNode = first, last
+        return counter
+
+    """removes the first or the last item of the list
+    @type atEnd: bool
+    @param atEnd: True to remove the last item, False to remove the first one
+    @rtype: list
+    @returns: a list [val, counter] where val is the value removed and counter is the number of rebalancing operation
+    due to AVL rebalancing
+    @raises IndexError: if the list is empty
+    runtime complexity: O(logn) for the sizes of the ancestors, the descent is O(1) once the ends are cached
+    """
+    def removeEnd(self, atEnd):
+        first, last = self.prepareEndWrite()
+        if first is None:
+            raise IndexError("pop from an empty list")
+        if first is last:
+            val = first.getValue()
+            return [val, self.deleteNode(first)]
+        if atEnd:  # the last node has no right child, so its predecessor is found in O(1)
+            toDelete = last
+            last = self.own(self.getMax(last.getLeft())) if last.getLeft().isRealNode() else last.getParent()
+        else:
+            toDelete = first
+            first = self.own(self.getMin(first.getRight())) if first.getRight().isRealNode() else first.getParent()
+        val = toDelete.getValue()
+        counter = self.deleteNode(toDelete)
+        self.minNode, self.maxNode = first, last
+        return [val, counter]
+
+    """appends val after the last item of the list
+    @type val: str
+    @param val: the value we insert
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn), O(1) amortized rebalancing
+    """
+    def append(self, val):
+        return self.insertEnd(val, True)
+
+    """inserts val before the first item of the list
+    @type val: str
+    @param val: the value we insert
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn), O(1) amortized rebalancing
+    """
+    def appendleft(self, val):
+        return self.insertEnd(val, False)
+
+    """removes the last item of the list
+    @rtype: str
+    @returns: the value of the removed item
+    @raises IndexError: if the list is empty
+    runtime complexity: O(logn), O(1) amortized rebalancing
+    """
+    def pop(self):
+        return self.removeEnd(True)[0]
+
+    """removes the first item of the list
+    @rtype: str
+    @returns: the value of the removed item
+    @raises IndexError: if the list is empty
+    runtime complexity: O(logn), O(1) amortized rebalancing
+    """
+    def popleft(self):
+        return self.removeEnd(False)[0]
+
+    """inserts the values of the given iterable at position i in the list, so the first of them ends up at index i.
+    The values are built into a balanced tree which is then joined between the two halves of the list
+    @type i: int
+    @pre: 0 <= i <= self.length()
+    @param i: The intended index in the list to which we insert the values
+    @type iterable: iterable
+    @param iterable: the values we insert, in order
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(k + logn) where k is the number of values and n is the size of the tree
+    """
+    def insertMany(self, i, iterable):
+        self.prepareWrite()
+        values = iter(iterable)
+        for val in values:  # takes the first value as the node joining the list's prefix and the block
+            mid = self.nodeClass(val)
+            mid.makeReal()
+            break
+        else:
+            return 0
+        block = self.newList(values)
+        if self.valueIndex is not None:
+            self.indexAdd(mid)
+            for node in self.iterNodes(block.root):
+                self.indexAdd(node)
+        if i == self.root.getSize():
+            return self.join(self.root, mid, block.root)
+        x = self.own(self.retrieveNode(i))
+        left, right, counter = self.splitAtNode(x)
+        counter += self.join(left, mid, block.root)
+        counter += self.join(self.root, x, right)
+        return counter
+
+    """sets the left child of the given node, a node accessor (see leftOf)
+    @type node: AVLNode
+    @pre: node is a real node
+    @param node: the given node
+    @type child: AVLNode
+    @param child: the new left child (may be virtual)
+    runtime complexity: O(1)
+    """
+    def setLeftOf(self, node, child):
+        node.left = child
+
+    """sets the right child of the given node, a node accessor (see leftOf)
+    @type node: AVLNode
+    @pre: node is a real node
+    @param node: the given node
+    @type child: AVLNode
+    @param child: the new right child (may be virtual)
+    runtime complexity: O(1)
+    """
+    def setRightOf(self, node, child):
+        node.right = child
+
+    """sets the parent of the given node, a node accessor (see leftOf)
+    @type node: AVLNode
+    @pre: node is a real node
+    @param node: the given node
+    @type parent: AVLNode
+    @param parent: the new parent, NO_PARENT for a root
+    runtime complexity: O(1)
+    """
+    def setParentOf(self, node, parent):
+        node.parent = parent
+
+    """sets the height of the given node, a node accessor (see leftOf)
+    @type node: AVLNode
+    @pre: node is a real node
+    @param node: the given node
+    @type h: int
+    @param h: the height
+    runtime complexity: O(1)
+    """
+    def setHeightOf(self, node, h):
+        node.height = h
+
+    """updates the height and the size of the given node from its children, a node accessor (see leftOf)
+    @type node: AVLNode
+    @pre: node is a real node
+    @param node: the given node
+    runtime complexity: O(1), not counting the augmentation's functions
+    """
+    def update(self, node):
+        node.updateHeight()
+        node.updateSize()
+
+    """rotates the given node right
+    @type node: AVLNode
+    @pre: node and node.left are real nodes, node's parent is of the current epoch (see own)
+    @param node: The given node
+    runtime complexity: O(1), node and its child are copied first if a snapshot shares them
+    """
+    def rotateRight(self, node):
+        node = self.own(node)
+        pivot = self.own(self.leftOf(node))
+        inner = self.rightOf(pivot)
+        self.setLeftOf(node, inner)
+        if self.heightOf(inner) != -1:
+            self.setParentOf(inner, node)
+        self.setRightOf(pivot, node)
+        self.bypassHelper(self.parentOf(node), pivot, node)
+        self.setParentOf(node, pivot)
+        self.update(node)
+        self.update(pivot)
+
+    """rotates the given node left
+    @type node: AVLNode
+    @pre: node and node.right are real nodes, node's parent is of the current epoch (see own)
+    @param node: The given node
+    runtime complexity: O(1), node and its child are copied first if a snapshot shares them
+    """
+    def rotateLeft(self, node):
+        node = self.own(node)
+        pivot = self.own(self.rightOf(node))
+        inner = self.leftOf(pivot)
+        self.setRightOf(node, inner)
+        if self.heightOf(inner) != -1:
+            self.setParentOf(inner, node)
+        self.setLeftOf(pivot, node)
+        self.bypassHelper(self.parentOf(node), pivot, node)
+        self.setParentOf(node, pivot)
+        self.update(node)
+        self.update(pivot)
+
+    """receives two nodes, the first of which is the second's ancestor and makes the first node the parent of 
+    the second. The function does not change toBypass's pointers to other nodes
+    @type parent: AVLNode
+    @pre: parent is the ancestor of child, or None
+    @param parent: The given ancestor
+    @type child: AVLNode
+    @param child: The given descendant (may be virtual)
+    @type toBypass: AVLNode
+    @pre: toBypass.isReal() == True
+    @param toBypass: The parent's original child (left or right) which is to be replaced
+    runtime complexity: O(1)
+    """
+    def bypassHelper(self, parent, child, toBypass):
+        if not parent:
+            self.root = child
+        elif self.leftOf(parent) == toBypass:
+            self.setLeftOf(parent, child)
+        else:
+            self.setRightOf(parent, child)
+        if self.heightOf(child) != -1:
+            self.setParentOf(child, parent)
+
+    """adds k to the sizes of the given node and all of its ancestors
+    @type node: AVLNode
+    @param node: the lowest node whose size changed
+    @type k: int
+    @param k: the change in size
+    runtime complexity: O(logn)
+    """
+    def addToSizes(self, node, k):
+        while node is not None:
+            node.size += k
+            node = node.parent
+
+    """deletes the given node. A node with two children first trades places with its successor, so it is always
+    removed from a spot with at most one child, without recursion
+    @type toDelete: the given node
+    @pre: toDelete.isRealNode() == True
+    @param toDelete: The given node
+    @type sized: bool
+    @param sized: whether the sizes of the ancestors of toDelete already uncount its items (see delete). They are
+    updated on the way up otherwise
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    A treap rotates the node down below its children of higher priority instead of the trade, and a WAVL tree is
+    fixed by fixRanks
+    """
+    def deleteNode(self, toDelete, sized=False):
+        self.prepareWrite()
+        toDelete = self.own(toDelete)
+        if self.valueIndex is not None and toDelete.isRealNode():
+            self.indexRemove(toDelete)
+        width = toDelete.getSize() - toDelete.getLeft().getSize() - toDelete.getRight().getSize()
+        uncounted = toDelete.getParent() if sized else None  # the sizes from this ancestor up are up to date
+        successor = None
+        node = None  # the first node to uncount width from
+        counter = 0
+        if self.balance == "treap":
+            while toDelete.getLeft().isRealNode() and toDelete.getRight().isRealNode():
+                if toDelete.getLeft().priority > toDelete.getRight().priority:
+                    self.rotateRight(toDelete)
+                else:
+                    self.rotateLeft(toDelete)
+                counter += 1
+        if toDelete.getLeft().isRealNode() and toDelete.getRight().isRealNode():  # two children
+            # the next 4 lines save successor's information
+            successor = self.own(self.getSuccessor(toDelete))
+            sParent = successor.getParent()
+            sHeight = successor.getHeight()
+            sSize = successor.getSize()
+            sWidth = sSize - successor.getRight().getSize()  # successor has no left child
+            # the next 2 lines save successor's new children
+            tdLeft = toDelete.getLeft()
+            tdRight = toDelete if toDelete.getRight() is successor else toDelete.getRight()
+
+            # the next 4 lines set successor's new parent(including root handling), and toDelete's if it is not\
+            # successor's new right child
+            self.bypassHelper(toDelete.getParent(), successor, toDelete)
+            if toDelete.getRight() is not successor:
+                sParent.setLeft(toDelete)  # toDelete's new parent is successor's parent
+                toDelete.setParent(sParent)
+            # the next lines set toDelete's and successor's new children
+            toDelete.setLeft(VIRTUAL)  # successor has no left child
+            toDelete.setRight(successor.getRight())
+            if toDelete.getRight().isRealNode():
+                toDelete.getRight().setParent(toDelete)
+            successor.setLeft(tdLeft)
+            successor.getLeft().setParent(successor)
+            successor.setRight(tdRight)
+            successor.getRight().setParent(successor)
+            # the next 4 lines update toDelete's and successor's new heights and sizes
+            successor.setHeight(toDelete.getHeight())
+            successor.setSize(toDelete.getSize() - width)
+            toDelete.setHeight(sHeight)
+            toDelete.setSize(sSize)
+            node = successor.getParent()
+        # toDelete now has at most one child, which takes its place
+        parent = toDelete.getParent()
+        child = toDelete.getLeft() if toDelete.getLeft().isRealNode() else toDelete.getRight()
+        toDelete.setParent(None)
+        toDelete.makeVirtual()
+        if child.isRealNode():
+            self.bypassHelper(parent, child, toDelete)
+        elif parent is None:
+            self.root = VIRTUAL
+        elif parent.getLeft() is toDelete:
+            parent.setLeft(VIRTUAL)
+        else:
+            parent.setRight(VIRTUAL)
+        if self.augmentation is not None:  # the aggregates are recomputed on the way up anyway
+            return counter + self.FixTree(parent)
+        if successor is not None:  # the nodes successor left lose its items, not those of toDelete
+            current = parent
+            while current is not successor:
+                current.size -= sWidth
+                current = current.getParent()
+        else:
+            node = parent
+        while node is not uncounted:
+            node.size -= width
+            node = node.getParent()
+        if self.balance == "wavl":
+            return self.fixRanks(parent)
+        if self.balance == "treap":  # the rotations down may have changed heights above any node that kept its own
+            return counter + self.fixPriorities(parent, False)
+        return self.fixHeights(parent)
+
+    """deletes the i'th item in the list
+    @type i: int
+    @pre: 0 <= i < self.length()
+    @param i: The intended index in the list to be deleted
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def delete(self, i):
+        if i == 0 or i == self.root.getSize() - 1:
+            return self.removeEnd(i != 0)[1]
+        self.prepareWrite()
+        if self.augmentation is not None:
+            return self.deleteNode(self.retrieveNode(i))
+        node = self.root
+        epoch = self.epoch
+        while True:  # descends to the i'th item, uncounting it from the sizes of its ancestors on the way
+            if node.epoch < epoch:
+                node = self.own(node)
+            leftSize = node.left.size
+            if i == leftSize:
+                break
+            node.size -= 1
+            if i < leftSize:
+                node = node.left
+            else:
+                i -= leftSize + 1
+                node = node.right
+        if self.statistics is not None:  # the descent does not go through retrieveNode, which counts the others
+            self.countDescent(node)
+        return self.deleteNode(node, True)
+
+    """removes the items from index i up to index j (excluded) from the tree, the rest of the items stay in self
+    @type i: int
+    @type j: int
+    @pre: 0 <= i < j <= self.length()
+    @param i: the index of the first item to be removed
+    @param j: the index following the last item to be removed
+    @rtype: list
+    @returns: a list [middle, counter] where middle is the root of the tree holding the removed items and counter is
+    the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def cutRange(self, i, j):
+        self.prepareWrite()
+        counter = 0
+        if j < self.root.getSize():  # y, the item at index j, joins the prefix with the suffix
+            y = self.own(self.retrieveNode(j))
+            middle, suffix, counter = self.splitAtNode(y)
+            if i > 0:  # x, the item at index i-1, is joined back in front of y
+                self.root = middle
+                x = self.own(self.retrieveNode(i - 1))
+                prefix, middle, splitCounter = self.splitAtNode(x)
+                counter += splitCounter + self.join(prefix, x, VIRTUAL)
+            counter += self.join(self.root, y, suffix)
+        elif i > 0:
+            x = self.own(self.retrieveNode(i - 1))
+            prefix, middle, counter = self.splitAtNode(x)
+            counter += self.join(prefix, x, VIRTUAL)
+        else:
+            middle = self.root
+            self.root = VIRTUAL
+        if self.valueIndex is not None:
+            for node in self.iterNodes(middle):
+                self.indexRemove(node)
+        return [middle, counter]
+
+    """deletes the items from index i up to index j (excluded)
+    @type i: int
+    @type j: int
+    @pre: 0 <= i <= j <= self.length()
+    @param i: the index of the first item to be deleted
+    @param j: the index following the last item to be deleted
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def deleteRange(self, i, j):
+        if i >= j:
+            return 0
+        return self.cutRange(i, j)[1]
+
+    """removes the items from index i up to index j (excluded) and returns them as a new list
+    @type i: int
+    @type j: int
+    @pre: 0 <= i <= j <= self.length()
+    @param i: the index of the first item to be removed
+    @param j: the index following the last item to be removed
+    @rtype: AVLTreeList
+    @returns: a list holding the removed items, in order
+    runtime complexity: O(logn)
+    """
+    def extractRange(self, i, j):
+        extracted = self.newList()
+        extracted.lazy = self.lazy  # the cut nodes may still have children in the file
+        if i < j:
+            extracted.root = self.cutRange(i, j)[0]
+        if self.valueIndex is not None:
+            extracted.enableIndex(self.byEquality)
+        return extracted
+
+    """returns a new list holding the items from index i up to index j (excluded), self is not changed
+    @type i: int
+    @type j: int
+    @pre: 0 <= i <= j <= self.length()
+    @param i: the index of the first item to be copied
+    @param j: the index following the last item to be copied
+    @rtype: AVLTreeList
+    @returns: a list holding copies of the items' values, in order
+    runtime complexity: O(k + logn) where k = j - i
+    """
+    def slice(self, i, j):
+        return self.newList(self.iterRange(i, j))
+
+    """returns the aggregate of the items from index i up to index j (excluded), under the augmentation of the list
+    @type i: int
+    @type j: int
+    @pre: 0 <= i <= j <= self.length(), and the list was constructed with an augmentation
+    @param i: the index of the first item
+    @param j: the index following the last item
+    @rtype: object
+    @returns: the combination, in order, of the measures of the values in the range
+    runtime complexity: O(logn), not counting the augmentation's functions
+    """
+    def rangeQuery(self, i, j):
+        aug = self.augmentation
+        node = self.root
+        while i < j:  # descends to the highest node in the range, the range then spans both of its subtrees
+            leftSize = node.left.size
+            if j <= leftSize:
+                node = node.left
+            elif i > leftSize:
+                i -= leftSize + 1
+                j -= leftSize + 1
+                node = node.right
+            else:
+                break
+        else:
+            return aug.identity
+        if i == 0 and j == node.size:
+            return node.agg
+        # the range is a suffix of the left subtree, node's value and a prefix of the right subtree
+        leftSize = node.left.size
+        middle = aug.measure(node.value)
+        suffix = aug.identity  # the aggregate of the part of the suffix that was passed on the way down
+        current = node.left
+        while i < current.size:
+            currentLeftSize = current.left.size
+            if i == 0:
+                suffix = aug.combine(current.agg, suffix)
+                break
+            if i <= currentLeftSize:
+                suffix = aug.combine(aug.combine(aug.measure(current.value), aug.aggregate(current.right)), suffix)
+                current = current.left
+            else:
+                i -= currentLeftSize + 1
+                current = current.right
+        j -= leftSize + 1
+        prefix = aug.identity  # the aggregate of the part of the prefix that was passed on the way down
+        current = node.right
+        while j > 0:
+            currentLeftSize = current.left.size
+            if j == current.size:
+                prefix = aug.combine(prefix, current.agg)
+                break
+            if j <= currentLeftSize:
+                current = current.left
+            else:
+                prefix = aug.combine(prefix, aug.combine(aug.aggregate(current.left), aug.measure(current.value)))
+                j -= currentLeftSize + 1
+                current = current.right
+        return aug.combine(aug.combine(suffix, middle), prefix)
+
+    """applies a batch of operations, with the same result as applying them one after the other. Every operation is
+    a tuple (op, i, val): ("insert", i, val) inserts val at index i, ("delete", i) or ("delete", i, val) deletes the
+    item at index i and ("set", i, val) replaces the value at index i, where i is the index at the time of the
+    operation. A batch scattered over the list is applied one operation at a time, see scatteredBatch. Otherwise
+    the indices are first translated to positions of the list as it is, see planBatch. Then a single walk from the
+    root goes down only into the subtrees holding a changed position, splitting the sorted positions between the
+    two children of every node by its index, and changes the tree on the way back up: a run of inserted values is
+    built into a tree at the gap it fills, and every node on the way is joined back between its two rebuilt
+    subtrees (see join), or left out if it is deleted. So each ancestor of a change is fixed once, after all the
+    changes below it, and a subtree that kept its height is joined back without a rotation
+    @type ops: iterable
+    @param ops: the operations, in order
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    @raises IndexError: if an operation's index is out of range, the list is then left unchanged
+    @raises ValueError: if an operation is unknown, the list is then left unchanged
+    runtime complexity: O(k * logn) for a scattered batch, O(k * sqrt(p) + p * log(n / p + 1)) otherwise, where k is
+    the number of operations and p the number of places of the list they change
+    """
+    def applyBatch(self, ops):
+        ops = list(ops)
+        if self.scatteredBatch(ops):
+            return self.applyInOrder(ops)
+        positions, gaps, changes = self.planBatch(ops)
+        if not positions:
+            return 0
+        self.prepareWrite()
+
+        def rebuild(node, first, lo, hi):  # node's subtree holds the items from index first of the list as it is
+            if lo == hi:
+                return [node, 0]
+            if node.height == -1:  # the gap before the item at index first
+                block = self.newList(gaps.get(first, ()))
+                if self.valueIndex is not None:
+                    for inserted in self.iterNodes(block.root):
+                        self.indexAdd(inserted)
+                return [block.root, 0]
+            node = self.own(node)
+            i = first + node.left.size
+            mid = bisect_left(positions, i, lo, hi)
+            split = mid + 1 if mid < hi and positions[mid] == i else mid  # the gap before i is left's last one
+            left, counter = rebuild(node.left, first, lo, split)
+            right, rightCounter = rebuild(node.right, i + 1, split, hi)
+            counter += rightCounter
+            op = changes.get(i) if split > mid else None
+            if op is None or op[0] == "set":
+                if op is not None:
+                    if self.valueIndex is not None:
+                        self.indexRemove(node)
+                    node.setValue(op[2])
+                    if self.valueIndex is not None:
+                        self.indexAdd(node)
+                counter += self.join(left, node, right)
+                return [self.root, counter]
+            if self.valueIndex is not None:
+                self.indexRemove(node)
+            node.setLeft(VIRTUAL)
+            node.setRight(VIRTUAL)
+            node.setParent(None)
+            node.makeVirtual()
+            if left.isVirtual() or right.isVirtual():
+                root = right if left.isVirtual() else left
+                if root.isRealNode():
+                    root.setParent(None)
+                return [root, counter]
+            fragment = self.fragmentList()  # the last node of left joins it to right, see joinList
+            fragment.root = left
+            left.setParent(None)
+            last = fragment.own(fragment.getMax(left))
+            val = last.getValue()
+            counter += fragment.deleteNode(last)
+            last.setValue(val)
+            last.makeReal()
+            if self.valueIndex is not None:
+                self.indexAdd(last)
+            counter += self.join(fragment.root, last, right)
+            return [self.root, counter]
+
+        self.root, counter = rebuild(self.root, 0, 0, len(positions))
+        return counter
+
+    """translates a batch of operations (see applyBatch) into changes of the list as it is, without changing it. The
+    list the batch makes is followed as a sequence of pieces: runs (start, length) of items of the list as it is, and
+    python lists holding the values inserted by the batch, so that every operation splits at most one run. Values
+    inserted next to each other share a list of up to capacity values, so a batch that keeps to a few places of the
+    list has few pieces. The pieces are kept in blocks of about sqrt(k) pieces, so an index is found by summing the
+    lengths of the blocks, then those of the pieces of one block. A set or a delete of an item of the list is recorded
+    by its index in the list as it is, and the inserted values left at the end are gathered by the gap they fill
+    @type ops: iterable
+    @param ops: the operations, see applyBatch
+    @rtype: list
+    @returns: a list [positions, gaps, changes] where positions is the sorted list of the indices of the list as it
+    is that the batch changes, gaps maps an index i to the list of the values to insert before the item at index i
+    (the length of the list for values to append) and changes maps an index to the last set or delete operation of
+    its item
+    @raises IndexError: if an operation's index is out of range
+    @raises ValueError: if an operation is unknown
+    runtime complexity: O(k * sqrt(k)) where k is the number of operations, the sums of the lengths run in C
+    """
+    def planBatch(self, ops):
+        ops = list(ops)
+        n = self.length()
+        capacity = max(16, int(len(ops) ** 0.5))  # a block of more pieces is split in two
+        blocks = [[(0, n)] if n else []]
+        lengths = [[n] if n else []]  # the lengths of the pieces of every block
+        totals = [n]  # the number of items in every block
+        length = n
+        changes = {}
+        for op in ops:
+            name, i = op[0], op[1]
+            if name not in ("insert", "delete", "set"):
+                raise ValueError("unknown batch operation %r" % (name,))
+            if not 0 <= i < length + (name == "insert"):
+                raise IndexError("batch operation index out of range")
+            if i == length:  # an insert at the end
+                b = len(blocks) - 1
+                j = len(blocks[b])
+                offset = 0
+            else:
+                ends = list(accumulate(totals))
+                b = bisect_right(ends, i)
+                i -= ends[b] - totals[b]
+                ends = list(accumulate(lengths[b]))
+                j = bisect_right(ends, i)
+                offset = i - ends[j] + lengths[b][j]  # the index of the item in its piece
+            pieces = blocks[b]
+            sizes = lengths[b]
+            if name == "insert":
+                if j < len(pieces) and type(pieces[j]) is list:  # among values inserted by the batch
+                    pieces[j].insert(offset, op[2])
+                    sizes[j] += 1
+                elif j and not offset and type(pieces[j - 1]) is list:  # right after values inserted by the batch
+                    j -= 1
+                    pieces[j].append(op[2])
+                    sizes[j] += 1
+                elif offset:  # the run is split around the new value
+                    start, size = pieces[j]
+                    pieces[j:j + 1] = [(start, offset), [op[2]], (start + offset, size - offset)]
+                    sizes[j:j + 1] = [offset, 1, size - offset]
+                    j += 1
+                else:
+                    pieces.insert(j, [op[2]])
+                    sizes.insert(j, 1)
+                if sizes[j] > capacity:  # a list of inserted values is split in two
+                    values = pieces[j]
+                    half = len(values) // 2
+                    pieces[j:j + 1] = [values[:half], values[half:]]
+                    sizes[j:j + 1] = [half, len(values) - half]
+                totals[b] += 1
+                length += 1
+                if len(pieces) > capacity:
+                    half = len(pieces) // 2
+                    blocks.insert(b + 1, pieces[half:])
+                    lengths.insert(b + 1, sizes[half:])
+                    del pieces[half:], sizes[half:]
+                    totals[b:b + 1] = [sum(sizes), sum(lengths[b + 1])]
+                continue
+            piece = pieces[j]
+            if type(piece) is list:  # a value inserted by the batch
+                if name == "set":
+                    piece[offset] = op[2]
+                    continue
+                if len(piece) > 1:
+                    del piece[offset]
+                    sizes[j] -= 1
+                else:
+                    del pieces[j], sizes[j]
+            else:
+                start, size = piece
+                changes[start + offset] = op
+                if name == "set":
+                    continue
+                parts = [(start, offset)] if offset else []
+                if offset + 1 < size:
+                    parts.append((start + offset + 1, size - offset - 1))
+                pieces[j:j + 1] = parts
+                sizes[j:j + 1] = [part[1] for part in parts]
+            totals[b] -= 1
+            length -= 1
+        gaps = {}
+        inserted = []
+        for pieces in blocks:
+            for piece in pieces:
+                if type(piece) is list:
+                    inserted.extend(piece)
+                elif inserted:
+                    gaps[piece[0]] = inserted
+                    inserted = []
+        if inserted:
+            gaps[n] = inserted
+        return [sorted(set(gaps).union(changes)), gaps, changes]
+
+    """returns whether a batch of operations is scattered over the list, so that applying its operations one at a
+    time is faster than planning it (see applyBatch). Planning pays off for runs of inserts at one gap and of
+    deletes at one place, which it turns into a block built at once and a range cut out at once. Every other
+    operation, a set or one that does not continue the run of the operation before it, starts a new place
+    @type ops: list
+    @param ops: the operations, see applyBatch
+    @rtype: bool
+    @returns: True if there is more than one place per BATCH_PLACES operations, False otherwise
+    runtime complexity: O(k) where k is the number of operations
+    """
+    def scatteredBatch(self, ops):
+        places = 0
+        name, i = None, 0
+        for op in ops:
+            if op[0] == "set" or op[0] != name or not -1 <= op[1] - i <= 1:
+                places += 1
+            name, i = op[0], op[1]
+        return places * self.BATCH_PLACES > len(ops)
+
+    """applies a batch of operations one after the other, see applyBatch. The batch is checked by checkBatch first,
+    so a bad operation leaves the list unchanged. A run of sets in a row is written by one call to setMany
+    @type ops: iterable
+    @param ops: the operations, in order
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    @raises IndexError: if an operation's index is out of range
+    @raises ValueError: if an operation is unknown
+    runtime complexity: O(k * logn) where k is the number of operations
+    """
+    def applyInOrder(self, ops):
+        counter = 0
+        indices = []  # the indices and values of the run of sets not written yet
+        values = []
+        for op in self.checkBatch(ops):
+            if op[0] == "set":
+                indices.append(op[1])
+                values.append(op[2])
+                continue
+            if indices:
+                self.setMany(indices, values)
+                indices, values = [], []
+            if op[0] == "insert":
+                counter += self.insert(op[1], op[2])
+            else:
+                counter += self.delete(op[1])
+        if indices:
+            self.setMany(indices, values)
+        return counter
+
+    """checks a batch of operations before any of them runs, following the length of the list through the batch
+    @type ops: iterable
+    @param ops: the operations, see applyBatch
+    @rtype: list
+    @returns: the operations, in order
+    @raises IndexError: if an operation's index is out of range
+    @raises ValueError: if an operation is unknown
+    runtime complexity: O(k) where k is the number of operations
+    """
+    def checkBatch(self, ops):
+        ops = list(ops)
+        length = self.length()
+        for op in ops:
+            name, i = op[0], op[1]
+            if name not in ("insert", "delete", "set"):
+                raise ValueError("unknown batch operation %r" % (name,))
+            if not 0 <= i < length + (name == "insert"):
+                raise IndexError("batch operation index out of range")
+            if name == "insert":
+                length += 1
+            elif name == "delete":
+                length -= 1
+        return ops
+
+    """Fixes the tree's balance, heights and sizes of node after insertion or deletion
+    @type node: AVLNode
+    @pre: node is not virtual (can be real or None)
+    @param node: the first node to be fixed
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def FixTree(self, node):
+        if self.balance == "treap":
+            return self.fixPriorities(node, False)
+        leftOf, rightOf, parentOf, heightOf = self.leftOf, self.rightOf, self.parentOf, self.heightOf
+        updateSize = self.updateSize
+        current = node
+        counter = 0
+        while current:
+            leftHeight, rightHeight = heightOf(leftOf(current)), heightOf(rightOf(current))
+            BF = leftHeight - rightHeight  # checks balance
+            if BF == -2:
+                pivot = rightOf(current)
+                pivotBF = heightOf(leftOf(pivot)) - heightOf(rightOf(pivot))
+                if pivotBF == 1:
+                    self.rotateRight(pivot)
+                    counter += 1
+                self.rotateLeft(current)
+                counter += 1
+            elif BF == 2:
+                pivot = leftOf(current)
+                pivotBF = heightOf(leftOf(pivot)) - heightOf(rightOf(pivot))
+                if pivotBF == -1:
+                    self.rotateLeft(pivot)
+                    counter += 1
+                self.rotateRight(current)
+                counter += 1
+            else:  # new balance ops required - checks height
+                newHeight = (leftHeight if leftHeight > rightHeight else rightHeight) + 1
+                if newHeight != heightOf(current):
+                    self.setHeightOf(current, newHeight)
+                    counter += 1
+            updateSize(current)
+            current = parentOf(current)
+        return counter
+
+    """Fixes the tree's balance and heights from node up after insertion or deletion, when the sizes of node and its
+    ancestors are already up to date. The climb stops at the first node whose subtree kept its height, since
+    nothing above it changes, so it returns the same count as FixTree while touching O(1) nodes amortized
+    @type node: AVLNode
+    @pre: node is not virtual (can be real or None)
+    @param node: the first node to be fixed
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn), O(1) amortized
+    """
+    def fixHeights(self, node):
+        if self.balance == "treap":
+            return self.fixPriorities(node, True)
+        current = node
+        counter = 0
+        while current is not None:
+            oldHeight = current.getHeight()
+            BF = current.getLeft().getHeight() - current.getRight().getHeight()  # checks balance
+            if BF == -2:
+                pivot = current.getRight()
+                pivotBF = pivot.getLeft().getHeight() - pivot.getRight().getHeight()
+                if pivotBF == 1:
+                    self.rotateRight(pivot)
+                    counter += 1
+                self.rotateLeft(current)
+                counter += 1
+                current = current.getParent()  # the new root of the rotated subtree
+            elif BF == 2:
+                pivot = current.getLeft()
+                pivotBF = pivot.getLeft().getHeight() - pivot.getRight().getHeight()
+                if pivotBF == -1:
+                    self.rotateLeft(pivot)
+                    counter += 1
+                self.rotateRight(current)
+                counter += 1
+                current = current.getParent()
+            else:
+                newHeight = max(current.getLeft().getHeight(), current.getRight().getHeight()) + 1
+                if newHeight != oldHeight:
+                    current.setHeight(newHeight)
+                    counter += 1
+            if current.getHeight() == oldHeight:
+                return counter
+            current = current.getParent()
+        return counter
+
+    """Fixes the heap order of a treap from node up after insertion or deletion, by rotating every node that outranks
+    its parent above it, and the heights and sizes on the way. Only a new node can outrank its parent, so the
+    rotations all lift it
+    @type node: TreapNode
+    @pre: node is not virtual (can be real or None)
+    @param node: the first node to be fixed
+    @type sized: bool
+    @param sized: whether the sizes of node and its ancestors are already up to date, as for fixHeights. The climb
+    then stops at the first node in heap order whose subtree kept its height
+    @rtype: int
+    @returns: the number of rotations
+    runtime complexity: O(logn) expected
+    """
+    def fixPriorities(self, node, sized):
+        current = node
+        counter = 0
+        while current is not None:
+            left = current.getLeft()
+            right = current.getRight()
+            if left.isRealNode() and left.priority > current.priority and \
+                    (not right.isRealNode() or left.priority >= right.priority):
+                self.rotateRight(current)
+                counter += 1
+                current = current.getParent().getParent()  # above left, or above its copy
+            elif right.isRealNode() and right.priority > current.priority:
+                self.rotateLeft(current)
+                counter += 1
+                current = current.getParent().getParent()
+            else:
+                oldHeight = current.getHeight()
+                current.updateHeight()
+                if not sized:
+                    current.updateSize()
+                elif current.getHeight() == oldHeight:
+                    return counter
+                current = current.getParent()
+        return counter
+
+    """Fixes the ranks of a WAVL tree from node up after deletion, when the sizes are already up to date. The ranks
+    are kept in the height fields: every child is 1 or 2 ranks below its parent, and the leaves have rank 0. A node
+    left 3 ranks above a child is demoted while its other child allows it (along with that child, if both of its
+    children are 2 ranks below it), and a single or double rotation ends the climb otherwise
+    @type node: AVLNode
+    @pre: node is not virtual (can be real or None)
+    @param node: the parent of the removed node
+    @rtype: int
+    @returns: the number of rebalancing operation due to WAVL rebalancing, counting rotations and demotions
+    runtime complexity: O(logn), O(1) amortized, at most 2 rotations
+    """
+    def fixRanks(self, node):
+        current = node
+        counter = 0
+        while current is not None:
+            rank = current.getHeight()
+            left = current.getLeft()
+            right = current.getRight()
+            if not left.isRealNode() and not right.isRealNode():
+                if rank == 0:
+                    return counter
+                current.setHeight(0)  # a leaf of rank 1 that lost its only child
+                counter += 1
+                current = current.getParent()
+                continue
+            if rank - left.getHeight() == 3:
+                sibling = right
+            elif rank - right.getHeight() == 3:
+                sibling = left
+            else:
+                return counter
+            if rank - sibling.getHeight() == 2:  # current can drop a rank
+                current.setHeight(rank - 1)
+                counter += 1
+                current = current.getParent()
+                continue
+            sibling = self.own(sibling)
+            if sibling is current.getRight():
+                inner, outer = sibling.getLeft(), sibling.getRight()
+            else:
+                inner, outer = sibling.getRight(), sibling.getLeft()
+            if sibling.getHeight() - inner.getHeight() == 2 and sibling.getHeight() - outer.getHeight() == 2:
+                current.setHeight(rank - 1)
+                sibling.setHeight(rank - 2)
+                counter += 2
+                current = current.getParent()
+                continue
+            if sibling.getHeight() - outer.getHeight() == 1:  # a single rotation lifts sibling to current's rank
+                if sibling is current.getRight():
+                    self.rotateLeft(current)
+                else:
+                    self.rotateRight(current)
+                sibling.setHeight(rank)
+                isLeaf = not current.getLeft().isRealNode() and not current.getRight().isRealNode()
+                current.setHeight(0 if isLeaf else rank - 1)
+                return counter + 1
+            if sibling is current.getRight():  # a double rotation lifts inner to current's rank
+                self.rotateRight(sibling)
+                self.rotateLeft(current)
+            else:
+                self.rotateLeft(sibling)
+                self.rotateRight(current)
+            current.getParent().setHeight(rank)  # inner, or its copy
+            sibling.setHeight(rank - 2)
+            current.setHeight(rank - 2)
+            return counter + 2
+        return counter
+
+    """returns the value of the first item in the list
+    @rtype: str
+    @returns: the value of the first item, None if the list is empty
+    runtime complexity: O(1) if the first node is cached, O(logn) otherwise
+    """
+    def first(self):
+        node = self.firstNode()
+        return None if node is None else node.getValue()
+
+    """returns the value of the last item in the list
+    @rtype: str
+    @returns: the value of the last item, None if the list is empty
+    runtime complexity: O(1) if the last node is cached, O(logn) otherwise
+    """
+    def last(self):
+        node = self.lastNode()
+        return None if node is None else node.getValue()
+
+    """returns the first node of the list, cached until the next write that does not keep it up to date
+    @rtype: AVLNode
+    @returns: the first node, None if the list is empty
+    runtime complexity: O(1) if cached, O(logn) otherwise
+    """
+    def firstNode(self):
+        if self.minNode is None and self.root.isRealNode():
+            self.minNode = self.getMin(self.root)
+        return self.minNode
+
+    """returns the last node of the list, cached until the next write that does not keep it up to date
+    @rtype: AVLNode
+    @returns: the last node, None if the list is empty
+    runtime complexity: O(1) if cached, O(logn) otherwise
+    """
+    def lastNode(self):
+        if self.maxNode is None and self.root.isRealNode():
+            self.maxNode = self.getMax(self.root)
+        return self.maxNode
+
+    """returns an array representing list 
+
+    @rtype: list
+    @returns: a list of strings representing the data structure
+    runtime complexity: O(n)
+    """
+    def listToArray(self):
+        return list(self)
+
+    """normalizes and sorts many indices at once, for retrieveMany and setMany
+    @type indices: iterable
+    @param indices: indices of the list, counted from the end when negative. A numpy array of integers is accepted
+    @rtype: list
+    @returns: a list [order, positions] where positions are the normalized indices in ascending order and order[k]
+    is the place in indices of positions[k]. Equal indices keep their order
+    @raises IndexError: if an index is out of range
+    runtime complexity: O(k * logk) where k is the number of indices
+    """
+    def sortIndices(self, indices):
+        if hasattr(indices, 'tolist'):  # a numpy array, whose items would be numpy integers
+            indices = indices.tolist()
+        positions = [self.normalizeIndex(i) for i in indices]
+        order = sorted(range(len(positions)), key=positions.__getitem__)
+        return [order, [positions[k] for k in order]]
+
+    """finds the nodes of many items in a single walk from the root: a subtree is entered once for all the positions
+    that fall in it, so the walks to nearby items share their common prefix
+    @type positions: list
+    @pre: positions is sorted and 0 <= positions[k] < self.length() for every k
+    @param positions: the indices of the items
+    @type owned: bool
+    @param owned: whether to copy the nodes walked through if a snapshot shares them, before writing to the nodes
+    found (see own). Copying them from the top down keeps every node found in the tree
+    @rtype: list
+    @returns: a list holding a pair [node, offset] for every position, in order, where offset is the index of the
+    item within the values of node (always 0 unless the nodes hold chunks)
+    runtime complexity: O(k + k * log(n / k)) where k is the number of positions
+    """
+    def locateMany(self, positions, owned=False):
+        located = [None] * len(positions)
+        stack = [(self.root, 0, 0, len(positions))] if positions else []
+        while stack:  # the positions lo to hi (excluded) fall in the subtree of node, whose first item is at start
+            node, start, lo, hi = stack.pop()
+            if hi - lo == 1:  # a lone position descends on its own, without bisecting
+                located[lo] = self.locateOne(node, positions[lo] - start, owned)
+                continue
+            if owned:
+                node = self.own(node)
+            left = node.left
+            first = start + left.size
+            end = first + node.size - left.size - node.right.size
+            mid = bisect_left(positions, first, lo, hi)
+            after = bisect_left(positions, end, mid, hi)
+            for k in range(mid, after):
+                located[k] = [node, positions[k] - first]
+            if lo < mid:
+                stack.append((left, start, lo, mid))
+            if after < hi:
+                stack.append((node.right, end, after, hi))
+        return located
+
+    """finds the node of an item in a subtree, see locateMany
+    @type node: AVLNode
+    @param node: the root of the subtree
+    @type i: int
+    @pre: 0 <= i < node.getSize()
+    @param i: the index of the item in the subtree
+    @type owned: bool
+    @param owned: whether to copy the nodes walked through if a snapshot shares them
+    @rtype: list
+    @returns: a pair [node, offset] where offset is the index of the item within the values of node
+    runtime complexity: O(logn)
+    """
+    def locateOne(self, node, i, owned=False):
+        while True:
+            if owned:
+                node = self.own(node)
+            left = node.left
+            if i < left.size:
+                node = left
+                continue
+            i -= left.size
+            width = node.size - left.size - node.right.size
+            if i < width:
+                return [node, i]
+            i -= width
+            node = node.right
+
+    """retrieves the values of many items at once, see locateMany
+    @type indices: iterable
+    @param indices: indices of the list, counted from the end when negative. A numpy array of integers is accepted
+    @type asArray: bool
+    @param asArray: whether to return the values as a numpy array instead of a list (requires numpy)
+    @rtype: list
+    @returns: the values of the items, in the order of indices
+    @raises IndexError: if an index is out of range
+    runtime complexity: O(k * logk + k * log(n / k)) where k is the number of indices
+    """
+    def retrieveMany(self, indices, asArray=False):
+        order, positions = self.sortIndices(indices)
+        values = [None] * len(order)
+        for k, (node, offset) in zip(order, self.locateMany(positions)):
+            values[k] = node.getValue()
+        if asArray:
+            import numpy
+            return numpy.array(values)
+        return values
+
+    """replaces the values of many items at once, see locateMany. When an index repeats, its last value is kept
+    @type indices: iterable
+    @param indices: indices of the list, counted from the end when negative. A numpy array of integers is accepted
+    @type values: iterable
+    @param values: the new values, one for each index
+    @raises IndexError: if an index is out of range, the list is then left unchanged
+    @raises ValueError: if there are not as many values as indices, the list is then left unchanged
+    runtime complexity: O(k * logk + k * log(n / k)) where k is the number of indices, plus O(k * logn) with an
+    augmentation
+    """
+    def setMany(self, indices, values):
+        values = values.tolist() if hasattr(values, 'tolist') else list(values)
+        order, positions = self.sortIndices(indices)
+        if len(values) != len(order):
+            raise ValueError("setMany got %d values for %d indices" % (len(values), len(order)))
+        self.prepareWrite()
+        for k, (node, offset) in zip(order, self.locateMany(positions, True)):
+            self.setNodeValue(node, values[k])
+
+    """cuts the list into pieces of nearly equal lengths, for the workers of parallelMap and parallelReduce. The
+    list is left as it is: every piece is read with iterRange
+    @type workers: int
+    @pre: workers >= 1
+    @param workers: the number of pieces
+    @type typecode: str
+    @param typecode: the typecode of the array module to pack the pieces in, which pickles numbers as a raw buffer
+    (optional, python lists otherwise)
+    @rtype: list
+    @returns: the pieces, in order
+    runtime complexity: O(n + workers * logn)
+    """
+    def pieces(self, workers, typecode=None):
+        n = self.length()
+        bounds = [n * k // workers for k in range(workers + 1)]
+        pack = list if typecode is None else (lambda values: array(typecode, values))
+        return [pack(self.iterRange(bounds[k], bounds[k + 1])) for k in range(workers)]
+
+    """applies f to the values of a piece, in a worker process of parallelMap
+    @type f: function
+    @param f: a function of a value
+    @type piece: list or array
+    @param piece: values of the list
+    @rtype: list or array
+    @returns: the results, packed as the piece was
+    runtime complexity: O(k) calls of f where k is the length of the piece
+    """
+    @staticmethod
+    def mapPiece(f, piece):
+        results = map(f, piece)
+        return list(results) if isinstance(piece, list) else array(piece.typecode, results)
+
+    """folds the values of a piece with f, in a worker process of parallelReduce
+    @type f: function
+    @param f: an associative function of two values
+    @type init: object
+    @param init: the identity element of f
+    @type piece: list or array
+    @param piece: values of the list
+    @rtype: object
+    @returns: the fold of the piece
+    runtime complexity: O(k) calls of f where k is the length of the piece
+    """
+    @staticmethod
+    def reducePiece(f, init, piece):
+        return reduce(f, piece, init)
+
+    """returns a new list holding f(val) for every value val of the list, in order. The list is cut into one piece
+    per worker, see pieces, the pieces are mapped in a pool of processes and the results are built into a list at
+    once. f and the values are sent to the workers by pickle, so f must be a module-level function
+    @type f: function
+    @param f: a function of a value
+    @type workers: int
+    @param workers: the number of processes (optional, the number of CPUs by default). A single worker maps the
+    list in this process
+    @type typecode: str
+    @param typecode: the typecode of the array module to send the values and the results in (optional)
+    @rtype: AVLTreeList
+    @returns: a new list with the same configuration as self
+    runtime complexity: O(n) calls of f split among the workers, plus O(n) to cut and build
+    """
+    def parallelMap(self, f, workers=None, typecode=None):
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or self.length() < workers:
+            return self.newList(map(f, self))
+        pieces = self.pieces(workers, typecode)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(AVLTreeList.mapPiece, [f] * workers, pieces))
+        return self.newList(chain.from_iterable(results))
+
+    """folds the values of the list with f, as functools.reduce(f, self, init) does. Each worker folds a piece of the
+    list, see pieces, and the results of the pieces are folded in this process, so f must be associative and init
+    its identity element. f and the values are sent to the workers by pickle, so f must be a module-level function
+    @type f: function
+    @param f: an associative function of two values
+    @type init: object
+    @param init: the identity element of f
+    @type workers: int
+    @param workers: the number of processes (optional, the number of CPUs by default). A single worker folds the
+    list in this process
+    @type typecode: str
+    @param typecode: the typecode of the array module to send the values in (optional)
+    @rtype: object
+    @returns: the fold of the values of the list, init if the list is empty
+    runtime complexity: O(n) calls of f split among the workers, plus O(n) to cut
+    """
+    def parallelReduce(self, f, init, workers=None, typecode=None):
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or self.length() < workers:
+            return reduce(f, self, init)
+        pieces = self.pieces(workers, typecode)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(AVLTreeList.reducePiece, [f] * workers, [init] * workers, pieces))
+        return reduce(f, results, init)
+
+    """generates the values of the items from index i up to index j (excluded), in order. The walk keeps the
+    ancestors that are still to be visited on an explicit stack instead of climbing parent pointers
+    @type i: int
+    @type j: int
+    @pre: 0 <= i <= j <= self.length()
+    @param i: the index of the first item
+    @param j: the index following the last item
+    @rtype: generator
+    runtime complexity: O(k + logn) where k = j - i
+    """
+    def iterRange(self, i, j):
+        count = j - i
+        if count <= 0:
+            return
+        stack = []
+        node = self.root
+        while True:  # descends to the i'th item, stacking the ancestors that come after it
+            leftSize = node.left.size
+            if i < leftSize:
+                stack.append(node)
+                node = node.left
+            elif i > leftSize:
+                i -= leftSize + 1
+                node = node.right
+            else:
+                break
+        while True:
+            yield node.value
+            count -= 1
+            if count == 0:
+                return
+            node = node.right
+            while node.height != -1:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+
+    """generates the values of the list, in order
+    @rtype: generator
+    runtime complexity: O(n)
+    """
+    def __iter__(self):
+        return self.iterRange(0, self.root.size)
+
+    """generates the values of the list, from the last to the first
+    @rtype: generator
+    runtime complexity: O(n)
+    """
+    def __reversed__(self):
+        stack = []
+        node = self.root
+        while True:
+            while node.height != -1:
+                stack.append(node)
+                node = node.right
+            if not stack:
+                return
+            node = stack.pop()
+            yield node.value
+            node = node.left
+
+    """returns the size of the list 
+
+    @rtype: int
+    @returns: the size of the list
+    runtime complexity: O(1)
+    """
+    def length(self):
+        return self.root.getSize()
+
+    """splits the list at the i'th index
+    @type i: int
+    @pre: 0 <= i < self.length()
+    @param i: The intended index in the list according to which we split the tree
+    @rtype: list
+    @returns: a list [left, val, right], where left is an AVLTreeList representing the list until index i-1,
+    right is an AVLTreeList representing the list from index i+1, and val is the value at the i'th index.
+    runtime complexity: O(logn)
+    """
+    def split(self, i):
+        self.prepareWrite()
+        left = self.newList()
+        right = self.newList()
+        left.lazy = right.lazy = self.lazy
+        x = self.own(self.retrieveNode(i))
+        left.root, right.root = self.splitAtNode(x)[:2]
+        if self.valueIndex is not None:
+            self.indexRemove(x)
+            self.splitIndex(left, right)
+        return [left, x.getValue(), right]
+
+    """concatenates lst to self, see joinList
+    @type lst: AVLTreeList
+    @param lst: a list to be concatenated after self
+    @rtype: int
+    @returns: the absolute value of the difference between the height of the AVL trees joined
+    runtime complexity: O(logn)
+    """
+    def concat(self, lst):
+        diff = abs(self.root.getHeight() - lst.root.getHeight())
+        self.joinList(lst)
+        return diff
+
+    """concatenates lst to self. The last node of self is detached and reused as the node joining the two trees
+    @type lst: AVLTreeList
+    @param lst: a list to be concatenated after self
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    @raises ValueError: if lst is balanced by another policy than self
+    runtime complexity: O(logn)
+    """
+    def joinList(self, lst):
+        if lst.balance != self.balance:
+            raise ValueError("cannot join a %s list to a %s list" % (lst.balance, self.balance))
+        self.prepareWrite()
+        lst.prepareWrite()
+        self.mergeEpoch(lst)
+        counter = 0
+        if self.valueIndex is not None:
+            self.mergeIndex(lst)  # before lst's nodes are rotated into self
+        if self.root.isVirtual():
+            self.root = lst.root
+        elif lst.root.isRealNode():
+            x = self.own(self.getMax(self.root))
+            val = x.getValue()
+            counter += self.deleteNode(x)  # x has no right child, so deleteNode removes x itself from the tree
+            x.setValue(val)
+            x.makeReal()
+            if self.valueIndex is not None:
+                self.indexAdd(x)
+            counter += self.join(self.root, x, lst.root)
+        lst.root = VIRTUAL
+        if lst.valueIndex is not None:
+            lst.valueIndex = {}
+        return counter
+
+    """concatenates many lists to self at once, in order, leaving them empty. Unlike a loop of concat, which joins
+    every list to the whole tree built so far, the trees are joined by height, see joinFragments
+    @type lists: list
+    @param lists: the lists to be concatenated after self
+    @pre: self is not in lists, and no list appears in it twice
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    @raises ValueError: if a list is balanced by another policy than self, no list is then changed
+    @raises TypeError: if a list is a snapshot, no list is then changed
+    runtime complexity: O(k * log(n / k) + k) where k is the number of lists and n the total length
+    """
+    def concatAll(self, lists):
+        lists = list(lists)
+        for lst in lists:
+            if lst.balance != self.balance:
+                raise ValueError("cannot join a %s list to a %s list" % (lst.balance, self.balance))
+            if lst.frozen:
+                raise TypeError("a snapshot is read-only")
+        return self.joinFragments(lists)
+
+    """concatenates the lists of an iterable to self, in order, each as soon as the iterable yields it, leaving them
+    empty. Fragments produced one by one, e.g. by a generator over the results of workers, are thus joined while
+    the next ones are still being made, and only O(logn) partial trees are kept in between, see joinFragments
+    @type fragments: iterable
+    @param fragments: the lists to be concatenated after self (may be a generator)
+    @pre: self is not among fragments, and no list appears in it twice
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    @raises ValueError: if a list is balanced by another policy than self, the lists before it are then already
+    concatenated
+    runtime complexity: O(k * log(n / k) + k) where k is the number of lists and n the total length
+    """
+    def concatStream(self, fragments):
+        return self.joinFragments(fragments)
+
+    """concatenates lists to self in one pass. The last node of every tree is detached and reused as the node
+    joining it to the next tree. The joined trees wait on a stack of decreasing heights, like the digits of a
+    binary counter: every new tree is first joined to the waiting trees that are not taller than it, so each join
+    is between trees of close heights, and the trees left at the end are joined from right to left. No node is
+    made or copied
+    @type fragments: iterable
+    @param fragments: the lists to be concatenated after self, read once
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    @raises ValueError: if a list is balanced by another policy than self
+    runtime complexity: O(k * log(n / k) + k) where k is the number of lists and n the total length
+    """
+    def joinFragments(self, fragments):
+        self.prepareWrite()
+        counter = 0
+        stack = []  # pairs [root, mid] of a tree and the node that follows it, of decreasing heights
+        try:
+            for lst in chain([self], fragments):
+                if lst is not self:
+                    if lst.balance != self.balance:
+                        raise ValueError("cannot join a %s list to a %s list" % (lst.balance, self.balance))
+                    lst.prepareWrite()
+                    epoch = self.epoch
+                    self.mergeEpoch(lst)
+                    if self.epoch != epoch:  # the waiting trees and nodes were joined in an earlier epoch of self
+                        for pair in stack:
+                            if pair[0].isRealNode():
+                                pair[0] = self.own(pair[0])
+                            pair[1] = self.own(pair[1])
+                if lst.root.isVirtual():
+                    continue
+                mid = lst.own(lst.getMax(lst.root))  # lst copies its shared nodes into its own index
+                val = mid.getValue()
+                counter += lst.deleteNode(mid)
+                mid.setValue(val)
+                mid.makeReal()
+                if lst is not self and self.valueIndex is not None:
+                    self.mergeIndex(lst)  # once lst is done changing its nodes
+                mid = self.own(mid)  # the epoch of lst may be earlier than that of self
+                if self.valueIndex is not None:
+                    self.indexAdd(mid)
+                root = lst.root
+                lst.root = VIRTUAL
+                if lst is not self and lst.valueIndex is not None:
+                    lst.valueIndex = {}
+                while stack and stack[-1][0].getHeight() <= root.getHeight():
+                    left, leftMid = stack.pop()
+                    counter += self.join(left, leftMid, root)
+                    root = self.root
+                stack.append([root, mid])
+        finally:  # the lists joined so far stay in self if a fragment is rejected
+            root = VIRTUAL
+            while stack:
+                left, mid = stack.pop()
+                counter += self.join(left, mid, root)
+                root = self.root
+            self.root = root
+        return counter
+
+    """searches for a *value* in the list. Values are matched by identity, or with == if the list was configured
+    so by enableIndex
+    @type val: str
+    @param val: a value to be searched
+    @rtype: int
+    @returns: the first index that contains val, -1 if not found.
+    runtime complexity: O(n), O(m * logn) expected with an index where m is the number of matching items
+    """
+    def search(self, val):
+        if self.valueIndex is not None:
+            nodes = self.valueIndex.get(self.indexKey(val))
+            if not nodes:
+                return -1
+            return min(self.rank(node) for node in nodes)
+        counter = 0
+        for current in self:
+            if current is val or (self.byEquality and current == val):
+                return counter
+            counter += 1
+        return -1
+
+    """returns all the indices holding a value, matched like in search
+    @type val: str
+    @param val: a value to be searched
+    @rtype: list
+    @returns: the indices that contain val, in increasing order
+    runtime complexity: O(n), O(m * logm + m * logn) expected with an index where m is the number of matching items
+    """
+    def indexOfAll(self, val):
+        if self.valueIndex is not None:
+            return sorted(self.rank(node) for node in self.valueIndex.get(self.indexKey(val), ()))
+        indices = []
+        counter = 0
+        for current in self:
+            if current is val or (self.byEquality and current == val):
+                indices.append(counter)
+            counter += 1
+        return indices
+
+    """returns whether a value is in the list, matched like in search
+    @type val: str
+    @param val: a value to be searched
+    @rtype: bool
+    @returns: True if an item holds val, False otherwise
+    runtime complexity: O(n), O(1) expected with an index
+    """
+    def contains(self, val):
+        if self.valueIndex is not None:
+            return bool(self.valueIndex.get(self.indexKey(val)))
+        return self.search(val) != -1
+
+    """returns whether a value is in the list, matched like in search
+    @type val: str
+    @param val: a value to be searched
+    @rtype: bool
+    @returns: True if an item holds val, False otherwise
+    runtime complexity: O(n), O(1) expected with an index
+    """
+    def __contains__(self, val):
+        return self.contains(val)
+
+    """builds a hash index from the values to the nodes holding them, which insert, delete, split, concat and the
+    other operations keep up to date. search, indexOfAll and contains then run in expected O(logn) per match
+    @type byEquality: bool
+    @param byEquality: True to match values with == (the values must be hashable), False to match them by identity
+    @raises TypeError: if self is a snapshot, which cannot rank the nodes it would find
+    runtime complexity: O(n)
+    """
+    def enableIndex(self, byEquality=False):
+        if self.frozen:
+            raise TypeError("a snapshot cannot be indexed")
+        self.byEquality = byEquality
+        self.valueIndex = {}
+        for node in self.iterNodes(self.root):
+            self.indexAdd(node)
+
+    """drops the hash index, searches go back to scanning the list
+    runtime complexity: O(1)
+    """
+    def disableIndex(self):
+        self.valueIndex = None
+
+    """returns the key under which a value is kept in the hash index
+    @type val: str
+    @param val: a value
+    @rtype: object
+    @returns: val itself when matching by equality, its id otherwise
+    runtime complexity: O(1)
+    """
+    def indexKey(self, val):
+        return val if self.byEquality else id(val)
+
+    """adds a node to the hash index
+    @type node: AVLNode
+    @pre: node is a real node of self
+    @param node: The given node
+    runtime complexity: O(1) expected
+    """
+    def indexAdd(self, node):
+        key = self.indexKey(node.value)
+        nodes = self.valueIndex.get(key)
+        if nodes is None:
+            self.valueIndex[key] = {node}
+        else:
+            nodes.add(node)
+
+    """removes a node from the hash index, if it is there
+    @type node: AVLNode
+    @pre: node is a real node
+    @param node: The given node
+    runtime complexity: O(1) expected
+    """
+    def indexRemove(self, node):
+        key = self.indexKey(node.value)
+        nodes = self.valueIndex.get(key)
+        if nodes is not None:
+            nodes.discard(node)
+            if not nodes:
+                del self.valueIndex[key]
+
+    """hands the hash index of self over to the two lists self was split into. The bigger list takes the index as is
+    and the nodes of the smaller one are moved into an index of their own
+    @type left: AVLTreeList
+    @type right: AVLTreeList
+    @pre: self.valueIndex is not None, and holds exactly the nodes of left and right
+    runtime complexity: O(min(left.length(), right.length()))
+    """
+    def splitIndex(self, left, right):
+        big, small = (left, right) if left.length() >= right.length() else (right, left)
+        big.byEquality = small.byEquality = self.byEquality
+        big.valueIndex = self.valueIndex
+        small.valueIndex = {}
+        for node in self.iterNodes(small.root):
+            big.indexRemove(node)
+            small.indexAdd(node)
+        self.valueIndex = {}
+
+    """adds the nodes of lst to the hash index of self, merging the smaller index into the bigger one
+    @type lst: AVLTreeList
+    @pre: self.valueIndex is not None, lst's nodes are not in it yet
+    runtime complexity: O(min(self.length(), lst.length())) if lst has a matching index, O(lst.length()) otherwise
+    """
+    def mergeIndex(self, lst):
+        if lst.valueIndex is None or lst.byEquality != self.byEquality:
+            for node in self.iterNodes(lst.root):
+                self.indexAdd(node)
+            return
+        big, small = self.valueIndex, lst.valueIndex
+        if len(big) < len(small):
+            big, small = small, big
+        for key, nodes in small.items():
+            if key in big:
+                big[key] |= nodes
+            else:
+                big[key] = nodes
+        self.valueIndex = big
+
+    """replaces the value of the given node, keeping the hash index and the aggregates up to date
+    @type node: AVLNode
+    @pre: node is a real node of self
+    @param node: The given node
+    @type val: str
+    @param val: the new value
+    runtime complexity: O(1) expected, O(logn) with an augmentation or when a snapshot shares the node
+    """
+    def setNodeValue(self, node, val):
+        self.prepareWrite()
+        node = self.own(node)
+        if self.valueIndex is not None:
+            self.indexRemove(node)
+            node.setValue(val)
+            self.indexAdd(node)
+        else:
+            node.setValue(val)
+        if self.augmentation is not None:
+            while node is not None:
+                node.updateSize()
+                node = node.getParent()
+
+    """generates the nodes of the given subtree, in order
+    @type root: AVLNode
+    @param root: the root of the subtree (may be virtual)
+    @rtype: generator
+    runtime complexity: O(n) where n is the size of the subtree
+    """
+    def iterNodes(self, root):
+        stack = []
+        node = root
+        while True:
+            while node.height != -1:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            yield node
+            node = node.right
+
+    """returns the root of the tree representing the list
+    @rtype: AVLNode
+    @returns: the root, None if the list is empty
+    runtime complexity: O(1)
+    """
+    def getRoot(self):
+        if self.root.isVirtual():
+            return None
+        return self.root
+
+    """returns whether reading the list may change it: a lazily loaded list loads nodes as they are reached, and
+    the stats of a list count every read. Such a list must not be read by two threads at once
+    @rtype: bool
+    @returns: True if the reads of the list write to it
+    runtime complexity: O(1)
+    """
+    def readsWrite(self):
+        return self.lazy or self.statistics is not None
+
+    """returns a read-only view of the list as it is now. The view shares the nodes of the list, and starts a new
+    epoch of the list, later than every node made so far: a node made before it is never written to again, the list
+    writes to a copy of it instead (see own), so the view never changes and every write copies only the nodes on its
+    paths. The epoch is the list's own, so the other lists do not copy their nodes, and once every snapshot sharing
+    nodes with the list is garbage collected, the list writes to its nodes in place again (see prepareWrite). The
+    view walks down from its root only, since the list moves the parent pointers of the shared nodes to the copies
+    @rtype: AVLTreeList
+    @returns: a read-only list, every write to it raises TypeError, and so does rank. A snapshot of a snapshot is
+    itself
+    runtime complexity: O(1)
+    """
+    def snapshot(self):
+        if self.frozen:
+            return self
+        AVLNode.currentEpoch += 1
+        self.epoch = AVLNode.currentEpoch
+        if self.snapshots is None:
+            self.snapshots = WeakSet()
+        view = self.newList()
+        view.root = self.root
+        view.byEquality = self.byEquality
+        view.lazy = self.lazy
+        view.frozen = True
+        self.snapshots.add(view)
+        return view
+
+    """prepares the list to be written to: forgets the cached first and last nodes, and goes back to the first
+    epoch once no snapshot may share nodes with the list, so that every node is written to in place
+    @raises TypeError: if self is a snapshot
+    runtime complexity: O(1)
+    """
+    def prepareWrite(self):
+        if self.frozen:
+            raise TypeError("a snapshot is read-only")
+        self.minNode = self.maxNode = None
+        if self.epoch and not self.snapshots:
+            self.epoch = 0
+            self.snapshots = None
+
+    """makes a list that is given nodes of self share the epoch and the snapshots of self, so that it copies the
+    nodes a snapshot of self holds
+    @type lst: AVLTreeList
+    @param lst: a new list
+    @rtype: AVLTreeList
+    @returns: lst
+    runtime complexity: O(1)
+    """
+    def shareEpoch(self, lst):
+        lst.epoch = self.epoch
+        lst.snapshots = self.snapshots
+        return lst
+
+    """makes self copy the nodes that lst copies, before the nodes of lst are moved into self: self moves on to the
+    epoch of lst if it is later, and keeps the snapshots of lst with its own. If lst was loaded lazily, so is self
+    @type lst: AVLTreeList
+    @param lst: a list to be joined to self
+    runtime complexity: O(k) where k is the number of live snapshots of lst
+    """
+    def mergeEpoch(self, lst):
+        if lst.epoch > self.epoch:
+            self.epoch = lst.epoch
+        self.lazy = self.lazy or lst.lazy
+        if lst.snapshots and lst.snapshots is not self.snapshots:
+            self.snapshots = WeakSet(chain(self.snapshots or (), lst.snapshots))
+
+    """returns the node of the live tree standing for the given node, which self may write to. A node of an earlier
+    epoch than the epoch of self may be shared with a snapshot: it is replaced by a copy, and so are its ancestors
+    of an earlier epoch, from the top down, so that every ancestor of a node self may write to is one too. The copies
+    are of the latest epoch of any list, which is not earlier than the epoch of self. They take the place of the
+    nodes in their parents (or as the root of self) and in the hash index, and the children of the copies point to
+    them. The shared nodes stay as they are, but for their parent pointers, which snapshots never read
+    @type node: AVLNode
+    @pre: node is a real node of self, or the detached root of a tree of self
+    @param node: the given node
+    @rtype: AVLNode
+    @returns: node itself if it is not of an earlier epoch than self, its copy otherwise
+    runtime complexity: O(1) if node is not of an earlier epoch than self, O(k) for k copies otherwise
+    """
+    def own(self, node):
+        epoch = self.epoch
+        if node.epoch >= epoch:
+            return node
+        path = []
+        while node is not None and node.epoch < epoch:
+            path.append(node)
+            node = node.parent
+        parent = node
+        for node in reversed(path):
+            copy = self.copyNode(node)
+            copy.parent = parent
+            if parent is None:
+                if self.root is node:
+                    self.root = copy
+            elif parent.left is node:
+                parent.left = copy
+            elif parent.right is node:  # a node being joined may have left its parent already
+                parent.right = copy
+            parent = copy
+        return parent
+
+    """copies a node of an earlier epoch into the latest one, see own. The children of a lazy node are loaded, and
+    the tags of a tagged node are pushed to its children first, so the copy and the node stand for the same items.
+    The copy is not linked to the parent of the node
+    @type node: AVLNode
+    @pre: node is a real node
+    @param node: the given node
+    @rtype: AVLNode
+    @returns: the copy
+    runtime complexity: O(1), O(chunkSize) for a chunk
+    """
+    def copyNode(self, node):
+        node.getLeft()
+        copy = node.copy()
+        copy.epoch = AVLNode.currentEpoch
+        for child in (copy.left, copy.right):
+            if child.height != -1:
+                child.parent = copy
+        if self.valueIndex is not None:
+            self.indexRemove(node)
+            self.indexAdd(copy)
+        self.generation += 1
+        return copy
+
+    """constructs an empty list with the configuration and the hash index of self, for the trees that split and
+    join build out of the nodes of self, so the nodes they copy are replaced in the index of self
+    @rtype: AVLTreeList
+    @returns: a new list
+    runtime complexity: O(1)
+    """
+    def fragmentList(self):
+        lst = self.newList()
+        lst.valueIndex = self.valueIndex
+        lst.byEquality = self.byEquality
+        lst.lazy = self.lazy
+        return lst
+
+    """writes the list to a file, see ListFile for its format. The tree itself is not written: load shapes it anew
+    @type path: str
+    @param path: the path of the file
+    @type typecode: str
+    @param typecode: the typecode of the array module to write numeric values with (optional, the values are
+    pickled one by one otherwise)
+    runtime complexity: O(n)
+    """
+    def dump(self, path, typecode=None):
+        ListFile.write(path, iter(self), self.length(), typecode)
+
+    """reads a list written by dump
+    @type path: str
+    @param path: the path of the file
+    @type mmap: bool
+    @param mmap: whether to memory map the file and load the nodes only when they are first reached, instead of
+    loading them all at once (optional). The map stays open until every node is loaded, see close. Writing to the
+    file through dump is safe meanwhile, the list keeps the old file
+    @rtype: AVLTreeList
+    @returns: a new list
+    @raises ValueError: if the file is not a list file, or if mmap is True and cls keeps more than values in its nodes
+    runtime complexity: O(n), O(1) with mmap, after which every node first reached costs O(1) more
+    """
+    @classmethod
+    def load(cls, path, mmap=False):
+        lst = cls()
+        with open(path, 'rb') as f:
+            if not mmap:
+                lst.root = lst.newList(ListFile(f.read()).values()).root
+                return lst
+            if lst.nodeClass is not AVLNode:
+                raise ValueError("only a plain AVLTreeList can be loaded lazily")
+            source = ListFile(memoryMap(f.fileno(), 0, access=ACCESS_READ))
+        lst.root = source.node(0, source.length, None)
+        lst.lazy = True
+        if not source.pending:
+            source.close()
+        return lst
+
+    """loads the nodes of a lazily loaded list that are still in its file (see load), so the list no longer reads
+    the file. The memory map of the file is closed once no node is left to load from it, which a snapshot of the
+    list, or a list split from it, may still hold
+    runtime complexity: O(n), O(1) if the list was not loaded lazily
+    """
+    def close(self):
+        if not self.lazy:
+            return
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.isRealNode():
+                stack.append(node.left)  # reading a child loads both children
+                stack.append(node.right)
+        self.lazy = False
+
+    """returns the state of the list for pickle: its values replace its tree, which is shaped anew by __setstate__,
+    so pickling neither recurses through the nodes nor copies them
+    @rtype: dict
+    @returns: the state of the list
+    runtime complexity: O(n)
+    """
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['root'] = self.listToArray()
+        state['valueIndex'] = self.valueIndex is not None  # the index maps ids, which are rebuilt on load
+        state['minNode'] = state['maxNode'] = None
+        state['lazy'] = False
+        state['epoch'] = 0  # the copy has nodes of its own, which no snapshot shares
+        state['snapshots'] = None
+        if self.statistics is not None:  # the instrumented methods are bound to self
+            for name in self.STATS_METHODS + ('statsCallback',):
+                state.pop(name, None)
+            state['nodeClass'] = self.nodeClass.nodeClass
+            state['statistics'] = None
+        if self.journal is not None:  # the copy does not write to the journal of self
+            for name in self.JOURNAL_OPERATIONS:
+                state.pop(name, None)
+            state['journal'] = None
+        if self.augmentation is not None:  # the node class of the augmentation is made anew on load
+            del state['nodeClass']
+        return state
+
+    """restores the list from a state made by __getstate__
+    @type state: dict
+    @param state: the state of the list
+    runtime complexity: O(n)
+    """
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.augmentation is not None:
+            self.nodeClass = self.augmentation.nodeClass
+        self.valueIndex = None
+        self.root = self.newList(state['root']).root
+        if state['valueIndex']:
+            self.enableIndex(self.byEquality)
+
+    """turns on the stats of the list. The operations in STATS_OPERATIONS are timed, and retrieveNode, getSuccessor,
+    rotateLeft, rotateRight and the node allocations are counted. The instrumented versions are set on the instance
+    over the methods of the class, so a list whose stats are off runs exactly the code it runs without them, and the
+    nodes are made by a counting subclass of the node class (see countedNodeClass). Nested
+    operations are counted on their own too. The lists returned by operations of self start with their stats off,
+    and so do the temporary trees that split and join build, whose rotations are not counted
+    @type callback: function
+    @param callback: called as callback(name, seconds) after every timed operation (optional)
+    runtime complexity: O(1), then O(logn) more for every counted call
+    """
+    def enableStats(self, callback=None):
+        self.disableStats()
+        self.statistics = {'calls': {}, 'latency': {}, 'descentDepth': {}, 'successorSteps': {},
+                           'rotations': {'single': 0, 'double': 0, 'treap': 0}, 'allocations': 0}
+        self.statsCallback = callback
+        for name in self.STATS_OPERATIONS:
+            setattr(self, name, self.timedMethod(name, getattr(self, name)))
+        setattr(self, 'retrieveNode', self.countedRetrieveNode(self.retrieveNode))
+        setattr(self, 'getSuccessor', self.countedGetSuccessor(self.getSuccessor))
+        setattr(self, 'rotateLeft', self.countedRotation(self.rotateLeft))
+        setattr(self, 'rotateRight', self.countedRotation(self.rotateRight))
+        self.nodeClass = self.countedNodeClass(self.nodeClass)
+
+    """turns off the stats of the list, removing every instrumented method
+    runtime complexity: O(1)
+    """
+    def disableStats(self):
+        if self.statistics is None:
+            return
+        self.nodeClass = self.nodeClass.nodeClass
+        for name in self.STATS_METHODS + ('statsCallback',):
+            self.__dict__.pop(name, None)
+        self.statistics = None
+        if self.journal is not None:  # its methods were removed with the instrumented ones
+            self.wrapJournal()
+
+    """returns a copy of the stats collected since enableStats. calls and latency are keyed by operation name,
+    latency[name][b] counts the calls that took between 2 ** (b - 1) and 2 ** b nanoseconds. descentDepth counts
+    the depths the descents from the root reach, those of retrieveNode and the top-down walks of insert, delete and
+    the chunked locate, successorSteps counts the lengths of the walks of getSuccessor. rotations splits the rotations
+    of FixTree into single and double ones, and counts the rotations of a treap apart, allocations counts the nodes
+    made
+    @rtype: dict
+    @returns: the stats, None if they are off
+    runtime complexity: O(k) where k is the number of counters
+    """
+    def getStats(self):
+        if self.statistics is None:
+            return None
+        stats = dict(self.statistics)
+        for key in ('calls', 'descentDepth', 'successorSteps', 'rotations'):
+            stats[key] = dict(stats[key])
+        stats['latency'] = dict((name, dict(buckets)) for name, buckets in stats['latency'].items())
+        return stats
+
+    """adds one to a counter of a stats dict
+    @type counters: dict
+    @param counters: the counters
+    @type key: object
+    @param key: the counter
+    runtime complexity: O(1)
+    """
+    def countStat(self, counters, key):
+        counters[key] = counters.get(key, 0) + 1
+
+    """returns the number of edges from the root to the given node
+    @type node: AVLNode
+    @pre: node is a real node of self
+    @rtype: int
+    @returns: the depth of node
+    runtime complexity: O(logn)
+    """
+    def depth(self, node):
+        depth = 0
+        while node.parent is not None:
+            node = node.parent
+            depth += 1
+        return depth
+
+    """wraps an operation of the list so that it is counted and timed
+    @type name: str
+    @param name: the name of the operation
+    @type method: function
+    @param method: the bound method
+    @rtype: function
+    @returns: the instrumented method
+    runtime complexity: O(1)
+    """
+    def timedMethod(self, name, method):
+        def timed(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns() - start
+                self.countStat(self.statistics['calls'], name)
+                self.countStat(self.statistics['latency'].setdefault(name, {}), elapsed.bit_length())
+                if self.statsCallback is not None:
+                    self.statsCallback(name, elapsed / 1e9)
+        return timed
+
+    """wraps retrieveNode so that the depth of every node it reaches is counted
+    @type method: function
+    @param method: the bound method
+    @rtype: function
+    @returns: the instrumented method
+    runtime complexity: O(1)
+    """
+    def countedRetrieveNode(self, method):
+        def retrieveNode(i):
+            node = method(i)
+            if node is not None:
+                self.countDescent(node)
+            return node
+        return retrieveNode
+
+    """counts the depth of the node a descent from the root reached in the descentDepth stats. retrieveNode is
+    counted by its wrapper, the descents that do not call it count themselves while the stats are on
+    @type node: AVLNode
+    @pre: node is a real node of self
+    @param node: the deepest node the descent reached
+    runtime complexity: O(logn)
+    """
+    def countDescent(self, node):
+        self.countStat(self.statistics['descentDepth'], self.depth(node))
+
+    """wraps getSuccessor so that the number of edges walked from a node to its successor is counted
+    @type method: function
+    @param method: the bound method
+    @rtype: function
+    @returns: the instrumented method
+    runtime complexity: O(1)
+    """
+    def countedGetSuccessor(self, method):
+        def getSuccessor(node):
+            successor = method(node)
+            steps = self.depth(node) - (self.depth(successor) if successor is not None else 0)
+            self.countStat(self.statistics['successorSteps'], abs(steps))
+            return successor
+        return getSuccessor
+
+    """wraps a rotation so that it is counted. FixTree makes the first rotation of a double rotation below a node
+    whose balance factor is 2 or -2, while a single rotation leaves the parent of its node balanced: a rotation below
+    an unbalanced parent counts as a double rotation, and the one that follows it is its second half. The rotations
+    of a treap follow the priorities, not the balance factors, and are counted apart as treap rotations
+    @type method: function
+    @param method: the bound method
+    @rtype: function
+    @returns: the instrumented method
+    runtime complexity: O(1)
+    """
+    def countedRotation(self, method):
+        def rotate(node):
+            rotations = self.statistics['rotations']
+            parent = node.parent
+            if self.balance == "treap":
+                rotations['treap'] += 1
+            elif parent is not None and abs(parent.left.height - parent.right.height) == 2:
+                rotations['double'] += 1
+                rotations['single'] -= 1  # the second half of the double rotation will be counted as a single one
+            else:
+                rotations['single'] += 1
+            method(node)
+        return rotate
+
+    """makes a subclass of the node class of the list whose constructor counts every node made, so the nodes of the
+    list stay instances of nodeClass while the stats are on
+    @type nodeClass: type
+    @param nodeClass: the node class
+    @rtype: type
+    @returns: the counting subclass, which keeps nodeClass in its attribute nodeClass
+    runtime complexity: O(1)
+    """
+    def countedNodeClass(self, nodeClass):
+        statistics = self.statistics
+
+        def __init__(node, value):
+            statistics['allocations'] += 1
+            nodeClass.__init__(node, value)
+        return type(nodeClass.__name__, (nodeClass,), {'__slots__': (), '__init__': __init__, 'nodeClass': nodeClass})
+
+    """turns on the journal of the list: from now on, every operation in JOURNAL_OPERATIONS that succeeds is written
+    to the given file as a change (see Journal), after the values the list holds now, and replay rebuilds the list
+    from the file. Like the stats, the journaled versions of the operations are set on the instance, and the
+    operations they call are not written on their own. The writes of cursors are written as the inserts, deletes and
+    setMany they make, those of the node-level methods are not journaled. Every change is flushed to the file once
+    written, so the file holds every change that succeeded before a crash
+    @type path: str
+    @param path: the path of the journal file, overwritten if it exists
+    runtime complexity: O(n), then O(1) more for every journaled operation, not counting pickling
+    """
+    def enableJournal(self, path):
+        self.startJournal().openFile(path, self.listToArray())
+
+    """turns off the journal of the list and closes its file. The subscribers of changes keep receiving changes
+    runtime complexity: O(1)
+    """
+    def disableJournal(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.releaseJournal()
+
+    """returns the journal of the list, journaling the operations of the list first if they are not yet
+    @rtype: Journal
+    @returns: the journal
+    runtime complexity: O(1)
+    """
+    def startJournal(self):
+        if self.journal is None:
+            self.journal = Journal()
+            self.wrapJournal()
+        return self.journal
+
+    """stops journaling the operations of the list once the journal has neither a file nor subscribers
+    runtime complexity: O(1)
+    """
+    def releaseJournal(self):
+        if self.journal is None or self.journal.file is not None or self.journal.subscribers:
+            return
+        for name in self.JOURNAL_OPERATIONS:
+            self.__dict__.pop(name, None)
+        self.journal = None
+        if self.statistics is not None:  # its timed methods were removed with the journaled ones
+            for name in self.STATS_OPERATIONS:
+                if name in self.JOURNAL_OPERATIONS:
+                    setattr(self, name, self.timedMethod(name, getattr(self, name)))
+
+    """sets the journaled versions of the operations in JOURNAL_OPERATIONS on the instance
+    runtime complexity: O(1)
+    """
+    def wrapJournal(self):
+        for name in self.JOURNAL_OPERATIONS:
+            setattr(self, name, self.journaledMethod(name, getattr(self, name)))
+
+    """wraps an operation of the list so that it is recorded in the journal once it succeeds
+    @type name: str
+    @param name: the name of the operation
+    @type method: function
+    @param method: the bound method
+    @rtype: function
+    @returns: the journaled method
+    runtime complexity: O(1)
+    """
+    def journaledMethod(self, name, method):
+        def journaled(*args, **kwargs):
+            journal = self.journal
+            if journal.depth:  # called by another journaled operation, which is recorded as a whole
+                return method(*args, **kwargs)
+            if kwargs:
+                args = inspect.signature(getattr(type(self), name)).bind(self, *args, **kwargs).args[1:]
+            args, change = self.journalChange(name, args)
+            return journal.run(change, lambda: method(*args))
+        return journaled
+
+    """describes an operation of the list as a change of its journal, before it runs. The operations at the ends
+    become inserts and deletes, and the iterables the operation reads once are turned into lists. The lists that
+    concat, concatAll and concatStream join are recorded one at a time as concat changes (see recordedFragments), so
+    a stream of lists is journaled as it is read
+    @type name: str
+    @param name: the name of the operation
+    @type args: tuple
+    @param args: the arguments of the operation
+    @rtype: list
+    @returns: a list [args, change] of the arguments to run the operation with and the change, None for the
+    operations whose lists are recorded as they are read
+    runtime complexity: O(1), O(k) for an operation reading k values
+    """
+    def journalChange(self, name, args):
+        n = self.length()
+        listed = [k for k in self.JOURNAL_ITERABLES.get(name, ()) if k < len(args)]
+        if listed:
+            args = list(args)
+            for k in listed:
+                args[k] = args[k].tolist() if hasattr(args[k], 'tolist') else list(args[k])
+            args = tuple(args)
+        if name == 'append':
+            return [args, ('insert', n) + args]
+        if name == 'appendleft':
+            return [args, ('insert', 0) + args]
+        if name == 'pop':
+            return [args, ('delete', n - 1)]
+        if name == 'popleft':
+            return [args, ('delete', 0)]
+        if name == 'concat':
+            return [tuple(self.recordedFragments(args)), None]
+        if name == 'concatAll':  # which rejects a bad list before joining any: then nothing is recorded
+            lists = list(args[0])
+            if all(self.joinable(lst) for lst in lists):
+                return [(list(self.recordedFragments(lists)),), None]
+            return [(lists,), None]
+        if name == 'concatStream':
+            return [(self.recordedFragments(args[0]),), None]
+        return [args, (name,) + args]
+
+    """generates the given lists, recording each as a concat change of the journal when it is read, just before it
+    is joined. A list that the join rejects is not recorded, so the journal holds the lists joined before it
+    @type fragments: iterable
+    @param fragments: the lists to be concatenated after self
+    @rtype: generator
+    runtime complexity: O(k) for every list of k values read, O(1) if the journal has no file or subscriber
+    """
+    def recordedFragments(self, fragments):
+        journal = self.journal
+        for lst in fragments:
+            if journal.active() and self.joinable(lst):
+                change = ('concat', lst.listToArray())
+                journal.record(change, journal.encode(change))
+            yield lst
+
+    """returns whether a list can be concatenated to self
+    @type lst: AVLTreeList
+    @param lst: a list
+    @rtype: bool
+    @returns: True if lst is balanced by the policy of self and is not a snapshot
+    runtime complexity: O(1)
+    """
+    def joinable(self, lst):
+        return lst.balance == self.balance and not lst.frozen
+
+    """applies a change of a journal (see Journal) to the list, for replay and for the subscribers of changes
+    @type change: tuple
+    @param change: the change
+    @rtype: object
+    @returns: what the operation of the change returns
+    runtime complexity: the complexity of the operation
+    """
+    def applyChange(self, change):
+        name = change[0]
+        if name == 'build':
+            if not self.empty():
+                self.deleteRange(0, self.length())
+            return self.insertMany(0, change[1])
+        if name == 'concat':
+            return self.concat(self.newList(change[1]))
+        return getattr(self, name)(*change[1:])
+
+    """rebuilds a list from a journal file written by enableJournal. The runs of inserts of consecutive values and of
+    deletes of consecutive items are applied at once, see replayRun
+    @type path: str
+    @param path: the path of the journal file
+    @type lst: AVLTreeList
+    @param lst: the list to apply the changes to (optional, a new empty list of cls by default)
+    @rtype: AVLTreeList
+    @returns: the list
+    @raises ValueError: if the file is not a journal file
+    runtime complexity: O(m + k * logn) where m is the size of the file and k the number of changes
+    """
+    @classmethod
+    def replay(cls, path, lst=None):
+        lst = cls() if lst is None else lst
+        batch = []
+        for change in Journal.read(path):
+            if change[0] in ('insert', 'delete'):
+                batch.append(change)
+                continue
+            lst.replayRun(batch)
+            batch = []
+            lst.applyChange(change)
+        lst.replayRun(batch)
+        return lst
+
+    """applies a run of inserts and deletes read from a journal. Inserts that each follow the value inserted before,
+    or that each precede it, become a single insertMany, and deletes of the items that each followed or preceded the
+    item deleted before become a single deleteRange, which is how appends, typing and erasing look in a journal.
+    Runs shorter than REPLAY_RUN and the other changes are applied one at a time
+    @type batch: list
+    @param batch: the changes, in order
+    runtime complexity: O(r * logn + k) where k is the number of changes and r the number of runs they make
+    """
+    def replayRun(self, batch):
+        k = 0
+        while k < len(batch):
+            name, i = batch[k][0], batch[k][1]
+            m = k + 1
+            if name == 'insert':
+                values = [batch[k][2]]
+                while m < len(batch) and batch[m][0] == 'insert' and batch[m][1] == i + len(values):
+                    values.append(batch[m][2])
+                    m += 1
+                if m == k + 1:  # each new value is inserted before the previous one
+                    while m < len(batch) and batch[m][0] == 'insert' and batch[m][1] == i:
+                        values.append(batch[m][2])
+                        m += 1
+                    values.reverse()
+                if len(values) >= self.REPLAY_RUN:
+                    self.insertMany(i, values)
+                else:
+                    m = k + 1  # the run is too short, its first change is applied alone
+                    self.insert(i, batch[k][2])
+            else:
+                while m < len(batch) and batch[m][0] == 'delete' and batch[m][1] == i:
+                    m += 1
+                if m == k + 1:  # each deleted item preceded the previous one
+                    while m < len(batch) and batch[m][0] == 'delete' and batch[m][1] == i - (m - k):
+                        m += 1
+                    i -= m - k - 1
+                if m - k >= self.REPLAY_RUN:
+                    self.deleteRange(i, i + m - k)
+                else:
+                    m = k + 1
+                    self.delete(batch[k][1])
+            k = m
+
+    """returns the changes of the list as an asynchronous iterator, starting from the first iteration:
+    async for change in lst.changes(): replica.applyChange(change). The changes are those of enableJournal,
+    delivered in order through a queue, and may come from another thread. While the list has subscribers it is
+    journaled, without a file unless enableJournal gives it one. A subscription ends when its iterator is closed,
+    for instance by contextlib.aclosing
+    @rtype: async generator
+    runtime complexity: O(1) for every change
+    """
+    async def changes(self):
+        queue = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), queue)
+        self.startJournal().subscribers.append(subscriber)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            if self.journal is not None and subscriber in self.journal.subscribers:
+                self.journal.subscribers.remove(subscriber)
+            self.releaseJournal()
+
+    """returns a cursor placed at the i'th item of the list
+    @type i: int
+    @pre: 0 <= i <= self.length()
+    @param i: the index of the cursor, self.length() places it after the last item
+    @rtype: Cursor
+    @returns: a new cursor
+    runtime complexity: O(logn)
+    """
+    def cursor(self, i=0):
+        return Cursor(self, i)
+
+    """returns the size of the list
+    @rtype: int
+    @returns: the size of the list
+    runtime complexity: O(1)
+    """
+    def __len__(self):
+        return self.root.getSize()
+
+    """converts a (possibly negative) index to a position in the list
+    @type i: int
+    @param i: an index, counted from the end of the list when negative
+    @rtype: int
+    @returns: the matching position in the list
+    @raises IndexError: if the index is out of range
+    runtime complexity: O(1)
+    """
+    def normalizeIndex(self, i):
+        if i < 0:
+            i += self.root.getSize()
+        if not 0 <= i < self.root.getSize():
+            raise IndexError("list index out of range")
+        return i
+
+    """returns lst[key], with the semantics of a python list
+    @type key: int or slice
+    @param key: an index or a slice
+    @rtype: str or AVLTreeList
+    @returns: the value at index key, or a new list holding the values of the slice
+    runtime complexity: O(logn) for an index, O(k + logn) for a slice of k items
+    """
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.root.getSize())
+            if step == 1:
+                return self.slice(start, max(start, stop))
+            return self.newList(self.retrieve(k) for k in range(start, stop, step))
+        return self.retrieve(self.normalizeIndex(key))
+
+    """deletes lst[key], with the semantics of a python list
+    @type key: int or slice
+    @param key: an index or a slice
+    runtime complexity: O(logn) for an index or a contiguous slice, O(k * logn) for an extended slice of k items
+    """
+    def __delitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.root.getSize())
+            if step == 1:
+                self.deleteRange(start, max(start, stop))
+                return
+            indices = range(start, stop, step)
+            for k in (reversed(indices) if step > 0 else indices):  # deletes from the end so indices don't shift
+                self.delete(k)
+            return
+        self.delete(self.normalizeIndex(key))
+
+
+"""
+A class implementing the ADT list using an AVL tree of chunks: every node holds up to chunkSize consecutive items in a
+python list (or an array of the given typecode). Lookups follow one pointer per level of a tree that is about
+log(chunkSize) levels shorter, and the items of a chunk sit next to each other in memory. Chunks are split in two
+when they overflow, and merged with or refilled from a neighbour when they shrink below a quarter of chunkSize.
+The list has the same public API as AVLTreeList, without cursors, value indices and augmentations.
+"""
+
+
+class ChunkedAVLTreeList(AVLTreeList):
+
+    """
+    Constructor.
+    @type iterable: iterable
+    @param iterable: values to fill the list with, in order (optional)
+    @type chunkSize: int
+    @pre: chunkSize >= 2
+    @param chunkSize: the maximal number of items in a chunk
+    @type typecode: str
+    @param typecode: the typecode of the array module to keep the chunks in arrays (optional, python lists otherwise)
+    runtime complexity: O(1), O(n) when given an iterable of n values
+    """
+    def __init__(self, iterable=None, chunkSize=64, typecode=None):
+        AVLTreeList.__init__(self)
+        self.nodeClass = ChunkNode
+        self.chunkSize = chunkSize
+        self.typecode = typecode
+        self.byEquality = typecode is not None  # an array boxes its items anew on every read, so identity is useless
+        if iterable is not None:
+            self.build(self.chunks(iterable))
+
+    """constructs a list with the same configuration as self, for the lists that operations on self return
+    @type iterable: iterable
+    @param iterable: values to fill the list with, in order (optional)
+    @rtype: ChunkedAVLTreeList
+    @returns: a new list
+    runtime complexity: O(1), O(n) when given an iterable of n values
+    """
+    def newList(self, iterable=None):
+        return self.shareEpoch(ChunkedAVLTreeList(iterable, self.chunkSize, self.typecode))
+
+    """returns a new chunk
+    @type values: iterable
+    @param values: the items of the chunk
+    @rtype: list or array
+    @returns: a python list, or an array if the list has a typecode
+    runtime complexity: O(k) where k is the number of items
+    """
+    def newChunk(self, values=()):
+        if self.typecode is None:
+            return list(values)
+        return array(self.typecode, values)
+
+    """groups the values of an iterable into full chunks
+    @type iterable: iterable
+    @param iterable: the values
+    @rtype: generator
+    runtime complexity: O(n) where n is the number of values
+    """
+    def chunks(self, iterable):
+        chunk = self.newChunk()
+        for val in iterable:
+            chunk.append(val)
+            if len(chunk) == self.chunkSize:
+                yield chunk
+                chunk = self.newChunk()
+        if chunk:
+            yield chunk
+
+    """finds the chunk holding the i'th item in the list
+    @type i: int
+    @pre: 0 <= i < self.length()
+    @param i: index in the list
+    @rtype: list
+    @returns: a list [node, offset] where node holds the i'th item at index offset of its chunk
+    runtime complexity: O(logn)
+    """
+    def locate(self, i):
+        node = self.root
+        while True:
+            leftSize = node.left.size
+            if i < leftSize:
+                node = node.left
+            else:
+                i -= leftSize
+                if i < len(node.value):
+                    if self.statistics is not None:  # the chunks are found here instead of by retrieveNode
+                        self.countDescent(node)
+                    return [node, i]
+                i -= len(node.value)
+                node = node.right
+
+    """retrieves the value of the i'th item in the list
+    @type i: int
+    @pre: 0 <= i < self.length()
+    @param i: index in the list
+    @rtype: str
+    @returns: the value of the i'th item in the list
+    runtime complexity: O(logn)
+    """
+    def retrieve(self, i):
+        node, offset = self.locate(i)
+        return node.value[offset]
+
+    """retrieves the values of many items at once, see AVLTreeList.locateMany
+    @type indices: iterable
+    @param indices: indices of the list, counted from the end when negative. A numpy array of integers is accepted
+    @type asArray: bool
+    @param asArray: whether to return the values as a numpy array instead of a list (requires numpy)
+    @rtype: list
+    @returns: the values of the items, in the order of indices
+    @raises IndexError: if an index is out of range
+    runtime complexity: O(k * logk + k * log(n / k)) where k is the number of indices
+    """
+    def retrieveMany(self, indices, asArray=False):
+        order, positions = self.sortIndices(indices)
+        values = [None] * len(order)
+        for k, (node, offset) in zip(order, self.locateMany(positions)):
+            values[k] = node.value[offset]
+        if asArray:
+            import numpy
+            return numpy.array(values)
+        return values
+
+    """replaces the values of many items at once, see AVLTreeList.locateMany. When an index repeats, its last value
+    is kept
+    @type indices: iterable
+    @param indices: indices of the list, counted from the end when negative. A numpy array of integers is accepted
+    @type values: iterable
+    @param values: the new values, one for each index
+    @raises IndexError: if an index is out of range, the list is then left unchanged
+    @raises ValueError: if there are not as many values as indices, the list is then left unchanged
+    runtime complexity: O(k * logk + k * log(n / k)) where k is the number of indices
+    """
+    def setMany(self, indices, values):
+        values = values.tolist() if hasattr(values, 'tolist') else list(values)
+        order, positions = self.sortIndices(indices)
+        if len(values) != len(order):
+            raise ValueError("setMany got %d values for %d indices" % (len(values), len(order)))
+        self.prepareWrite()
+        for k, (node, offset) in zip(order, self.locateMany(positions, True)):
+            node.value[offset] = values[k]
+
+    """inserts val at position i in the list. A chunk that overflows is split in two
+    @type i: int
+    @pre: 0 <= i <= self.length()
+    @param i: The intended index in the list to which we insert val
+    @type val: str
+    @param val: the value we insert
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(chunkSize + logn)
+    """
+    def insert(self, i, val):
+        self.prepareWrite()
+        if self.root.isVirtual():
+            self.root = ChunkNode(self.newChunk([val]))
+            self.root.makeReal()
+            return 0
+        if i == self.root.size:
+            node = self.getMax(self.root)
+            offset = len(node.value)
+        else:
+            node, offset = self.locate(i)
+        node = self.own(node)
+        chunk = node.value
+        chunk.insert(offset, val)
+        if len(chunk) <= self.chunkSize:
+            self.addToSizes(node, 1)
+            return 0
+        tail = chunk[len(chunk) // 2:]
+        del chunk[len(chunk) // 2:]
+        return self.insertAfterNode(node, tail)  # node is an ancestor of the new node, so its size gets fixed too
+
+    """deletes the i'th item in the list. A chunk that shrinks below a quarter of chunkSize is merged with a
+    neighbour, or takes items from it, until it is half full again, see fixChunks
+    @type i: int
+    @pre: 0 <= i < self.length()
+    @param i: The intended index in the list to be deleted
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(chunkSize + logn), O(chunkSize * logn) when the chunk is refilled
+    """
+    def delete(self, i):
+        self.prepareWrite()
+        node, offset = self.locate(i)
+        node = self.own(node)
+        chunk = node.value
+        del chunk[offset]
+        if not chunk:
+            return self.deleteNode(node)
+        self.addToSizes(node, -1)
+        if len(chunk) >= self.chunkSize // 4:
+            return 0
+        return self.fixChunks(i - offset)
+
+    """returns the value of the first item in the list
+    @rtype: str
+    @returns: the value of the first item, None if the list is empty
+    runtime complexity: O(1) if the first chunk is cached, O(logn) otherwise
+    """
+    def first(self):
+        node = self.firstNode()
+        return None if node is None else node.value[0]
+
+    """returns the value of the last item in the list
+    @rtype: str
+    @returns: the value of the last item, None if the list is empty
+    runtime complexity: O(1) if the last chunk is cached, O(logn) otherwise
+    """
+    def last(self):
+        node = self.lastNode()
+        return None if node is None else node.value[-1]
+
+    """appends val after the last item of the list
+    @type val: str
+    @param val: the value we insert
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(chunkSize + logn)
+    """
+    def append(self, val):
+        return self.insert(self.root.size, val)
+
+    """inserts val before the first item of the list
+    @type val: str
+    @param val: the value we insert
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(chunkSize + logn)
+    """
+    def appendleft(self, val):
+        return self.insert(0, val)
+
+    """removes the last item of the list
+    @rtype: str
+    @returns: the value of the removed item
+    @raises IndexError: if the list is empty
+    runtime complexity: O(chunkSize + logn)
+    """
+    def pop(self):
+        if self.root.isVirtual():
+            raise IndexError("pop from an empty list")
+        val = self.last()
+        self.delete(self.root.size - 1)
+        return val
+
+    """removes the first item of the list
+    @rtype: str
+    @returns: the value of the removed item
+    @raises IndexError: if the list is empty
+    runtime complexity: O(chunkSize + logn)
+    """
+    def popleft(self):
+        if self.root.isVirtual():
+            raise IndexError("pop from an empty list")
+        val = self.first()
+        self.delete(0)
+        return val
+
+    """splits the list before the i'th item, the chunk holding it is cut in two. Each piece under chunkSize // 2 items
+    is then merged with its neighbour, see fixChunks. self is left empty
+    @type i: int
+    @pre: 0 <= i <= self.length()
+    @param i: the index of the first item of the right list
+    @rtype: list
+    @returns: a list [left, right, counter] where left holds the items before index i, right holds the rest and
+    counter is the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(chunkSize + logn)
+    """
+    def splitBefore(self, i):
+        left = self.newList()
+        right = self.newList()
+        if i == self.root.size:
+            left.root = self.root
+            self.root = VIRTUAL
+            return [left, right, 0]
+        node, offset = self.locate(i)
+        node = self.own(node)
+        leftRoot, rightRoot, counter = self.splitAtNode(node)
+        left.root = leftRoot
+        if offset > 0:
+            head = ChunkNode(node.value[:offset])
+            head.makeReal()
+            del node.value[:offset]
+            counter += left.join(leftRoot, head, VIRTUAL)
+        counter += right.join(VIRTUAL, node, rightRoot)
+        if left.root.isRealNode():
+            counter += left.fixChunks(left.root.size - 1)
+        return [left, right, counter + right.fixChunks(0)]
+
+    """merges the chunk holding the i'th item with a neighbour while it holds fewer than chunkSize // 2 items, the
+    smaller neighbour first. Two chunks that do not fit in one are evened out instead. Structural edits call it at
+    the boundaries they make, so the chunks they cut stay at least half full
+    @type i: int
+    @pre: 0 <= i < self.length()
+    @param i: index in the list
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(chunkSize * logn)
+    """
+    def fixChunks(self, i):
+        counter = 0
+        while True:
+            node, offset = self.locate(i)
+            start = i - offset
+            if len(node.value) >= self.chunkSize // 2:
+                return counter
+            neighbours = []  # pairs [length, start] of the neighbouring chunks
+            if start > 0:
+                previous, previousOffset = self.locate(start - 1)
+                neighbours.append([len(previous.value), start - 1 - previousOffset])
+            if start + len(node.value) < self.root.size:
+                neighbours.append([len(self.locate(start + len(node.value))[0].value), start + len(node.value)])
+            if not neighbours:
+                return counter
+            other = min(neighbours)[1]
+            (first, _), (second, _) = self.locateMany(sorted([start, other]), True)
+            total = len(first.value) + len(second.value)
+            if total <= self.chunkSize:
+                chunk = first.value
+                values = second.value
+                counter += self.deleteNode(second)  # second is the successor of first, which keeps its place
+                chunk.extend(values)
+                self.addToSizes(first, len(values))
+                continue
+            moved = total // 2 - len(first.value)  # items moved from the head of second to the tail of first
+            if moved > 0:
+                first.value.extend(second.value[:moved])
+                del second.value[:moved]
+            else:
+                second.value[:0] = first.value[len(first.value) + moved:]
+                del first.value[len(first.value) + moved:]
+            self.addToSizes(first, moved)
+            self.addToSizes(second, -moved)
+            return counter
+
+    """concatenates lst to self, then merges the chunks on both sides of the boundary if one is undersized, see
+    fixChunks
+    @type lst: ChunkedAVLTreeList
+    @param lst: a list to be concatenated after self
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(chunkSize * logn)
+    """
+    def joinList(self, lst):
+        i = self.root.size
+        counter = AVLTreeList.joinList(self, lst)
+        if 0 < i < self.root.size:
+            counter += self.fixChunks(i - 1) + self.fixChunks(i)
+        return counter
+
+    """concatenates lists to self in one pass, see AVLTreeList.joinFragments, then merges the undersized chunks on
+    both sides of every boundary, see fixChunks
+    @type fragments: iterable
+    @param fragments: the lists to be concatenated after self, read once
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    @raises ValueError: if a list is balanced by another policy than self
+    runtime complexity: O(k * chunkSize * logn) where k is the number of lists
+    """
+    def joinFragments(self, fragments):
+        boundaries = []
+        total = self.root.size
+
+        def measured():
+            nonlocal total
+            for lst in fragments:
+                boundaries.append(total)
+                total += lst.root.size
+                yield lst
+        counter = 0
+        try:
+            counter = AVLTreeList.joinFragments(self, measured())
+        finally:  # the lists joined before a rejected one are fixed too
+            for i in boundaries:
+                if 0 < i < self.root.size:
+                    counter += self.fixChunks(i - 1) + self.fixChunks(i)
+        return counter
+
+    """splits the list at the i'th index
+    @type i: int
+    @pre: 0 <= i < self.length()
+    @param i: The intended index in the list according to which we split the tree
+    @rtype: list
+    @returns: a list [left, val, right], where left is a ChunkedAVLTreeList representing the list until index i-1,
+    right is a ChunkedAVLTreeList representing the list from index i+1, and val is the value at the i'th index.
+    runtime complexity: O(chunkSize + logn)
+    """
+    def split(self, i):
+        self.prepareWrite()
+        left, right = self.splitBefore(i)[:2]
+        val = right.retrieve(0)
+        right.delete(0)
+        return [left, val, right]
+
+    """inserts the values of the given iterable at position i in the list, so the first of them ends up at index i
+    @type i: int
+    @pre: 0 <= i <= self.length()
+    @param i: The intended index in the list to which we insert the values
+    @type iterable: iterable
+    @param iterable: the values we insert, in order
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(k + chunkSize + logn) where k is the number of values
+    """
+    def insertMany(self, i, iterable):
+        self.prepareWrite()
+        block = self.newList(iterable)
+        if block.empty():
+            return 0
+        left, right, counter = self.splitBefore(i)
+        counter += left.joinList(block)
+        counter += left.joinList(right)
+        self.root = left.root
+        return counter
+
+    """removes the items from index i up to index j (excluded) from the tree, the rest of the items stay in self
+    @type i: int
+    @type j: int
+    @pre: 0 <= i < j <= self.length()
+    @param i: the index of the first item to be removed
+    @param j: the index following the last item to be removed
+    @rtype: list
+    @returns: a list [middle, counter] where middle is the root of the tree holding the removed items and counter is
+    the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(chunkSize + logn)
+    """
+    def cutRange(self, i, j):
+        self.prepareWrite()
+        left, rest, counter = self.splitBefore(i)
+        middle, right, splitCounter = rest.splitBefore(j - i)
+        counter += splitCounter + left.joinList(right)
+        self.root = left.root
+        return [middle.root, counter]
+
+    """generates the values of the items from index i up to index j (excluded), in order
+    @type i: int
+    @type j: int
+    @pre: 0 <= i <= j <= self.length()
+    @param i: the index of the first item
+    @param j: the index following the last item
+    @rtype: generator
+    runtime complexity: O(k + logn) where k = j - i
+    """
+    def iterRange(self, i, j):
+        count = j - i
+        if count <= 0:
+            return
+        stack = []
+        node = self.root
+        while True:  # descends to the chunk of the i'th item, stacking the ancestors that come after it
+            leftSize = node.left.size
+            if i < leftSize:
+                stack.append(node)
+                node = node.left
+            else:
+                i -= leftSize
+                if i < len(node.value):
+                    break
+                i -= len(node.value)
+                node = node.right
+        offset = i
+        while True:
+            chunk = node.value
+            if offset == 0 and count >= len(chunk):
+                yield from chunk
+                count -= len(chunk)
+            else:
+                taken = min(count, len(chunk) - offset)
+                yield from chunk[offset:offset + taken]
+                count -= taken
+            if count == 0:
+                return
+            node = node.right
+            while node.height != -1:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            offset = 0
+
+    """generates the values of the list, from the last to the first
+    @rtype: generator
+    runtime complexity: O(n)
+    """
+    def __reversed__(self):
+        stack = []
+        node = self.root
+        while True:
+            while node.height != -1:
+                stack.append(node)
+                node = node.right
+            if not stack:
+                return
+            node = stack.pop()
+            yield from reversed(node.value)
+            node = node.left
+
+    """applies a batch of operations one after the other, see AVLTreeList.applyInOrder: the nodes of a chunked list
+    hold many items, so the batch is not planned by positions, and a run of edits at one place of the list already
+    stays within one chunk
+    @type ops: iterable
+    @param ops: the operations, in order
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    @raises IndexError: if an operation's index is out of range
+    @raises ValueError: if an operation is unknown
+    runtime complexity: O(k * (chunkSize + logn)) where k is the number of operations
+    """
+    def applyBatch(self, ops):
+        return self.applyInOrder(ops)
+
+    """chunked lists do not support value indices, which map every value to a node of its own
+    @raises TypeError: always
+    """
+    def enableIndex(self, byEquality=False):
+        raise TypeError("ChunkedAVLTreeList does not support value indices")
+
+    """chunked lists do not support cursors, which step through the list one node per position
+    @raises TypeError: always
+    """
+    def cursor(self, i=0):
+        raise TypeError("ChunkedAVLTreeList does not support cursors")
+
+
+"""
+A class implementing the ADT list using an AVL tree whose nodes carry lazy tags (see TaggedNode), so that a range of
+items can be reversed or have a function applied to all its values in O(logn). The tags are pushed down as walks
+pass through the nodes, which every operation of AVLTreeList does on its way down from the root. Cursors, value
+indices and augmentations, which reach nodes from below or keep what a pending tag would change, are not supported.
+"""
+
+
+class TaggedAVLTreeList(AVLTreeList):
+    JOURNAL_OPERATIONS = AVLTreeList.JOURNAL_OPERATIONS + ('tagRange', 'reverseRange', 'mapRange')
+
+    """
+    Constructor.
+    @type iterable: iterable
+    @param iterable: values to fill the list with, in order (optional)
+    runtime complexity: O(1), O(n) when given an iterable of n values
+    """
+    def __init__(self, iterable=None):
+        AVLTreeList.__init__(self)
+        self.nodeClass = TaggedNode
+        if iterable is not None:
+            self.build(iterable)
+
+    """constructs a list with the same configuration as self, for the lists that operations on self return
+    @type iterable: iterable
+    @param iterable: values to fill the list with, in order (optional)
+    @rtype: TaggedAVLTreeList
+    @returns: a new list
+    runtime complexity: O(1), O(n) when given an iterable of n values
+    """
+    def newList(self, iterable=None):
+        return self.shareEpoch(TaggedAVLTreeList(iterable))
+
+    """returns whether reading the list may change it, which it always may: every walk pushes tags down
+    @rtype: bool
+    @returns: True
+    runtime complexity: O(1)
+    """
+    def readsWrite(self):
+        return True
+
+    """tags the items from index i up to index j (excluded): the range is cut out of the tree, its root is tagged
+    and it is joined back in place
+    @type i: int
+    @type j: int
+    @pre: 0 <= i <= j <= self.length()
+    @param i: the index of the first item
+    @param j: the index following the last item
+    @type flipped: bool
+    @param flipped: whether to reverse the range
+    @type transform: function
+    @param transform: a function to apply to the values of the range (may be None)
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def tagRange(self, i, j, flipped, transform):
+        if i >= j:
+            return 0
+        suffix = self.newList()
+        middle = self.newList()
+        suffix.root, counter = self.cutRange(j, self.root.getSize())
+        middle.root, cutCounter = self.cutRange(i, j)
+        middle.own(middle.root).tag(flipped, transform)
+        counter += cutCounter + self.joinList(middle)
+        return counter + self.joinList(suffix)
+
+    """reverses the order of the items from index i up to index j (excluded)
+    @type i: int
+    @type j: int
+    @pre: 0 <= i <= j <= self.length()
+    @param i: the index of the first item
+    @param j: the index following the last item
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def reverseRange(self, i, j):
+        return self.tagRange(i, j, True, None)
+
+    """replaces every value val of the items from index i up to index j (excluded) by f(val). The values below the
+    root of the range are only transformed when a walk reaches them
+    @type i: int
+    @type j: int
+    @pre: 0 <= i <= j <= self.length()
+    @param i: the index of the first item
+    @param j: the index following the last item
+    @type f: function
+    @param f: a function of a value, an AffineMap for affine updates whose compositions stay O(1) to apply
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def mapRange(self, i, j, f):
+        return self.tagRange(i, j, False, f)
+
+    """returns the index of the given node, after pushing the tags of its ancestors from the root down
+    @type node: AVLNode
+    @pre: node is a real node of self
+    @param node: The given node
+    @rtype: int
+    @returns: the index of node in the list
+    @raises TypeError: if self is a snapshot
+    runtime complexity: O(logn)
+    """
+    def rank(self, node):
+        if self.frozen:
+            raise TypeError("a snapshot cannot rank its nodes")
+        path = []
+        ancestor = node.parent
+        while ancestor is not None:
+            path.append(ancestor)
+            ancestor = ancestor.parent
+        for ancestor in reversed(path):
+            ancestor.pushDown()
+        return AVLTreeList.rank(self, node)
+
+    """tagged lists do not support value indices, which would be stale while a tag is pending above a node
+    @raises TypeError: always
+    """
+    def enableIndex(self, byEquality=False):
+        raise TypeError("TaggedAVLTreeList does not support value indices")
+
+    """tagged lists do not support cursors, which read node values without pushing the tags above them down
+    @raises TypeError: always
+    """
+    def cursor(self, i=0):
+        raise TypeError("TaggedAVLTreeList does not support cursors")
+
+
+"""
+A class representing a position in an AVLTreeList, for sequential access near a previous position. The cursor holds
+the node of its item, so moving it by d items only climbs to the lowest common ancestor of the two items and costs
+O(logd) instead of a descent from the root. Nodes are never swapped in value by the tree, so a cursor stays on its
+item across rotations and across insertions and deletions of other items. A cursor whose item was deleted through
+the list, or whose list was split or concatenated to another list, must not be used. After a snapshot, the writes
+of the list replace the nodes they reach by copies (see AVLTreeList.own): a cursor whose node was replaced by a
+write that did not go through the cursor raises RuntimeError until it is placed again with moveTo. A cursor of a
+snapshot, which has no parent pointers to climb, keeps its index instead and moves by descending from the root.
+"""
+
+
+class Cursor(object):
+
+    """
+    Constructor.
+    @type lst: AVLTreeList
+    @param lst: the list the cursor moves in
+    @type i: int
+    @pre: 0 <= i <= lst.length()
+    @param i: the index of the cursor, lst.length() places it after the last item
+    runtime complexity: O(logn)
+    """
+    def __init__(self, lst, i=0):
+        self.lst = lst
+        self.node = None  # None when the cursor is after the last item
+        self.index = i  # only kept up to date on a snapshot
+        self.generation = lst.generation
+        self.moveTo(i)
+
+    """checks that the node of the cursor still belongs to its list. A node replaced by a copy still points to a
+    parent, which may be the copy of its former parent, so the check climbs to the root and makes sure that every
+    parent on the way still links the node it was reached from
+    @raises RuntimeError: if the node of the cursor was replaced by a copy since the cursor was placed
+    runtime complexity: O(1), O(logn) if nodes of the list were copied since the last check
+    """
+    def checkValid(self):
+        if self.generation != self.lst.generation:
+            node = self.node
+            while node is not None and node.parent is not None:
+                parent = node.parent
+                if parent.left is not node and parent.right is not node:
+                    break
+                node = parent
+            if node is not None and node is not self.lst.root:
+                raise RuntimeError("the item of the cursor was copied after a snapshot, place it again with moveTo")
+            self.generation = self.lst.generation
+
+    """returns whether the cursor is after the last item of the list
+    @rtype: bool
+    @returns: True if the cursor is after the last item, False otherwise
+    runtime complexity: O(1)
+    """
+    def atEnd(self):
+        return self.node is None
+
+    """returns the index of the cursor
+    @rtype: int
+    @returns: the index of the item under the cursor, the length of the list if the cursor is at the end
+    runtime complexity: O(logn)
+    """
+    def getIndex(self):
+        self.checkValid()
+        if self.lst.frozen:
+            return self.index
+        if self.node is None:
+            return self.lst.length()
+        return self.lst.rank(self.node)
+
+    """returns the value under the cursor
+    @rtype: str
+    @returns: the value under the cursor, None if the cursor is at the end
+    runtime complexity: O(1)
+    """
+    def getValue(self):
+        self.checkValid()
+        if self.node is None:
+            return None
+        return self.node.getValue()
+
+    """replaces the value under the cursor
+    @type val: str
+    @param val: the new value
+    @pre: self.atEnd() == False
+    runtime complexity: O(1)
+    """
+    def setValue(self, val):
+        self.lst.prepareWrite()
+        self.checkValid()
+        journal = self.lst.journal
+        if journal is not None and not journal.depth:  # recorded as the write of the list it makes
+            return journal.run(('setMany', [self.getIndex()], [val]), lambda: self.setValue(val))
+        self.node = self.lst.own(self.node)
+        self.lst.setNodeValue(self.node, val)
+        self.generation = self.lst.generation  # self.node is of the current epoch, so no write copies it
+
+    """moves the cursor to the i'th item of the list, starting from the root
+    @type i: int
+    @pre: 0 <= i <= self.lst.length()
+    @param i: the new index of the cursor, lst.length() places it after the last item
+    runtime complexity: O(logn)
+    """
+    def moveTo(self, i):
+        self.generation = self.lst.generation
+        self.index = i
+        if i == self.lst.length():
+            self.node = None
+        else:
+            self.node = self.lst.retrieveNode(i)
+
+    """moves the cursor k items forward (backwards if k is negative). The cursor climbs until the target is in the
+    subtree of the current node and then descends to it
+    @type k: int
+    @pre: 0 <= self.getIndex() + k <= self.lst.length()
+    @param k: the number of items to move by
+    @raises IndexError: if the move goes out of the list
+    runtime complexity: O(logd) where d = |k|, O(logn) on a snapshot
+    """
+    def moveBy(self, k):
+        self.checkValid()
+        if self.lst.frozen:
+            if not 0 <= self.index + k <= self.lst.length():
+                raise IndexError("cursor moved out of range")
+            self.moveTo(self.index + k)
+            return
+        if self.node is None:
+            if not 0 <= self.lst.length() + k <= self.lst.length():
+                raise IndexError("cursor moved out of range")
+            self.moveTo(self.lst.length() + k)
+            return
+        current = self.node
+        target = current.left.size + k  # the target's index in current's subtree
+        while target < 0 or target >= current.size:
+            parent = current.parent
+            if parent is None:
+                if target == current.size:
+                    self.node = None
+                    return
+                raise IndexError("cursor moved out of range")
+            if parent.right is current:
+                target += parent.left.size + 1
+            current = parent
+        while True:
+            leftSize = current.left.size
+            if target < leftSize:
+                current = current.left
+            elif target > leftSize:
+                target -= leftSize + 1
+                current = current.right
+            else:
+                break
+        self.node = current
+
+    """inserts val before the cursor, which stays on its item
+    @type val: str
+    @param val: the value we insert
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def insertBefore(self, val):
+        self.lst.prepareWrite()
+        self.checkValid()
+        journal = self.lst.journal
+        if journal is not None and not journal.depth:  # recorded as the write of the list it makes
+            return journal.run(('insert', self.getIndex(), val), lambda: self.insertBefore(val))
+        if self.node is None:
+            counter = self.lst.insert(self.lst.length(), val)
+        else:
+            self.node = self.lst.own(self.node)
+            counter = self.lst.insertBeforeNode(self.node, val)
+        self.generation = self.lst.generation
+        return counter
+
+    """inserts val after the cursor, which stays on its item
+    @type val: str
+    @param val: the value we insert
+    @pre: self.atEnd() == False
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def insertAfter(self, val):
+        self.lst.prepareWrite()
+        self.checkValid()
+        journal = self.lst.journal
+        if journal is not None and not journal.depth:  # recorded as the write of the list it makes
+            return journal.run(('insert', self.getIndex() + 1, val), lambda: self.insertAfter(val))
+        self.node = self.lst.own(self.node)
+        counter = self.lst.insertAfterNode(self.node, val)
+        self.generation = self.lst.generation
+        return counter
+
+    """deletes the item under the cursor, which moves to the following item
+    @pre: self.atEnd() == False
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def delete(self):
+        self.lst.prepareWrite()
+        self.checkValid()
+        journal = self.lst.journal
+        if journal is not None and not journal.depth:  # recorded as the write of the list it makes
+            return journal.run(('delete', self.getIndex()), self.delete)
+        toDelete = self.lst.own(self.node)
+        successor = self.lst.getSuccessor(toDelete)
+        self.node = None if successor is None else self.lst.own(successor)
+        counter = self.lst.deleteNode(toDelete)
+        self.generation = self.lst.generation
+        return counter
+
+
+"""
+A class implementing the ADT list using an AVL tree kept in a few preallocated columns instead of node objects. A node
+is an integer handle into the columns value, left, right, parent, height and size. Handle 0 is the virtual leaf:
+its height is -1 and its size 0. The links, heights and sizes are arrays of machine integers, which the garbage
+collector never scans. So a list of millions of items adds no objects for the collector to walk. Freed handles
+are reused before the columns grow. The values are kept in a python list, or in an array of the given typecode for
+numeric lists. The rotations, FixTree, join and splitAtNode are the ones of AVLTreeList, which go through the node
+accessors of the list, bound here to the columns (see bindColumns).
+Lists made by split share their columns, so concatenating them back costs O(logn). Concatenating a list with
+other columns copies it. Slices and the other new lists that reads return get columns of their own. With an
+augmentation, the aggregates are kept in one more column, for rangeQuery.
+insertMany, deleteRange, applyBatch, retrieveMany, setMany, the operations at the ends, slicing, iterRange, the
+hash index, the stats and the journal work as in AVLTreeList, and the methods of AVLTreeList that only go through
+other methods of the list are shared with it. Cursors and snapshots, which would need node objects, raise TypeError.
+"""
+
+
+class ArrayAVLTreeList(object):
+    STATS_OPERATIONS = ('insert', 'delete', 'retrieve', 'split', 'concat', 'search', 'first', 'last', 'listToArray',
+                        'insertMany', 'deleteRange', 'applyBatch', 'append', 'appendleft', 'pop',
+                        'popleft')  # the operations timed by enableStats
+    STATS_METHODS = STATS_OPERATIONS + ('retrieveNode', 'rotateLeft', 'rotateRight', 'newNode', 'appendNode')
+    JOURNAL_OPERATIONS = ('insert', 'delete', 'split', 'concat', 'append', 'appendleft', 'pop', 'popleft',
+                          'insertMany', 'deleteRange', 'applyBatch', 'setMany')  # see AVLTreeList.enableJournal
+    JOURNAL_ITERABLES = AVLTreeList.JOURNAL_ITERABLES
+    REPLAY_RUN = AVLTreeList.REPLAY_RUN
+    BATCH_PLACES = AVLTreeList.BATCH_PLACES
+    COLUMNS = ('typecode', 'augmentation', 'values', 'agg', 'left', 'right', 'parent', 'height', 'size',
+               'freeHandles')  # shared by the lists made from one another, see fragmentList
+    balance = "avl"  # an array list is always balanced as an AVL tree
+    frozen = False  # and never a snapshot
+    generation = 0  # and has no cursors to invalidate, see AVLTreeList.splitAtNode
+    LEAF = NO_PARENT = 0  # the virtual leaf and the parent of a root are both handle 0
+
+    """
+    Constructor.
+    @type iterable: iterable
+    @param iterable: values to fill the list with, in order (optional)
+    @type typecode: str
+    @param typecode: the typecode of the array module to keep the values in an array (optional, a python list
+    otherwise)
+    @type augmentation: Augmentation
+    @param augmentation: an aggregate to maintain over every subtree, for rangeQuery (optional)
+    runtime complexity: O(1), O(n) when given an iterable of n values
+    """
+    def __init__(self, iterable=None, typecode=None, augmentation=None):
+        self.typecode = typecode
+        self.augmentation = augmentation
+        self.values = [None] if typecode is None else array(typecode, [0])
+        self.agg = None if augmentation is None else [augmentation.identity]  # the aggregates of the subtrees
+        self.left = array('q', [0])
+        self.right = array('q', [0])
+        self.parent = array('q', [0])
+        self.height = array('q', [-1])
+        self.size = array('q', [0])
+        self.freeHandles = array('q')  # handles of deleted nodes, reused before the columns grow
+        self.root = 0
+        self.valueIndex = None  # maps the values (or their ids) to the set of handles holding them, see enableIndex
+        self.byEquality = typecode is not None  # the numbers of an array have no identity, they are matched with ==
+        self.statistics = None  # the counters of enableStats, None while the stats are off
+        self.journal = None  # the Journal of enableJournal and changes, None while the list is not journaled
+        self.bindColumns()
+        if iterable is not None:
+            self.build(iterable)
+
+    """constructs a list with the same configuration as self and columns of its own, for the lists that operations
+    on self return, so a list that is dropped takes its nodes with it
+    @type iterable: iterable
+    @param iterable: values to fill the list with, in order (optional)
+    @rtype: ArrayAVLTreeList
+    @returns: a new list
+    runtime complexity: O(1), O(n) when given an iterable of n values
+    """
+    def newList(self, iterable=None):
+        return ArrayAVLTreeList(iterable, self.typecode, self.augmentation)
+
+    """constructs an empty list sharing the columns of self, without its hash index, stats or journal, for the trees
+    that split and join build out of the nodes of self, so the nodes move between them by handle
+    @rtype: ArrayAVLTreeList
+    @returns: a new list
+    runtime complexity: O(1)
+    """
+    def fragmentList(self):
+        lst = ArrayAVLTreeList.__new__(ArrayAVLTreeList)
+        for name in self.COLUMNS:
+            setattr(lst, name, getattr(self, name))
+        lst.root = 0
+        lst.valueIndex = lst.statistics = lst.journal = None
+        lst.byEquality = self.typecode is not None
+        lst.bindColumns()
+        return lst
+
+    """binds the node accessors of AVLTreeList (see AVLTreeList.leftOf) to the columns of self, so the rotations,
+    FixTree, join and splitAtNode of AVLTreeList run over handles
+    runtime complexity: O(1)
+    """
+    def bindColumns(self):
+        self.leftOf, self.setLeftOf = self.left.__getitem__, self.left.__setitem__
+        self.rightOf, self.setRightOf = self.right.__getitem__, self.right.__setitem__
+        self.parentOf, self.setParentOf = self.parent.__getitem__, self.parent.__setitem__
+        self.heightOf, self.setHeightOf = self.height.__getitem__, self.height.__setitem__
+
+    """returns whether reading the list may change it, which only the stats do: the reads share no column with
+    another list, since the lists they return have columns of their own (see newList)
+    @rtype: bool
+    @returns: True if the stats are on, False otherwise
+    runtime complexity: O(1)
+    """
+    def readsWrite(self):
+        return self.statistics is not None
+
+    """returns whether the list is empty
+    @rtype: bool
+    @returns: True if the list is empty, False otherwise
+    runtime complexity: O(1)
+    """
+    def empty(self):
+        return self.root == 0
+
+    """returns the size of the list
+    @rtype: int
+    @returns: the size of the list
+    runtime complexity: O(1)
+    """
+    def length(self):
+        return self.size[self.root]
+
+    """returns the size of the list
+    @rtype: int
+    @returns: the size of the list
+    runtime complexity: O(1)
+    """
+    def __len__(self):
+        return self.size[self.root]
+
+    """allocates a single real node
+    @type val: str
+    @param val: the value of the node
+    @rtype: int
+    @returns: the handle of the new node
+    runtime complexity: O(1) amortized
+    """
+    def newNode(self, val):
+        if self.freeHandles:
+            handle = self.freeHandles.pop()
+            self.values[handle] = val
+            self.left[handle] = self.right[handle] = self.parent[handle] = 0
+            self.height[handle] = 0
+            self.size[handle] = 1
+            if self.agg is not None:
+                self.agg[handle] = self.augmentation.measure(val)
+            return handle
+        return self.appendNode(val)
+
+    """returns a node to the free handles
+    @type handle: int
+    @pre: handle is not a part of any tree
+    @param handle: the node to free
+    runtime complexity: O(1) amortized
+    """
+    def freeNode(self, handle):
+        self.values[handle] = None if self.typecode is None else 0  # drops the reference to the value
+        if self.agg is not None:
+            self.agg[handle] = self.augmentation.identity
+        self.height[handle] = -1
+        self.freeHandles.append(handle)
+
+    """updates the height, the size and the aggregate of the (non-virtual) node
+    @type handle: int
+    @param handle: the node
+    runtime complexity: O(1), not counting the augmentation's functions
+    """
+    def update(self, handle):
+        left, right = self.left[handle], self.right[handle]
+        self.height[handle] = max(self.height[left], self.height[right]) + 1
+        self.size[handle] = self.size[left] + self.size[right] + 1
+        if self.agg is not None:
+            self.updateAggregate(handle)
+
+    """updates the size and the aggregate of the (non-virtual) node, see AVLTreeList.updateSize
+    @type handle: int
+    @param handle: the node
+    runtime complexity: O(1), not counting the augmentation's functions
+    """
+    def updateSize(self, handle):
+        self.size[handle] = self.size[self.left[handle]] + self.size[self.right[handle]] + 1
+        if self.agg is not None:
+            self.updateAggregate(handle)
+
+    """returns the node itself, the nodes of an array list are never shared with a snapshot (see AVLTreeList.own)
+    @type handle: int
+    @param handle: the node
+    @rtype: int
+    @returns: handle
+    runtime complexity: O(1)
+    """
+    def own(self, handle):
+        return handle
+
+    """updates the aggregate of the (non-virtual) node from its value and the aggregates of its children
+    @type handle: int
+    @pre: the list has an augmentation
+    @param handle: the node
+    runtime complexity: O(1), not counting the augmentation's functions
+    """
+    def updateAggregate(self, handle):
+        aug, agg = self.augmentation, self.agg
+        agg[handle] = aug.combine(aug.combine(agg[self.left[handle]], aug.measure(self.values[handle])),
+                                  agg[self.right[handle]])
+
+    """builds a balanced tree from the values of the given iterable. The values are appended to the value column first,
+    then the tree is shaped over their handles, which are consecutive. While there are free handles, the values take
+    them first, and the tree is shaped over the handles as they were taken
+    @type iterable: iterable
+    @param iterable: the values of the list, in order
+    @pre: self.empty() == True
+    runtime complexity: O(n) where n is the number of values
+    """
+    def build(self, iterable):
+        if self.freeHandles:
+            handles = array('q', (self.newNode(val) for val in iterable))
+            self.root = self.shape(0, len(handles) - 1, 0, handles)
+            return
+        first = len(self.left)
+        for val in iterable:
+            self.appendNode(val)
+        self.root = self.shape(first, len(self.left) - 1, 0)
+
+    """allocates a node at the end of the columns, ignoring the free handles
+    @type val: str
+    @param val: the value of the node
+    @rtype: int
+    @returns: the handle of the new node
+    runtime complexity: O(1) amortized
+    """
+    def appendNode(self, val):
+        self.values.append(val)
+        if self.agg is not None:
+            self.agg.append(self.augmentation.measure(val))
+        self.left.append(0)
+        self.right.append(0)
+        self.parent.append(0)
+        self.height.append(0)
+        self.size.append(1)
+        return len(self.left) - 1
+
+    """links the consecutive handles lo..hi into a perfectly balanced tree
+    @type lo: int
+    @type hi: int
+    @param lo: the first handle, in order
+    @param hi: the last handle, in order
+    @type parent: int
+    @param parent: the parent of the new tree's root
+    @type handles: array
+    @param handles: the handles to link, in order, lo and hi then being positions in it (optional)
+    @rtype: int
+    @returns: the root of the new tree, 0 if lo > hi
+    runtime complexity: O(hi - lo)
+    """
+    def shape(self, lo, hi, parent, handles=None):
+        if lo > hi:
+            return 0
+        mid = (lo + hi) // 2
+        node = mid if handles is None else handles[mid]
+        self.parent[node] = parent
+        self.left[node] = self.shape(lo, mid - 1, node, handles)
+        self.right[node] = self.shape(mid + 1, hi, node, handles)
+        self.update(node)
+        return node
+
+    """retrieves the node of the i'th item in the list
+    @type i: int
+    @pre: 0 <= i < self.length()
+    @param i: index in the list
+    @rtype: int
+    @returns: the handle of the i'th item in the list
+    runtime complexity: O(logn)
+    """
+    def retrieveNode(self, i):
+        left, right, size = self.left, self.right, self.size
+        current = self.root
+        while True:
+            leftSize = size[left[current]]
+            if i < leftSize:
+                current = left[current]
+            elif i > leftSize:
+                i -= leftSize + 1
+                current = right[current]
+            else:
+                return current
+
+    """retrieves the value of the i'th item in the list
+    @type i: int
+    @pre: 0 <= i < self.length()
+    @param i: index in the list
+    @rtype: str
+    @returns: the value of the i'th item in the list
+    runtime complexity: O(logn)
+    """
+    def retrieve(self, i):
+        return self.values[self.retrieveNode(i)]
+
+    """converts a (possibly negative) index to a position in the list
+    @type i: int
+    @param i: an index, counted from the end of the list when negative
+    @rtype: int
+    @returns: the matching position in the list
+    @raises IndexError: if the index is out of range
+    runtime complexity: O(1)
+    """
+    def normalizeIndex(self, i):
+        if i < 0:
+            i += self.length()
+        if not 0 <= i < self.length():
+            raise IndexError("list index out of range")
+        return i
+
+    """returns lst[key], with the semantics of a python list
+    @type key: int or slice
+    @param key: an index or a slice
+    @rtype: str or ArrayAVLTreeList
+    @returns: the value at index key, or a new list holding the values of the slice
+    @raises IndexError: if the index is out of range
+    runtime complexity: O(logn) for an index, O(k + logn) for a slice of k items
+    """
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length())
+            if step == 1:
+                values = list(self.iterRange(start, max(start, stop)))
+            else:
+                values = [self.retrieve(k) for k in range(start, stop, step)]
+            return self.newList(values)
+        return self.retrieve(self.normalizeIndex(key))
+
+    """deletes lst[key], with the semantics of a python list
+    @type key: int or slice
+    @param key: an index or a slice
+    @raises IndexError: if the index is out of range
+    runtime complexity: O(logn) for an index, O(k + logn) for a contiguous slice of k items, O(k * logn) for an
+    extended slice of k items
+    """
+    def __delitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length())
+            if step == 1:
+                self.deleteRange(start, max(start, stop))
+                return
+            indices = range(start, stop, step)
+            for k in (reversed(indices) if step > 0 else indices):  # deletes from the end so indices don't shift
+                self.delete(k)
+            return
+        self.delete(self.normalizeIndex(key))
+
+    """generates the values of the items from index i up to index j (excluded), in order. The walk keeps the
+    ancestors that are still to be visited on an explicit stack
+    @type i: int
+    @type j: int
+    @pre: 0 <= i <= j <= self.length()
+    @param i: the index of the first item
+    @param j: the index following the last item
+    @rtype: generator
+    runtime complexity: O(k + logn) where k = j - i
+    """
+    def iterRange(self, i, j):
+        count = j - i
+        if count <= 0:
+            return
+        left, right, size, values = self.left, self.right, self.size, self.values
+        stack = []
+        node = self.root
+        while True:  # descends to the i'th item, stacking the ancestors that come after it
+            leftSize = size[left[node]]
+            if i < leftSize:
+                stack.append(node)
+                node = left[node]
+            elif i > leftSize:
+                i -= leftSize + 1
+                node = right[node]
+            else:
+                break
+        while True:
+            yield values[node]
+            count -= 1
+            if count == 0:
+                return
+            node = right[node]
+            while node:
+                stack.append(node)
+                node = left[node]
+            node = stack.pop()
+
+    """inserts val at position i in the list
+    @type i: int
+    @pre: 0 <= i <= self.length()
+    @param i: The intended index in the list to which we insert val
+    @type val: str
+    @param val: the value we insert
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def insert(self, i, val):
+        newNode = self.newNode(val)
+        if self.valueIndex is not None:
+            self.indexAdd(newNode)
+        if self.root == 0:
+            self.root = newNode
+            return 0
+        if i == self.length():
+            parent = self.getMax(self.root)
+            self.right[parent] = newNode
+        else:
+            parent = self.retrieveNode(i)
+            if self.left[parent] == 0:
+                self.left[parent] = newNode
+            else:
+                parent = self.getMax(self.left[parent])
+                self.right[parent] = newNode
+        self.parent[newNode] = parent
+        return self.FixTree(parent)
+
+    """deletes the given node. A node with two children takes the value of its successor, which is deleted instead
+    @type handle: int
+    @pre: handle is a real node of self
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def deleteNode(self, handle):
+        if self.valueIndex is not None:
+            self.indexRemove(handle)
+        if self.left[handle] and self.right[handle]:
+            successor = self.getMin(self.right[handle])
+            if self.valueIndex is not None:
+                self.indexRemove(successor)
+            self.values[handle] = self.values[successor]
+            if self.valueIndex is not None:
+                self.indexAdd(handle)
+            handle = successor
+        parent = self.parent[handle]
+        self.bypassHelper(parent, self.left[handle] or self.right[handle], handle)
+        self.freeNode(handle)
+        return self.FixTree(parent)
+
+    """deletes the i'th item in the list
+    @type i: int
+    @pre: 0 <= i < self.length()
+    @param i: The intended index in the list to be deleted
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def delete(self, i):
+        return self.deleteNode(self.retrieveNode(i))
+
+    """appends val after the last item of the list
+    @type val: str
+    @param val: the value we insert
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def append(self, val):
+        return self.insert(self.length(), val)
+
+    """inserts val before the first item of the list
+    @type val: str
+    @param val: the value we insert
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn)
+    """
+    def appendleft(self, val):
+        return self.insert(0, val)
+
+    """removes the last item of the list
+    @rtype: str
+    @returns: the value of the removed item
+    @raises IndexError: if the list is empty
+    runtime complexity: O(logn)
+    """
+    def pop(self):
+        if self.root == 0:
+            raise IndexError("pop from an empty list")
+        handle = self.getMax(self.root)
+        val = self.values[handle]
+        self.deleteNode(handle)
+        return val
+
+    """removes the first item of the list
+    @rtype: str
+    @returns: the value of the removed item
+    @raises IndexError: if the list is empty
+    runtime complexity: O(logn)
+    """
+    def popleft(self):
+        if self.root == 0:
+            raise IndexError("pop from an empty list")
+        handle = self.getMin(self.root)
+        val = self.values[handle]
+        self.deleteNode(handle)
+        return val
+
+    """inserts the values of the given iterable at position i in the list, so the first of them ends up at index i.
+    The values are built into a tree in the columns of self, which is joined between the two halves of the list
+    @type i: int
+    @pre: 0 <= i <= self.length()
+    @param i: The intended index in the list to which we insert the values
+    @type iterable: iterable
+    @param iterable: the values we insert, in order
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(k + logn) where k is the number of values
+    """
+    def insertMany(self, i, iterable):
+        block = self.fragmentList()
+        block.build(iterable)
+        if block.root == 0:
+            return 0
+        if self.valueIndex is not None:
+            for handle in self.iterNodes(block.root):
+                self.indexAdd(handle)
+        left, right = self.splitBefore(i)
+        counter = left.joinList(block) + left.joinList(right)
+        self.root = left.root
+        return counter
+
+    """deletes the items from index i up to index j (excluded), freeing their handles
+    @type i: int
+    @type j: int
+    @pre: 0 <= i <= j <= self.length()
+    @param i: the index of the first item to be deleted
+    @param j: the index following the last item to be deleted
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(k + logn) where k = j - i
+    """
+    def deleteRange(self, i, j):
+        if i >= j:
+            return 0
+        left, rest = self.splitBefore(i)
+        middle, right = rest.splitBefore(j - i)
+        stack = [middle.root]
+        while stack:
+            handle = stack.pop()
+            if handle:
+                stack.append(self.left[handle])
+                stack.append(self.right[handle])
+                if self.valueIndex is not None:
+                    self.indexRemove(handle)
+                self.freeNode(handle)
+        counter = left.joinList(right)
+        self.root = left.root
+        return counter
+
+    """array lists do not support cursors, which would have to follow handles that deletes reuse
+    @raises TypeError: always
+    """
+    def cursor(self, i=0):
+        raise TypeError("ArrayAVLTreeList does not support cursors")
+
+    """array lists do not support snapshots, whose columns would have to be copied on write
+    @raises TypeError: always
+    """
+    def snapshot(self):
+        raise TypeError("ArrayAVLTreeList does not support snapshots")
+
+    """splits the list at the i'th index. The two lists share the columns of self
+    @type i: int
+    @pre: 0 <= i < self.length()
+    @param i: The intended index in the list according to which we split the tree
+    @rtype: list
+    @returns: a list [left, val, right], where left is an ArrayAVLTreeList representing the list until index i-1,
+    right is an ArrayAVLTreeList representing the list from index i+1, and val is the value at the i'th index.
+    runtime complexity: O(logn)
+    """
+    def split(self, i):
+        x = self.retrieveNode(i)
+        val = self.values[x]
+        left = self.fragmentList()
+        right = self.fragmentList()
+        left.root, right.root = self.splitAtNode(x)[:2]
+        if self.valueIndex is not None:
+            self.indexRemove(x)
+            self.splitIndex(left, right)
+        self.freeNode(x)
+        return [left, val, right]
+
+    """splits the list before the i'th item. self is left empty, its hash index is not handed over to the two lists,
+    since insertMany and deleteRange put them back together into self
+    @type i: int
+    @pre: 0 <= i <= self.length()
+    @param i: the index of the first item of the right list
+    @rtype: list
+    @returns: a list [left, right] of lists sharing the columns of self, where left holds the items before index i
+    and right holds the rest
+    runtime complexity: O(logn)
+    """
+    def splitBefore(self, i):
+        left = self.fragmentList()
+        right = self.fragmentList()
+        if i == self.length():
+            left.root = self.root
+        else:
+            x = self.retrieveNode(i)
+            left.root, rightRoot = self.splitAtNode(x)[:2]
+            right.join(0, x, rightRoot)
+        self.root = 0
+        return [left, right]
+
+    """concatenates lst to self. The last node of self is reused as the node joining the two trees. If lst does not
+    share the columns of self, its values are first copied into them
+    @type lst: ArrayAVLTreeList
+    @param lst: a list to be concatenated after self
+    @rtype: int
+    @returns: the absolute value of the difference between the height of the AVL trees joined
+    runtime complexity: O(logn), O(logn + m) if lst has its own columns, where m is the size of lst
+    """
+    def concat(self, lst):
+        diff = abs(self.height[self.root] - lst.height[lst.root])
+        self.joinList(lst)
+        return diff
+
+    """concatenates lst to self, see concat
+    @type lst: ArrayAVLTreeList
+    @param lst: a list to be concatenated after self
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    runtime complexity: O(logn), O(logn + m) if lst has its own columns, where m is the size of lst
+    """
+    def joinList(self, lst):
+        if lst.left is not self.left:
+            copy = self.fragmentList()
+            copy.build(lst)
+            lst.root = 0
+            if lst.valueIndex is not None:
+                lst.valueIndex = {}
+            lst = copy
+        counter = 0
+        if self.valueIndex is not None:
+            self.mergeIndex(lst)
+        if self.root == 0:
+            self.root = lst.root
+        elif lst.root:
+            x = self.getMax(self.root)
+            parent = self.parent[x]
+            self.bypassHelper(parent, self.left[x], x)  # x has no right child
+            counter += self.FixTree(parent)
+            counter += self.join(self.root, x, lst.root)
+        lst.root = 0
+        if lst.valueIndex is not None:
+            lst.valueIndex = {}
+        return counter
+
+    """returns the value of the first item in the list
+    @rtype: str
+    @returns: the value of the first item, None if the list is empty
+    runtime complexity: O(logn)
+    """
+    def first(self):
+        if self.root == 0:
+            return None
+        return self.values[self.getMin(self.root)]
+
+    """returns the value of the last item in the list
+    @rtype: str
+    @returns: the value of the last item, None if the list is empty
+    runtime complexity: O(logn)
+    """
+    def last(self):
+        if self.root == 0:
+            return None
+        return self.values[self.getMax(self.root)]
+
+    """generates the values of the list, in order
+    @rtype: generator
+    runtime complexity: O(n)
+    """
+    def __iter__(self):
+        left, right, values = self.left, self.right, self.values
+        stack = []
+        node = self.root
+        while True:
+            while node:
+                stack.append(node)
+                node = left[node]
+            if not stack:
+                return
+            node = stack.pop()
+            yield values[node]
+            node = right[node]
+
+    """returns an array representing list
+    @rtype: list
+    @returns: a list of the values of the list
+    runtime complexity: O(n)
+    """
+    def listToArray(self):
+        return list(self)
+
+    """generates the values of the list, from the last to the first
+    @rtype: generator
+    runtime complexity: O(n)
+    """
+    def __reversed__(self):
+        left, right, values = self.left, self.right, self.values
+        stack = []
+        node = self.root
+        while True:
+            while node:
+                stack.append(node)
+                node = right[node]
+            if not stack:
+                return
+            node = stack.pop()
+            yield values[node]
+            node = left[node]
+
+    """generates the nodes of the given subtree, in order
+    @type root: int
+    @param root: the root of the subtree (may be 0)
+    @rtype: generator
+    runtime complexity: O(n) where n is the size of the subtree
+    """
+    def iterNodes(self, root):
+        left, right = self.left, self.right
+        stack = []
+        node = root
+        while True:
+            while node:
+                stack.append(node)
+                node = left[node]
+            if not stack:
+                return
+            node = stack.pop()
+            yield node
+            node = right[node]
+
+    """returns the index of the given node by climbing to the root and summing the sizes of the subtrees on its left
+    @type node: int
+    @pre: node is a real node of self
+    @param node: The given node
+    @rtype: int
+    @returns: the index of node's item in the list
+    runtime complexity: O(logn)
+    """
+    def rank(self, node):
+        left, right, parent, size = self.left, self.right, self.parent, self.size
+        index = size[left[node]]
+        while parent[node]:
+            if right[parent[node]] == node:
+                index += size[left[parent[node]]] + 1
+            node = parent[node]
+        return index
+
+    """returns the number of edges from the root to the given node, for the stats
+    @type node: int
+    @pre: node is a real node of self
+    @rtype: int
+    @returns: the depth of node
+    runtime complexity: O(logn)
+    """
+    def depth(self, node):
+        depth = 0
+        while self.parent[node]:
+            node = self.parent[node]
+            depth += 1
+        return depth
+
+    """finds the nodes of many items in a single walk from the root, see AVLTreeList.locateMany
+    @type positions: list
+    @pre: positions is sorted and 0 <= positions[k] < self.length() for every k
+    @param positions: the indices of the items
+    @rtype: list
+    @returns: the handle of the item at every position, in order
+    runtime complexity: O(k + k * log(n / k)) where k is the number of positions
+    """
+    def locateMany(self, positions):
+        left, right, size = self.left, self.right, self.size
+        located = [0] * len(positions)
+        stack = [(self.root, 0, 0, len(positions))] if positions else []
+        while stack:  # the positions lo to hi (excluded) fall in the subtree of node, whose first item is at start
+            node, start, lo, hi = stack.pop()
+            i = start + size[left[node]]
+            mid = bisect_left(positions, i, lo, hi)
+            after = bisect_right(positions, i, mid, hi)
+            for k in range(mid, after):
+                located[k] = node
+            if lo < mid:
+                stack.append((left[node], start, lo, mid))
+            if after < hi:
+                stack.append((right[node], i + 1, after, hi))
+        return located
+
+    """retrieves the values of many items at once, see locateMany
+    @type indices: iterable
+    @param indices: indices of the list, counted from the end when negative. A numpy array of integers is accepted
+    @type asArray: bool
+    @param asArray: whether to return the values as a numpy array instead of a list (requires numpy)
+    @rtype: list
+    @returns: the values of the items, in the order of indices
+    @raises IndexError: if an index is out of range
+    runtime complexity: O(k * logk + k * log(n / k)) where k is the number of indices
+    """
+    def retrieveMany(self, indices, asArray=False):
+        order, positions = self.sortIndices(indices)
+        values = [None] * len(order)
+        for k, handle in zip(order, self.locateMany(positions)):
+            values[k] = self.values[handle]
+        if asArray:
+            import numpy
+            return numpy.array(values)
+        return values
+
+    """replaces the values of many items at once, see locateMany. When an index repeats, its last value is kept
+    @type indices: iterable
+    @param indices: indices of the list, counted from the end when negative. A numpy array of integers is accepted
+    @type values: iterable
+    @param values: the new values, one for each index
+    @raises IndexError: if an index is out of range, the list is then left unchanged
+    @raises ValueError: if there are not as many values as indices, the list is then left unchanged
+    runtime complexity: O(k * logk + k * log(n / k)) where k is the number of indices, plus O(k * logn) with an
+    augmentation
+    """
+    def setMany(self, indices, values):
+        values = values.tolist() if hasattr(values, 'tolist') else list(values)
+        order, positions = self.sortIndices(indices)
+        if len(values) != len(order):
+            raise ValueError("setMany got %d values for %d indices" % (len(values), len(order)))
+        for k, handle in zip(order, self.locateMany(positions)):
+            self.setNodeValue(handle, values[k])
+
+    """replaces the value of the given node, keeping the hash index and the aggregates up to date
+    @type node: int
+    @pre: node is a real node of self
+    @param node: The given node
+    @type val: str
+    @param val: the new value
+    runtime complexity: O(1) expected, O(logn) with an augmentation
+    """
+    def setNodeValue(self, node, val):
+        if self.valueIndex is not None:
+            self.indexRemove(node)
+            self.values[node] = val
+            self.indexAdd(node)
+        else:
+            self.values[node] = val
+        if self.agg is not None:
+            while node:
+                self.updateAggregate(node)
+                node = self.parent[node]
+
+    """returns the aggregate of the items from index i up to index j (excluded), under the augmentation of the list,
+    see AVLTreeList.rangeQuery
+    @type i: int
+    @type j: int
+    @pre: 0 <= i <= j <= self.length(), and the list was constructed with an augmentation
+    @param i: the index of the first item
+    @param j: the index following the last item
+    @rtype: object
+    @returns: the combination, in order, of the measures of the values in the range
+    runtime complexity: O(logn), not counting the augmentation's functions
+    """
+    def rangeQuery(self, i, j):
+        aug = self.augmentation
+        left, right, size, agg, values = self.left, self.right, self.size, self.agg, self.values
+        node = self.root
+        while i < j:  # descends to the highest node in the range, the range then spans both of its subtrees
+            leftSize = size[left[node]]
+            if j <= leftSize:
+                node = left[node]
+            elif i > leftSize:
+                i -= leftSize + 1
+                j -= leftSize + 1
+                node = right[node]
+            else:
+                break
+        else:
+            return aug.identity
+        if i == 0 and j == size[node]:
+            return agg[node]
+        # the range is a suffix of the left subtree, node's value and a prefix of the right subtree
+        leftSize = size[left[node]]
+        middle = aug.measure(values[node])
+        suffix = aug.identity  # the aggregate of the part of the suffix that was passed on the way down
+        current = left[node]
+        while i < size[current]:
+            currentLeftSize = size[left[current]]
+            if i == 0:
+                suffix = aug.combine(agg[current], suffix)
+                break
+            if i <= currentLeftSize:
+                suffix = aug.combine(aug.combine(aug.measure(values[current]), agg[right[current]]), suffix)
+                current = left[current]
+            else:
+                i -= currentLeftSize + 1
+                current = right[current]
+        j -= leftSize + 1
+        prefix = aug.identity  # the aggregate of the part of the prefix that was passed on the way down
+        current = right[node]
+        while j > 0:
+            currentLeftSize = size[left[current]]
+            if j == size[current]:
+                prefix = aug.combine(prefix, agg[current])
+                break
+            if j <= currentLeftSize:
+                current = left[current]
+            else:
+                prefix = aug.combine(prefix, aug.combine(agg[left[current]], aug.measure(values[current])))
+                j -= currentLeftSize + 1
+                current = right[current]
+        return aug.combine(aug.combine(suffix, middle), prefix)
+
+    """applies a batch of operations in a single walk from the root, with the same result as applying them one after
+    the other, see AVLTreeList.applyBatch. A scattered batch is applied one operation at a time. Any other batch is
+    translated by planBatch, then every subtree holding a changed position is rebuilt: the runs of inserted values
+    are built at their gaps and every node on the way is joined back between its two rebuilt subtrees, or freed if
+    it is deleted
+    @type ops: iterable
+    @param ops: the operations, in order
+    @rtype: int
+    @returns: the number of rebalancing operation due to AVL rebalancing
+    @raises IndexError: if an operation's index is out of range, the list is then left unchanged
+    @raises ValueError: if an operation is unknown, the list is then left unchanged
+    runtime complexity: O(k * logn) for a scattered batch, O(k * sqrt(p) + p * log(n / p + 1)) otherwise, where k is
+    the number of operations and p the number of places of the list they change
+    """
+    def applyBatch(self, ops):
+        ops = list(ops)
+        if self.scatteredBatch(ops):
+            return self.applyInOrder(ops)
+        positions, gaps, changes = self.planBatch(ops)
+        if not positions:
+            return 0
+        left, right, size = self.left, self.right, self.size
+
+        def rebuild(node, first, lo, hi):  # node's subtree holds the items from index first of the list as it is
+            if lo == hi:
+                return [node, 0]
+            if node == 0:  # the gap before the item at index first
+                block = self.fragmentList()
+                block.build(gaps.get(first, ()))
+                if self.valueIndex is not None:
+                    for handle in self.iterNodes(block.root):
+                        self.indexAdd(handle)
+                return [block.root, 0]
+            i = first + size[left[node]]
+            mid = bisect_left(positions, i, lo, hi)
+            split = mid + 1 if mid < hi and positions[mid] == i else mid  # the gap before i is left's last one
+            leftRoot, counter = rebuild(left[node], first, lo, split)
+            rightRoot, rightCounter = rebuild(right[node], i + 1, split, hi)
+            counter += rightCounter
+            op = changes.get(i) if split > mid else None
+            if op is None or op[0] == "set":
+                if op is not None:
+                    if self.valueIndex is not None:
+                        self.indexRemove(node)
+                    self.values[node] = op[2]
+                    if self.valueIndex is not None:
+                        self.indexAdd(node)
+                counter += self.join(leftRoot, node, rightRoot)
+                return [self.root, counter]
+            if self.valueIndex is not None:
+                self.indexRemove(node)
+            self.freeNode(node)
+            if leftRoot == 0 or rightRoot == 0:
+                root = leftRoot or rightRoot
+                self.parent[root] = 0
+                return [root, counter]
+            fragment = self.fragmentList()  # the last node of left joins it to right, see joinList
+            fragment.root = leftRoot
+            self.parent[leftRoot] = 0
+            last = self.getMax(leftRoot)
+            parent = self.parent[last]
+            fragment.bypassHelper(parent, left[last], last)  # last has no right child
+            counter += fragment.FixTree(parent)
+            counter += self.join(fragment.root, last, rightRoot)
+            return [self.root, counter]
+
+        self.root, counter = rebuild(self.root, 0, 0, len(positions))
+        return counter
+
+    """builds a hash index from the values to the nodes holding them, see AVLTreeList.enableIndex. The numbers of a
+    list kept in an array are always matched with ==
+    @type byEquality: bool
+    @param byEquality: True to match values with == (the values must be hashable), False to match them by identity
+    runtime complexity: O(n)
+    """
+    def enableIndex(self, byEquality=False):
+        self.byEquality = byEquality or self.typecode is not None
+        self.valueIndex = {}
+        for node in self.iterNodes(self.root):
+            self.indexAdd(node)
+
+    """adds a node to the hash index
+    @type node: int
+    @pre: node is a real node of self
+    @param node: The given node
+    runtime complexity: O(1) expected
+    """
+    def indexAdd(self, node):
+        key = self.indexKey(self.values[node])
+        nodes = self.valueIndex.get(key)
+        if nodes is None:
+            self.valueIndex[key] = {node}
+        else:
+            nodes.add(node)
+
+    """removes a node from the hash index, if it is there
+    @type node: int
+    @pre: node is a real node
+    @param node: The given node
+    runtime complexity: O(1) expected
+    """
+    def indexRemove(self, node):
+        key = self.indexKey(self.values[node])
+        nodes = self.valueIndex.get(key)
+        if nodes is not None:
+            nodes.discard(node)
+            if not nodes:
+                del self.valueIndex[key]
+
+    """turns on the stats of the list, see AVLTreeList.enableStats. The handles handed out by newNode and
+    appendNode are counted as allocations, and there are no successor walks to count
+    @type callback: function
+    @param callback: called as callback(name, seconds) after every timed operation (optional)
+    runtime complexity: O(1), then O(logn) more for every counted call
+    """
+    def enableStats(self, callback=None):
+        self.disableStats()
+        self.statistics = {'calls': {}, 'latency': {}, 'descentDepth': {}, 'successorSteps': {},
+                           'rotations': {'single': 0, 'double': 0, 'treap': 0}, 'allocations': 0}
+        self.statsCallback = callback
+        for name in self.STATS_OPERATIONS:
+            setattr(self, name, self.timedMethod(name, getattr(self, name)))
+        setattr(self, 'retrieveNode', self.countedRetrieveNode(self.retrieveNode))
+        setattr(self, 'rotateLeft', self.countedRotation(self.rotateLeft))
+        setattr(self, 'rotateRight', self.countedRotation(self.rotateRight))
+        setattr(self, 'newNode', self.countedNewNode(self.newNode))
+        setattr(self, 'appendNode', self.countedAppendNode(self.appendNode))
+
+    """turns off the stats of the list, removing every instrumented method
+    runtime complexity: O(1)
+    """
+    def disableStats(self):
+        if self.statistics is None:
+            return
+        for name in self.STATS_METHODS + ('statsCallback',):
+            self.__dict__.pop(name, None)
+        self.statistics = None
+        if self.journal is not None:  # its methods were removed with the instrumented ones
+            self.wrapJournal()
+
+    """wraps a rotation so that it is counted as a single or a double one, see AVLTreeList.countedRotation
+    @type method: function
+    @param method: the bound method
+    @rtype: function
+    @returns: the instrumented method
+    runtime complexity: O(1)
+    """
+    def countedRotation(self, method):
+        def rotate(node):
+            rotations = self.statistics['rotations']
+            parent = self.parent[node]
+            if parent and abs(self.height[self.left[parent]] - self.height[self.right[parent]]) == 2:
+                rotations['double'] += 1
+                rotations['single'] -= 1  # the second half of the double rotation will be counted as a single one
+            else:
+                rotations['single'] += 1
+            method(node)
+        return rotate
+
+    """wraps newNode so that a reused handle is counted as an allocation, appendNode counts the others
+    @type method: function
+    @param method: the bound method
+    @rtype: function
+    @returns: the instrumented method
+    runtime complexity: O(1)
+    """
+    def countedNewNode(self, method):
+        def newNode(val):
+            if self.freeHandles:
+                self.statistics['allocations'] += 1
+            return method(val)
+        return newNode
+
+    """wraps appendNode so that every handle it adds to the columns is counted as an allocation
+    @type method: function
+    @param method: the bound method
+    @rtype: function
+    @returns: the instrumented method
+    runtime complexity: O(1)
+    """
+    def countedAppendNode(self, method):
+        def appendNode(val):
+            self.statistics['allocations'] += 1
+            return method(val)
+        return appendNode
+
+    # the methods of AVLTreeList that only go through other methods of the list, which an array list has too
+    getMin = AVLTreeList.getMin
+    getMax = AVLTreeList.getMax
+    bypassHelper = AVLTreeList.bypassHelper
+    rotateRight = AVLTreeList.rotateRight
+    rotateLeft = AVLTreeList.rotateLeft
+    FixTree = AVLTreeList.FixTree
+    join = AVLTreeList.join
+    splitAtNode = AVLTreeList.splitAtNode
+    sortIndices = AVLTreeList.sortIndices
+    planBatch = AVLTreeList.planBatch
+    scatteredBatch = AVLTreeList.scatteredBatch
+    applyInOrder = AVLTreeList.applyInOrder
+    checkBatch = AVLTreeList.checkBatch
+    search = AVLTreeList.search
+    indexOfAll = AVLTreeList.indexOfAll
+    contains = AVLTreeList.contains
+    __contains__ = AVLTreeList.__contains__
+    disableIndex = AVLTreeList.disableIndex
+    indexKey = AVLTreeList.indexKey
+    splitIndex = AVLTreeList.splitIndex
+    mergeIndex = AVLTreeList.mergeIndex
+    getStats = AVLTreeList.getStats
+    countStat = AVLTreeList.countStat
+    timedMethod = AVLTreeList.timedMethod
+    countedRetrieveNode = AVLTreeList.countedRetrieveNode
+    countDescent = AVLTreeList.countDescent
+    enableJournal = AVLTreeList.enableJournal
+    disableJournal = AVLTreeList.disableJournal
+    startJournal = AVLTreeList.startJournal
+    releaseJournal = AVLTreeList.releaseJournal
+    wrapJournal = AVLTreeList.wrapJournal
+    journaledMethod = AVLTreeList.journaledMethod
+    journalChange = AVLTreeList.journalChange
+    recordedFragments = AVLTreeList.recordedFragments
+    joinable = AVLTreeList.joinable
+    applyChange = AVLTreeList.applyChange
+    replay = classmethod(AVLTreeList.replay.__func__)
+    replayRun = AVLTreeList.replayRun
+    changes = AVLTreeList.changes
+    pieces = AVLTreeList.pieces
+    parallelMap = AVLTreeList.parallelMap
+    parallelReduce = AVLTreeList.parallelReduce
+
+    """returns the state of the list for pickle, the columns are dumped as raw buffers. Columns that also hold freed
+    handles or the nodes of other lists are first compacted into a copy of the list. The hash index is rebuilt on
+    load, and the copy starts with its stats and journal off
+    @rtype: dict
+    @returns: the state of the list
+    runtime complexity: O(n), O(n) for the compaction too
+    """
+    def __getstate__(self):
+        lst = self
+        if len(self.left) - 1 > self.length():  # the columns hold more than the nodes of self
+            lst = self.newList(self)
+        state = {'typecode': lst.typecode, 'root': lst.root, 'augmentation': lst.augmentation, 'agg': lst.agg,
+                 'byEquality': self.byEquality, 'valueIndex': self.valueIndex is not None}
+        for name in ('left', 'right', 'parent', 'height', 'size', 'freeHandles'):
+            state[name] = getattr(lst, name).tobytes()
+        state['values'] = lst.values if lst.typecode is None else lst.values.tobytes()
+        return state
+
+    """restores the list from a state made by __getstate__
+    @type state: dict
+    @param state: the state of the list
+    runtime complexity: O(n)
+    """
+    def __setstate__(self, state):
+        self.typecode = state['typecode']
+        self.root = state['root']
+        self.augmentation = state['augmentation']
+        self.agg = state['agg']
+        self.byEquality = state['byEquality']
+        self.valueIndex = self.statistics = self.journal = None
+        for name in ('left', 'right', 'parent', 'height', 'size', 'freeHandles'):
+            column = array('q')
+            column.frombytes(state[name])
+            setattr(self, name, column)
+        self.bindColumns()
+        if self.typecode is None:
+            self.values = state['values']
+        else:
+            self.values = array(self.typecode)
+            self.values.frombytes(state['values'])
+        if state['valueIndex']:
+            self.enableIndex(self.byEquality)
+
+
+"""A class representing a lock shared by many readers or held by a single writer. A waiting writer keeps new readers
+out, so a steady stream of readers cannot starve it.
+"""
+
+
+class ReadWriteLock(object):
+
+    """Constructor.
+    runtime complexity: O(1)
+    """
+    def __init__(self):
+        self.condition = threading.Condition(threading.Lock())
+        self.readers = 0  # the number of threads holding the lock for reading
+        self.writing = False  # whether a thread holds the lock for writing
+        self.waitingWriters = 0
+
+    """acquires the lock for reading, waiting while a writer holds it or waits for it
+    runtime complexity: O(1) when the lock is free
+    """
+    def acquireRead(self):
+        with self.condition:
+            while self.writing or self.waitingWriters:
+                self.condition.wait()
+            self.readers += 1
+
+    """releases the lock held for reading
+    @pre: the calling thread holds the lock for reading
+    runtime complexity: O(1)
+    """
+    def releaseRead(self):
+        with self.condition:
+            self.readers -= 1
+            if self.readers == 0:
+                self.condition.notify_all()
+
+    """acquires the lock for writing, waiting until no other thread holds it
+    runtime complexity: O(1) when the lock is free
+    """
+    def acquireWrite(self):
+        with self.condition:
+            self.waitingWriters += 1
+            while self.writing or self.readers:
+                self.condition.wait()
+            self.waitingWriters -= 1
+            self.writing = True
+
+    """releases the lock held for writing
+    @pre: the calling thread holds the lock for writing
+    runtime complexity: O(1)
+    """
+    def releaseWrite(self):
+        with self.condition:
+            self.writing = False
+            self.condition.notify_all()
+
+
+"""
+A class sharing an AVLTreeList (or any of its variants) between threads. The methods that only read the list run
+under the read side of a ReadWriteLock, so readers run together, and every other method runs under the write side,
+so a reader never walks a subtree that a rotation left half updated. A list whose reads write to it (see
+AVLTreeList.readsWrite: a TaggedAVLTreeList, a lazily loaded list or a list with stats) is read under the write side
+too. Methods returning generators are read to the end under the lock and return a list, the new lists that
+slices return are wrapped in a ConcurrentAVLTreeList of their own, and cursors in a ConcurrentCursor that takes the
+lock of the shared list. The shared list must only be reached through the wrapper.
+"""
+
+
+class ConcurrentAVLTreeList(object):
+    READ_METHODS = frozenset(['empty', 'retrieve', 'first', 'last', 'listToArray', 'length', 'search', 'indexOfAll',
+                              'contains', 'rangeQuery', 'slice', 'iterRange', 'rank', 'dump', 'retrieveMany',
+                              'parallelMap', 'parallelReduce'])
+    GENERATOR_METHODS = frozenset(['iterRange'])
+    SLICE_METHODS = frozenset(['slice'])
+
+    """Constructor.
+    @type lst: AVLTreeList
+    @param lst: the list to share (optional, a new empty AVLTreeList by default)
+    runtime complexity: O(1)
+    """
+    def __init__(self, lst=None):
+        self.lst = lst if lst is not None else AVLTreeList()
+        self.lock = ReadWriteLock()
+
+    """returns the method of the shared list with the given name, wrapped to run under the lock
+    @type name: str
+    @param name: the name of a method of the shared list
+    @rtype: function
+    @returns: the wrapped method
+    @raises AttributeError: if the shared list has no such attribute
+    runtime complexity: O(1)
+    """
+    def __getattr__(self, name):
+        method = getattr(self.__dict__['lst'], name)
+        if name in self.SLICE_METHODS:
+            return lambda *args, **kwargs: ConcurrentAVLTreeList(self.read(method, False, *args, **kwargs))
+        if name in self.READ_METHODS:
+            return lambda *args, **kwargs: self.read(method, name in self.GENERATOR_METHODS, *args, **kwargs)
+        return lambda *args, **kwargs: self.write(method, *args, **kwargs)
+
+    """calls a method of the shared list under the read side of the lock, or under the write side if the reads of
+    the list write to it. That is checked again once the read side is held, since a writer may have changed it
+    @type method: function
+    @param method: a bound method of the shared list
+    @type generator: bool
+    @param generator: whether the method returns a generator, which is then read to the end under the lock
+    @rtype: object
+    @returns: what the method returns
+    runtime complexity: the complexity of method, plus O(1)
+    """
+    def read(self, method, generator, *args, **kwargs):
+        if not self.lst.readsWrite():
+            self.lock.acquireRead()
+            try:
+                if not self.lst.readsWrite():
+                    result = method(*args, **kwargs)
+                    return list(result) if generator else result
+            finally:
+                self.lock.releaseRead()
+        return self.write(lambda: list(method(*args, **kwargs)) if generator else method(*args, **kwargs))
+
+    """calls a method of the shared list under the write side of the lock
+    @type method: function
+    @param method: a bound method of the shared list
+    @rtype: object
+    @returns: what the method returns
+    runtime complexity: the complexity of method, plus O(1)
+    """
+    def write(self, method, *args, **kwargs):
+        self.lock.acquireWrite()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self.lock.releaseWrite()
+
+    """returns the size of the shared list
+    @rtype: int
+    @returns: the size of the list
+    runtime complexity: O(1)
+    """
+    def __len__(self):
+        return self.read(self.lst.length, False)
+
+    """returns the values of the shared list, read under the lock
+    @rtype: iterator
+    @returns: an iterator over a copy of the values
+    runtime complexity: O(n)
+    """
+    def __iter__(self):
+        return iter(self.read(self.lst.listToArray, False))
+
+    """returns lst[key], with the semantics of a python list
+    @type key: int or slice
+    @param key: an index or a slice
+    @rtype: str or ConcurrentAVLTreeList
+    @returns: the value at index key, or a new shared list holding the values of the slice, with a lock of its own
+    runtime complexity: O(logn) for an index, O(k + logn) for a slice of k items
+    """
+    def __getitem__(self, key):
+        result = self.read(self.lst.__getitem__, False, key)
+        return ConcurrentAVLTreeList(result) if isinstance(key, slice) else result
+
+    """deletes lst[key], with the semantics of a python list
+    @type key: int or slice
+    @param key: an index or a slice
+    runtime complexity: O(logn) for an index or a contiguous slice, O(k * logn) for an extended slice of k items
+    """
+    def __delitem__(self, key):
+        self.write(self.lst.__delitem__, key)
+
+    """returns a cursor placed at the i'th item of the shared list, whose every call runs under the lock
+    @type i: int
+    @pre: 0 <= i <= self.length()
+    @param i: the index of the cursor, self.length() places it after the last item
+    @rtype: ConcurrentCursor
+    @returns: a new cursor
+    @raises TypeError: if the shared list does not support cursors
+    runtime complexity: O(logn)
+    """
+    def cursor(self, i=0):
+        return ConcurrentCursor(self, self.read(self.lst.cursor, False, i))
+
+
+"""
+A class wrapping a Cursor of a list shared by a ConcurrentAVLTreeList. The calls that only read the list, moves
+included, run under the read side of the lock of the shared list, and the writes under the write side, so a cursor
+never reaches the shared list without the lock. A cursor keeps its own position, so it must be used by one thread
+at a time.
+"""
+
+
+class ConcurrentCursor(object):
+    READ_METHODS = frozenset(['atEnd', 'getIndex', 'getValue', 'moveTo', 'moveBy'])
+
+    """Constructor.
+    @type shared: ConcurrentAVLTreeList
+    @param shared: the shared list the cursor moves in
+    @type cursor: Cursor
+    @param cursor: a cursor of the list shared by shared
+    runtime complexity: O(1)
+    """
+    def __init__(self, shared, cursor):
+        self.shared = shared
+        self.cursor = cursor
+
+    """returns the method of the cursor with the given name, wrapped to run under the lock of the shared list
+    @type name: str
+    @param name: the name of a method of the cursor
+    @rtype: function
+    @returns: the wrapped method
+    @raises AttributeError: if the cursor has no such attribute
+    runtime complexity: O(1)
+    """
+    def __getattr__(self, name):
+        method = getattr(self.__dict__['cursor'], name)
+        if name in self.READ_METHODS:
+            return lambda *args, **kwargs: self.shared.read(method, False, *args, **kwargs)
+        return lambda *args, **kwargs: self.shared.write(method, *args, **kwargs)
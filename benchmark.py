@@ -0,0 +1,1156 @@
+"""Benchmarks for AVLTreeList.
+
+Run a single benchmark with:  python benchmark.py <name> [sizes...]
+Run the suite, save its results and check them against saved ones with:
+    python benchmark.py suite [sizes...] [--json out.json] [--baseline base.json] [--threshold 0.25]
+"""
+
+import argparse
+import gc
+import json
+import platform
+import os
+import pickle
+import random
+import sys
+import tempfile
+import threading
+from bisect import bisect_right
+from itertools import accumulate
+from concurrent.futures import ThreadPoolExecutor
+import time
+import tracemalloc
+
+from AVLTreeList import (AffineMap, AVLNode, ArrayAVLTreeList, AVLTreeList, ChunkedAVLTreeList, ConcurrentAVLTreeList,
+                         TaggedAVLTreeList, VIRTUAL)
+
+
+"""A node laid out the way AVLNode was before it had __slots__, used as the "before" baseline of the memory
+benchmark. Every real node used to own two freshly allocated virtual children.
+"""
+
+
+class LegacyNode(object):
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+        self.parent = None
+        self.height = -1
+        self.size = 0
+
+
+"""measures the memory needed to hold a structure
+@type build: function
+@param build: a function with no arguments that builds the structure and returns it
+@rtype: int
+@returns: the number of bytes allocated by build and still alive once it returns
+"""
+def measureBytes(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    structure = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+    return after - before
+
+
+"""builds n legacy real nodes, each with its two virtual children (n + 1 virtual nodes in a real tree)
+@type n: int
+@param n: the number of elements
+@rtype: list
+@returns: the allocated nodes
+"""
+def buildLegacy(n):
+    nodes = []
+    for i in range(n):
+        node = LegacyNode(i)
+        node.height = 0
+        node.size = 1
+        nodes.append(node)
+    for i in range(n + 1):
+        nodes.append(LegacyNode(None))
+    return nodes
+
+
+"""builds an AVLTreeList of n elements
+@type n: int
+@param n: the number of elements
+@rtype: AVLTreeList
+@returns: the list
+"""
+def buildTree(n):
+    lst = AVLTreeList()
+    for i in range(n):
+        lst.insert(i, i)
+    return lst
+
+
+"""reports the bytes per element of the legacy node layout and of the current AVLTreeList
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchMemory(sizes):
+    print("%10s %16s %16s" % ("n", "before (B/elem)", "after (B/elem)"))
+    for n in sizes:
+        # the list of legacy nodes costs 8 bytes per pointer, which is not part of the legacy tree itself
+        before = (measureBytes(lambda: buildLegacy(n)) - 8 * (2 * n + 1)) / n
+        after = measureBytes(lambda: buildTree(n)) / n
+        print("%10d %16.1f %16.1f" % (n, before, after))
+
+
+"""concatenates lst to self the way concat did before it was built on join: the last node of self is copied into
+a new node and deleted, then the copy is planted in the taller tree
+@type self: AVLTreeList
+@type lst: AVLTreeList
+@rtype: int
+@returns: the absolute value of the difference between the height of the AVL trees joined
+"""
+def legacyConcat(self, lst):
+    diff = abs(self.root.getHeight() - lst.root.getHeight())
+    smallTree = self if self.root.getHeight() <= lst.root.getHeight() else lst
+    bigTree = lst if self.root.getHeight() <= lst.root.getHeight() else self
+    if smallTree.root.getSize() != 0:
+        x = AVLNode(self.last())
+        x.makeReal()
+        self.delete(self.root.getSize() - 1)
+        current = bigTree.root
+        parent = None
+        while current.getHeight() > smallTree.root.getHeight():
+            parent = current
+            current = current.getLeft() if smallTree is self else current.getRight()
+        bigTree.bypassHelper(parent, x, current)
+        x.setLeft(self.root) if smallTree is self else x.setLeft(current)
+        if x.getLeft().isRealNode():
+            x.getLeft().setParent(x)
+        x.setRight(current) if smallTree is self else x.setRight(lst.root)
+        if x.getRight().isRealNode():
+            x.getRight().setParent(x)
+        bigTree.FixTree(x)
+    self.root = bigTree.root
+    lst.root = VIRTUAL
+    return diff
+
+
+"""splits the list the way split did before it was built on join: every ancestor of the split node is reinserted
+into one of the halves and the halves are concatenated with legacyConcat, which is O(log^2(n))
+@type self: AVLTreeList
+@type i: int
+@rtype: list
+@returns: a list [left, val, right]
+"""
+def legacySplit(self, i):
+    left = AVLTreeList()
+    right = AVLTreeList()
+    x = self.retrieveNode(i)
+    val = x.getValue()
+    left.root = x.getLeft()
+    right.root = x.getRight()
+    x.makeVirtual()
+    current = x
+    while current.getParent() is not None:
+        parent = current.getParent()
+        tempVal = parent.getValue()
+        subtree = AVLTreeList()
+        subtree.root = parent.getLeft() if parent.getRight() is current else parent.getRight()
+        goesLeft = parent.getRight() is current
+        parent.makeVirtual()
+        if goesLeft:
+            subtree.insert(subtree.length(), tempVal)
+            legacyConcat(subtree, left)
+            left.root = subtree.root
+        else:
+            right.insert(right.length(), tempVal)
+            legacyConcat(right, subtree)
+        current = parent
+    for half in (left, right):
+        if half.root.isRealNode():
+            half.root.setParent(None)
+    return [left, val, right]
+
+
+"""times a destructive operation, building fresh input for every repetition
+@type setup: function
+@param setup: a function with no arguments returning the arguments of op
+@type op: function
+@param op: the timed operation
+@type repeat: int
+@param repeat: the number of repetitions
+@rtype: float
+@returns: the mean time of op in microseconds
+"""
+def timeDestructive(setup, op, repeat):
+    total = 0.0
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        op(*args)
+        total += time.perf_counter() - start
+    return total / repeat * 1e6
+
+
+"""compares split and concat against the versions that preceded the join based ones
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchSplitConcat(sizes):
+    rnd = random.Random(0)
+    print("%10s %14s %14s %14s %14s" % ("n", "old split(us)", "new split(us)", "old concat(us)", "new concat(us)"))
+    for n in sizes:
+        repeat = 20 if n <= 10 ** 5 else 3  # every repetition rebuilds its input, which dominates for large n
+        times = []
+        for split in (legacySplit, AVLTreeList.split):
+            times.append(timeDestructive(lambda: [AVLTreeList(range(n)), rnd.randrange(n)], split, repeat))
+        for concat in (legacyConcat, AVLTreeList.concat):
+            def setupConcat():
+                halves = AVLTreeList(range(n)).split(rnd.randrange(n))
+                return [halves[0], halves[2]]
+            times.append(timeDestructive(setupConcat, concat, repeat))
+        print("%10d %14.1f %14.1f %14.1f %14.1f" % tuple([n] + times))
+
+
+"""measures how many items per second a full pass over an iterable yields
+@type makeIterable: function
+@param makeIterable: a function with no arguments returning a fresh iterable
+@type n: int
+@param n: the number of items in the iterable
+@rtype: float
+@returns: items per second, the best of 3 passes
+"""
+def itemsPerSecond(makeIterable, n):
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in makeIterable():
+            pass
+        best = min(best, time.perf_counter() - start)
+    return n / best
+
+
+"""compares the throughput of iterating an AVLTreeList against iterating a python list
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchIteration(sizes):
+    print("%10s %14s %14s %14s %14s" % ("n", "list (it/s)", "iter (it/s)", "reversed(it/s)", "iterRange(it/s)"))
+    for n in sizes:
+        values = list(range(n))
+        lst = AVLTreeList(values)
+        rates = [itemsPerSecond(lambda: values, n), itemsPerSecond(lambda: lst, n),
+                 itemsPerSecond(lambda: reversed(lst), n),
+                 itemsPerSecond(lambda: lst.iterRange(n // 4, n // 4 + n // 2), n // 2)]
+        print("%10d %14.3g %14.3g %14.3g %14.3g" % tuple([n] + rates))
+
+
+"""measures the memory overhead of snapshots: taking one, and the path copied by the first write that follows
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchSnapshot(sizes):
+    print("%10s %16s %16s %16s %16s" % ("n", "list (B/elem)", "snapshot (B)", "1st write (B)", "10 snapshots (B)"))
+    for n in sizes:
+        lst = AVLTreeList(range(n))
+        listBytes = measureBytes(lambda: AVLTreeList(range(n))) / n
+        views = []
+        snapshotBytes = measureBytes(lambda: views.append(lst.snapshot()))
+        writeBytes = measureBytes(lambda: lst.insert(n // 2, -1))
+        tenBytes = measureBytes(lambda: views.extend(lst.snapshot() for _ in range(10)))
+        print("%10d %16.1f %16d %16d %16d" % (n, listBytes, snapshotBytes, writeBytes, tenBytes))
+
+
+"""measures the throughput of a random operation
+@type op: function
+@param op: a function of one random float in [0, 1)
+@type count: int
+@param count: the number of calls
+@rtype: float
+@returns: operations per second
+"""
+def opsPerSecond(op, count):
+    rnd = random.Random(0)
+    points = [rnd.random() for _ in range(count)]
+    start = time.perf_counter()
+    for point in points:
+        op(point)
+    return count / (time.perf_counter() - start)
+
+
+"""compares the node-per-element list against chunked lists of a few chunk sizes: memory, random reads, random
+inserts and deletes, and iteration
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchChunked(sizes):
+    modes = [("node", lambda values: AVLTreeList(values))]
+    for chunkSize in (16, 64, 256):
+        modes.append(("chunk%d" % chunkSize, lambda values, b=chunkSize: ChunkedAVLTreeList(values, b)))
+    modes.append(("chunk64/q", lambda values: ChunkedAVLTreeList(values, 64, "q")))
+    print("%10s %10s %10s %12s %12s %12s %12s" % ("n", "mode", "B/elem", "retrieve/s", "insert/s", "delete/s",
+                                                   "iter it/s"))
+    for n in sizes:
+        for name, make in modes:
+            bytesPerElement = measureBytes(lambda: make(range(n))) / n
+            lst = make(range(n))
+            count = 20000
+            rates = [opsPerSecond(lambda p: lst.retrieve(int(p * n)), count),
+                     opsPerSecond(lambda p: lst.insert(int(p * lst.length()), 0), count),
+                     opsPerSecond(lambda p: lst.delete(int(p * lst.length())), count),
+                     itemsPerSecond(lambda: lst, n)]
+            print("%10d %10s %10.1f %12.3g %12.3g %12.3g %12.3g" % tuple([n, name, bytesPerElement] + rates))
+
+
+"""measures the pause of a full garbage collection while a list is alive
+@type make: function
+@param make: a function with no arguments building the list
+@rtype: float
+@returns: the pause in milliseconds, the best of 3 collections
+"""
+def gcPause(make):
+    lst = make()
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        gc.collect()
+        best = min(best, time.perf_counter() - start)
+    del lst
+    return best * 1e3
+
+
+"""compares the full garbage collection pause, the memory and the random reads of the node list against the
+struct-of-arrays list
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchArrays(sizes):
+    modes = [("node", lambda values: AVLTreeList(values)),
+             ("array", lambda values: ArrayAVLTreeList(values)),
+             ("array/q", lambda values: ArrayAVLTreeList(values, "q"))]
+    print("%10s %10s %12s %10s %12s" % ("n", "mode", "gc pause(ms)", "B/elem", "retrieve/s"))
+    for n in sizes:
+        for name, make in modes:
+            pause = gcPause(lambda: make(range(n)))
+            bytesPerElement = measureBytes(lambda: make(range(n))) / n
+            lst = make(range(n))
+            rate = opsPerSecond(lambda p: lst.retrieve(int(p * n)), 20000)
+            print("%10d %10s %12.2f %10.1f %12.3g" % (n, name, pause, bytesPerElement, rate))
+
+
+"""times a function once
+@type op: function
+@param op: a function with no arguments
+@rtype: float
+@returns: the time of op in milliseconds
+"""
+def timeOnce(op):
+    start = time.perf_counter()
+    op()
+    return (time.perf_counter() - start) * 1e3
+
+
+"""compares pickling against dump and load, eager and memory mapped, for lists of numbers
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchPersist(sizes):
+    print("%10s %12s %12s %12s %12s %14s %16s" % ("n", "pickle(ms)", "unpickle(ms)", "dump(ms)", "load(ms)",
+                                                  "mmap load(ms)", "1k retrieves(ms)"))
+    path = os.path.join(tempfile.mkdtemp(), "list.bin")
+    for n in sizes:
+        lst = AVLTreeList(range(n))
+        data = []
+        times = [timeOnce(lambda: data.append(pickle.dumps(lst))), timeOnce(lambda: pickle.loads(data[0])),
+                 timeOnce(lambda: lst.dump(path, "q")), timeOnce(lambda: AVLTreeList.load(path))]
+        loaded = []
+        times.append(timeOnce(lambda: loaded.append(AVLTreeList.load(path, mmap=True))))
+        rnd = random.Random(0)
+        times.append(timeOnce(lambda: [loaded[0].retrieve(rnd.randrange(n)) for _ in range(1000)]))
+        print("%10d %12.1f %12.1f %12.1f %12.1f %14.3f %16.1f" % tuple([n] + times))
+    os.remove(path)
+
+
+"""builds a batch of random operations on a list of n items, see AVLTreeList.applyBatch
+@type n: int
+@param n: the length of the list
+@type k: int
+@param k: the number of operations
+@type rnd: random.Random
+@param rnd: the source of randomness
+@rtype: list
+@returns: the operations
+"""
+def randomBatch(n, k, rnd):
+    ops = []
+    for _ in range(k):
+        choice = rnd.random()
+        if choice < 0.5 or n == 0:
+            ops.append(("insert", rnd.randrange(n + 1), 0))
+            n += 1
+        elif choice < 0.8:
+            ops.append(("delete", rnd.randrange(n)))
+            n -= 1
+        else:
+            ops.append(("set", rnd.randrange(n), 0))
+    return ops
+
+
+"""builds a batch of runs of operations at a few places of a list of n items: every run inserts values at one
+index, one after the other, or deletes the items from one index on, the batches applyBatch plans
+@type n: int
+@param n: the length of the list
+@type k: int
+@param k: the number of operations
+@type rnd: random.Random
+@param rnd: the source of randomness
+@rtype: list
+@returns: the operations
+"""
+def runBatch(n, k, rnd):
+    ops = []
+    while len(ops) < k:
+        run = min(k - len(ops), rnd.randrange(50, 500))
+        if rnd.random() < 0.6 or n < run:
+            i = rnd.randrange(n + 1)
+            ops.extend(("insert", i + j, 0) for j in range(run))
+            n += run
+        else:
+            ops.extend([("delete", rnd.randrange(n - run + 1))] * run)
+            n -= run
+    return ops
+
+
+"""applies a batch of operations one by one
+@type lst: AVLTreeList
+@type ops: list
+@rtype: int
+@returns: the number of rebalancing operation due to AVL rebalancing
+"""
+def applyOneByOne(lst, ops):
+    counter = 0
+    for op in ops:
+        if op[0] == "insert":
+            counter += lst.insert(op[1], op[2])
+        elif op[0] == "delete":
+            counter += lst.delete(op[1])
+        else:
+            counter += lst.delete(op[1]) + lst.insert(op[1], op[2])
+    return counter
+
+
+"""compares applyBatch against applying the same operations one by one, for a few batch sizes of scattered batches
+and of batches of runs: the time and the number of rebalancing operations
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchBatch(sizes):
+    rnd = random.Random(0)
+    print("%10s %10s %8s %16s %16s %16s %16s" % ("n", "batch", "k", "one by one(ms)", "applyBatch(ms)",
+                                                 "one by one(rebal)", "applyBatch(rebal)"))
+    for n in sizes:
+        for name, make in (("scattered", randomBatch), ("runs", runBatch)):
+            for k in (100, 1000, 10000):
+                ops = make(n, k, rnd)
+                times = [timeDestructive(lambda: [AVLTreeList(range(n)), ops], apply, 3) / 1e3
+                         for apply in (applyOneByOne, AVLTreeList.applyBatch)]
+                counts = [apply(AVLTreeList(range(n)), ops) for apply in (applyOneByOne, AVLTreeList.applyBatch)]
+                print("%10d %10s %8d %16.1f %16.1f %16d %16d" % tuple([n, name, k] + times + counts))
+
+
+"""wraps a list so that every call runs under one global lock, the baseline of the threads benchmark"""
+
+
+class GloballyLockedList(object):
+    def __init__(self, lst):
+        self.lst = lst
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        method = getattr(self.lst, name)
+
+        def locked(*args):
+            with self.lock:
+                return method(*args)
+        return locked
+
+
+"""runs a mixed load of random reads and writes on a shared list from a pool of threads
+@type shared: object
+@param shared: the shared list, with the methods retrieve, insert and delete
+@type threads: int
+@param threads: the number of threads
+@type n: int
+@param n: the length of the list
+@type opsPerThread: int
+@param opsPerThread: the number of operations of every thread, one in 20 is a write
+@rtype: float
+@returns: the reads per second over all the threads
+"""
+def mixedLoad(shared, threads, n, opsPerThread):
+    def work(seed):
+        rnd = random.Random(seed)
+        reads = 0
+        for k in range(opsPerThread):
+            if k % 20 == 0:
+                i = rnd.randrange(n)
+                shared.insert(i, 0)
+                shared.delete(i)
+            else:
+                shared.retrieve(rnd.randrange(n))
+                reads += 1
+        return reads
+    with ThreadPoolExecutor(threads) as pool:
+        start = time.perf_counter()
+        reads = sum(pool.map(work, range(threads)))
+        return reads / (time.perf_counter() - start)
+
+
+"""compares the read throughput of a list shared by 1 to N threads under one global lock and under the read/write
+lock of ConcurrentAVLTreeList, with one write for every 19 reads
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchThreads(sizes):
+    print("%10s %8s %18s %18s" % ("n", "threads", "global lock(r/s)", "rw lock(r/s)"))
+    for n in sizes:
+        for threads in (1, 2, 4, 8):
+            rates = [mixedLoad(wrap(AVLTreeList(range(n))), threads, n, 20000 // threads)
+                     for wrap in (GloballyLockedList, ConcurrentAVLTreeList)]
+            print("%10d %8d %18.3g %18.3g" % tuple([n, threads] + rates))
+
+
+"""compares reversing and mapping random ranges of a tagged list against rebuilding the range with listToArray
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchRanges(sizes):
+    print("%10s %16s %16s %16s" % ("n", "rebuild (ops/s)", "reverse (ops/s)", "affine (ops/s)"))
+    for n in sizes:
+        plain = AVLTreeList(range(n))
+        tagged = TaggedAVLTreeList(range(n))
+
+        def rebuild(p):
+            i = int(p * n) // 2
+            j = i + n // 2
+            values = plain.listToArray()[i:j]
+            plain.deleteRange(i, j)
+            plain.insertMany(i, reversed(values))
+        rates = [opsPerSecond(rebuild, 20),
+                 opsPerSecond(lambda p: tagged.reverseRange(int(p * n) // 2, int(p * n) // 2 + n // 2), 2000),
+                 opsPerSecond(lambda p: tagged.mapRange(int(p * n) // 2, int(p * n) // 2 + n // 2, AffineMap(1, 1)),
+                              2000)]
+        print("%10d %16.3g %16.3g %16.3g" % tuple([n] + rates))
+
+
+"""measures the ends of a list used as a deque: append and pop pairs at the back and at the front, through the
+cached end nodes and through a descent from the root to the end node as before, and first and last reads
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchDeque(sizes):
+    print("%10s %14s %14s %14s %14s %12s" % ("n", "back (pairs/s)", "front (pairs/s)", "back walk", "front walk",
+                                            "first/s"))
+    for n in sizes:
+        lst = AVLTreeList(range(n))
+
+        def backWalk(p):
+            lst.insertAfterNode(lst.getMax(lst.root), 0)
+            lst.deleteNode(lst.getMax(lst.root))
+
+        def frontWalk(p):
+            lst.insertBeforeNode(lst.getMin(lst.root), 0)
+            lst.deleteNode(lst.getMin(lst.root))
+        rates = [opsPerSecond(lambda p: (lst.append(0), lst.pop()), 20000),
+                 opsPerSecond(lambda p: (lst.appendleft(0), lst.popleft()), 20000),
+                 opsPerSecond(backWalk, 20000),
+                 opsPerSecond(frontWalk, 20000),
+                 opsPerSecond(lambda p: lst.first(), 20000)]
+        print("%10d %14.3g %14.3g %14.3g %14.3g %12.3g" % tuple([n] + rates))
+
+
+"""compares reading and writing k random positions one by one against retrieveMany and setMany, which share the
+walks from the root
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchMany(sizes):
+    print("%10s %10s %14s %14s %14s %14s" % ("n", "k", "retrieve (ms)", "retrieveMany", "set (ms)", "setMany"))
+    for n in sizes:
+        lst = AVLTreeList(range(n))
+        rnd = random.Random(n)
+        for k in sorted({100, n // 10, n}):
+            indices = [rnd.randrange(n) for _ in range(k)]
+
+            def setOneByOne():
+                for i in indices:
+                    lst.setNodeValue(lst.retrieveNode(i), i)
+            times = [timeOnce(lambda: [lst.retrieve(i) for i in indices]),
+                     timeOnce(lambda: lst.retrieveMany(indices)),
+                     timeOnce(setOneByOne),
+                     timeOnce(lambda: lst.setMany(indices, indices))]
+            print("%10d %10d %14.3g %14.3g %14.3g %14.3g" % tuple([n, k] + times))
+
+
+"""A node that counts the steps of the walks up the tree and the sizes recomputed, for benchUpdates"""
+
+
+class ClimbCountingNode(AVLNode):
+    __slots__ = ()
+    counts = {"climb": 0, "updateSize": 0}
+
+    def getParent(self):
+        ClimbCountingNode.counts["climb"] += 1
+        return self.parent
+
+    def updateSize(self):
+        ClimbCountingNode.counts["updateSize"] += 1
+        AVLNode.updateSize(self)
+
+
+"""compares random inserts and deletes by index against the way they were done before: a descent, then a climb
+fixing every ancestor up to the root (FixTree) and a recursive deleteNode. Reports the steps up the tree and the
+sizes recomputed per operation, and operations per second
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchUpdates(sizes):
+    print("%10s %10s %12s %14s %12s" % ("n", "path", "climb/op", "updateSize/op", "ops/s"))
+    for n in sizes:
+        for path in ("climb", "descent"):
+            for nodeClass in (ClimbCountingNode, AVLNode):
+                lst = AVLTreeList()
+                lst.nodeClass = nodeClass
+                rnd = random.Random(n)
+                for k in range(n):  # a tree built at once is perfect, where a new leaf grows all of its ancestors
+                    lst.insert(rnd.randint(0, k), k)
+                if path == "climb":
+                    lst.fixHeights = lst.FixTree  # the sizes are then recomputed all the way up, as before
+                    insert = lambda i: lst.insertBeforeNode(lst.retrieveNode(i), 0)
+                    delete = lambda i: lst.deleteNode(lst.retrieveNode(i))
+                else:
+                    insert = lambda i: lst.insert(i, 0)
+                    delete = lst.delete
+                ClimbCountingNode.counts.update(climb=0, updateSize=0)
+                rate = opsPerSecond(lambda p: (insert(int(p * (n - 2)) + 1), delete(int((1 - p) * (n - 2)) + 1)),
+                                    20000)
+                if nodeClass is ClimbCountingNode:
+                    counts = dict(ClimbCountingNode.counts)
+            print("%10d %10s %12.3g %14.3g %12.3g" % (n, path, counts["climb"] / 40000,
+                                                      counts["updateSize"] / 40000, 2 * rate))
+
+
+"""a CPU-heavy function of a number, the per-item work of benchParallel
+@type x: int
+@param x: a number
+@rtype: int
+@returns: a hash of x
+"""
+def heavy(x):
+    for _ in range(200):
+        x = (x * 1103515245 + 12345) % 2147483648
+    return x
+
+
+"""measures parallelMap and parallelReduce against the number of workers, as a speedup over a single worker which
+maps the list in this process. The speedup is bounded by the number of CPUs, reported in the header
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchParallel(sizes):
+    cpus = os.cpu_count() or 1
+    print("%d CPUs" % cpus)
+    print("%10s %8s %12s %10s %12s %10s" % ("n", "workers", "map (ms)", "speedup", "reduce (ms)", "speedup"))
+    for n in sizes:
+        lst = AVLTreeList(range(n))
+        base = None
+        for workers in sorted({1, 2, 4, cpus}):
+            times = [timeOnce(lambda: lst.parallelMap(heavy, workers, 'q')),
+                     timeOnce(lambda: lst.parallelReduce(max, 0, workers, 'q'))]
+            base = base or times
+            print("%10d %8d %12.4g %10.2f %12.4g %10.2f" % (n, workers, times[0], base[0] / times[0], times[1],
+                                                             base[1] / times[1]))
+
+
+"""makes the operations of a workload of benchJournal, as ("insert", i, val) and ("delete", i) tuples
+@type kind: str
+@param kind: "appends" adds items at the end, "typing" inserts runs of items at a cursor and erases some of them,
+"random" inserts and deletes anywhere
+@type n: int
+@param n: the length of the list the workload starts from
+@type k: int
+@param k: the number of operations
+@rtype: list
+@returns: the operations, in order
+"""
+def journalWorkload(kind, n, k):
+    rnd = random.Random(k)
+    ops = []
+    size = n
+    cursor = 0
+    while len(ops) < k:
+        if kind == "appends":
+            ops.append(("insert", size, len(ops)))
+            size += 1
+        elif kind == "typing":
+            cursor = rnd.randint(0, size)
+            for _ in range(rnd.randint(1, 20)):
+                ops.append(("insert", cursor, len(ops)))
+                cursor += 1
+                size += 1
+            for _ in range(rnd.randint(0, 5)):
+                cursor -= 1
+                ops.append(("delete", cursor))
+                size -= 1
+        elif rnd.random() < 0.6 or size == 0:
+            ops.append(("insert", rnd.randint(0, size), len(ops)))
+            size += 1
+        else:
+            ops.append(("delete", rnd.randrange(size)))
+            size -= 1
+    return ops[:k]
+
+
+"""measures the journal: a workload run on a list without and with a journal, and the replay of the journal
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchJournal(sizes):
+    k = 100000
+    print("%10s %8s %12s %14s %12s %10s" % ("n", "workload", "plain (ms)", "journaled (ms)", "replay (ms)",
+                                            "file (KB)"))
+    path = os.path.join(tempfile.mkdtemp(), "journal")
+    for n in sizes:
+        for kind in ("appends", "typing", "random"):
+            ops = journalWorkload(kind, n, k)
+
+            def run(lst):
+                for op in ops:
+                    if op[0] == "insert":
+                        lst.insert(op[1], op[2])
+                    else:
+                        lst.delete(op[1])
+            plain = AVLTreeList(range(n))
+            journaled = AVLTreeList(range(n))
+            journaled.enableJournal(path)
+            times = [timeOnce(lambda: run(plain)), timeOnce(lambda: run(journaled))]
+            journaled.disableJournal()
+            times.append(timeOnce(lambda: AVLTreeList.replay(path)))
+            print("%10d %8s %12.4g %14.4g %12.4g %10d" % tuple([n, kind] + times + [os.path.getsize(path) // 1024]))
+    os.remove(path)
+
+
+"""makes the operations of a workload of benchBalance, as ("retrieve", i), ("insert", i) and ("delete", i) tuples.
+The inserts and deletes alternate, so the length of the list stays about n
+@type n: int
+@param n: the length of the list the workload starts from
+@type k: int
+@param k: the number of operations
+@type reads: float
+@param reads: the share of the operations that are reads
+@rtype: list
+@returns: the operations, in order
+"""
+def balanceWorkload(n, k, reads):
+    rnd = random.Random(n)
+    ops = []
+    size = n
+    for _ in range(k):
+        if rnd.random() < reads:
+            ops.append(("retrieve", rnd.randrange(size)))
+        elif size <= n:
+            ops.append(("insert", rnd.randint(0, size)))
+            size += 1
+        else:
+            ops.append(("delete", rnd.randrange(size)))
+            size -= 1
+    return ops
+
+
+"""compares the balancing policies on a read-heavy mix (90% reads) and a write-heavy mix (10% reads) of random
+operations, on lists grown by random inserts. Reports the rotations per operation, the mean depth of the items
+after the mix (the cost of a read) and operations per second
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchBalance(sizes):
+    k = 50000
+    print("%10s %12s %8s %12s %10s %12s" % ("n", "mix", "balance", "rotations/op", "depth", "ops/s"))
+    for n in sizes:
+        for mix, reads in (("read-heavy", 0.9), ("write-heavy", 0.1)):
+            ops = balanceWorkload(n, k, reads)
+            for balance in AVLTreeList.BALANCES:
+                lists = []
+                for _ in range(2):  # one to count the rotations, one to time
+                    lst = AVLTreeList(None, None, balance)
+                    rnd = random.Random(n)
+                    for i in range(n):
+                        lst.insert(rnd.randint(0, i), i)
+                    lists.append(lst)
+                counted, timed = lists
+                rotations = [0]
+
+                def counting(rotate):
+                    def countedRotate(node):
+                        rotations[0] += 1
+                        rotate(node)
+                    return countedRotate
+                counted.rotateLeft = counting(counted.rotateLeft)
+                counted.rotateRight = counting(counted.rotateRight)
+
+                def run(lst):
+                    for op in ops:
+                        if op[0] == "retrieve":
+                            lst.retrieve(op[1])
+                        elif op[0] == "insert":
+                            lst.insert(op[1], 0)
+                        else:
+                            lst.delete(op[1])
+                run(counted)
+                depth = sum(counted.depth(node) for node in counted.iterNodes(counted.root)) / counted.length()
+                rate = k / (timeOnce(lambda: run(timed)) / 1000)
+                print("%10d %12s %8s %12.3g %10.3g %12.3g" % (n, mix, balance, rotations[0] / k, depth, rate))
+
+
+"""compares assembling a list from k fragments of random lengths by a loop of concat against concatAll and
+concatStream, which joins the fragments as a generator yields them
+@type sizes: list
+@param sizes: the total lengths to measure
+"""
+def benchConcatAll(sizes):
+    print("%10s %8s %14s %16s %18s" % ("n", "k", "concat (ms)", "concatAll (ms)", "concatStream (ms)"))
+    for n in sizes:
+        for k in sorted({10, 100, 1000, n // 10}):
+            if k > n:
+                continue
+            rnd = random.Random(k)
+            cuts = sorted(rnd.randrange(n + 1) for _ in range(k - 1))
+            lengths = [b - a for a, b in zip([0] + cuts, cuts + [n])]
+
+            def setup():
+                return [AVLTreeList(), [AVLTreeList(range(length)) for length in lengths]]
+
+            def loop(lst, fragments):
+                for fragment in fragments:
+                    lst.concat(fragment)
+            times = [timeDestructive(setup, loop, 3) / 1000,
+                     timeDestructive(setup, AVLTreeList.concatAll, 3) / 1000,
+                     timeDestructive(setup, lambda lst, fragments: lst.concatStream(iter(fragments)), 3) / 1000]
+            print("%10d %8d %14.4g %16.4g %18.4g" % tuple([n, k] + times))
+
+
+"""measures the cost of the stats of a list: random reads and inserts on a list that never had them, on a list
+whose stats were turned off and on a list whose stats are on
+@type sizes: list
+@param sizes: the list sizes to measure
+"""
+def benchStats(sizes):
+    print("%10s %10s %12s %12s" % ("n", "stats", "retrieve/s", "insert/s"))
+    for n in sizes:
+        for mode in ("never", "off", "on"):
+            lst = AVLTreeList(range(n))
+            if mode != "never":
+                lst.enableStats()
+            if mode == "off":
+                lst.disableStats()
+            rates = [opsPerSecond(lambda p: lst.retrieve(int(p * n)), 20000),
+                     opsPerSecond(lambda p: lst.insert(int(p * lst.length()), 0), 20000)]
+            print("%10d %10s %12.3g %12.3g" % tuple([n, mode] + rates))
+
+
+"""A pure-python chunked list, the baseline of the suite for blist and sortedcontainers style lists: the items are
+kept in python lists of up to 2 * LOAD items, found through the running totals of the block lengths, which are
+rebuilt after every change of the blocks.
+"""
+
+
+class BlockList(object):
+    LOAD = 1000
+
+    def __init__(self, iterable=()):
+        values = list(iterable)
+        self.blocks = [values[k:k + self.LOAD] for k in range(0, len(values), self.LOAD)]
+        self.ends = None  # the running totals of the block lengths, None after a change
+
+    def locate(self, i):
+        if self.ends is None:
+            self.ends = list(accumulate(len(block) for block in self.blocks))
+        k = bisect_right(self.ends, i)
+        return [k, i - (self.ends[k - 1] if k else 0)]
+
+    def __len__(self):
+        return sum(len(block) for block in self.blocks)
+
+    def retrieve(self, i):
+        k, offset = self.locate(i)
+        return self.blocks[k][offset]
+
+    def insert(self, i, val):
+        if not self.blocks:
+            self.blocks.append([val])
+        elif i == len(self):
+            self.blocks[-1].append(val)
+        else:
+            k, offset = self.locate(i)
+            self.blocks[k].insert(offset, val)
+            if len(self.blocks[k]) > 2 * self.LOAD:
+                block = self.blocks[k]
+                self.blocks[k:k + 1] = [block[:self.LOAD], block[self.LOAD:]]
+        self.ends = None
+
+    def delete(self, i):
+        k, offset = self.locate(i)
+        del self.blocks[k][offset]
+        if not self.blocks[k]:
+            del self.blocks[k]
+        self.ends = None
+
+    def split(self, i):
+        k, offset = self.locate(i)
+        left, right = BlockList(), BlockList()
+        left.blocks = self.blocks[:k] + ([self.blocks[k][:offset]] if offset else [])
+        right.blocks = ([self.blocks[k][offset + 1:]] if offset + 1 < len(self.blocks[k]) else []) + self.blocks[k + 1:]
+        return [left, self.blocks[k][offset], right]
+
+    def concat(self, lst):
+        self.blocks.extend(lst.blocks)
+        self.ends = None
+
+    def listToArray(self):
+        return [val for block in self.blocks for val in block]
+
+    def search(self, val):
+        start = 0
+        for block in self.blocks:
+            if val in block:
+                return start + block.index(val)
+            start += len(block)
+        return -1
+
+    def first(self):
+        return self.blocks[0][0] if self.blocks else None
+
+    def last(self):
+        return self.blocks[-1][-1] if self.blocks else None
+
+
+"""A python list behind the interface of AVLTreeList, the plain baseline of the suite"""
+
+
+class PlainList(list):
+    def retrieve(self, i):
+        return self[i]
+
+    def delete(self, i):
+        del self[i]
+
+    def split(self, i):
+        return [PlainList(self[:i]), self[i], PlainList(self[i + 1:])]
+
+    def concat(self, lst):
+        self.extend(lst)
+
+    def listToArray(self):
+        return list(self)
+
+    def search(self, val):
+        return self.index(val) if val in self else -1
+
+    def first(self):
+        return self[0] if self else None
+
+    def last(self):
+        return self[-1] if self else None
+
+
+SUITE_STRUCTURES = {
+    "AVLTreeList": AVLTreeList,
+    "ChunkedAVLTreeList": ChunkedAVLTreeList,
+    "list": PlainList,
+    "BlockList": BlockList,
+}
+TRACKED_STRUCTURES = ("AVLTreeList", "ChunkedAVLTreeList")  # the structures the regression check fails on
+SUITE_REPEATS = 5  # the runs of the suite per size, every operation keeps its fastest run
+
+
+"""times an operation, repeating it until the repetitions take long enough to measure
+@type op: function
+@param op: a function of the repetition's number
+@type restore: function
+@param restore: a function of the repetition's number, called untimed after op to undo it (optional)
+@type budget: float
+@param budget: the time in seconds to spend timing op
+@type setup: function
+@param setup: a function of the repetition's number, called untimed before op (optional)
+@rtype: float
+@returns: the mean time of op in nanoseconds
+"""
+def nanosPerOp(op, restore=None, budget=0.05, setup=None):
+    total = 0
+    count = 0
+    deadline = time.perf_counter() + budget
+    while count < 3 or (time.perf_counter() < deadline and count < 100000):
+        if setup is not None:
+            setup(count)
+        start = time.perf_counter_ns()
+        op(count)
+        total += time.perf_counter_ns() - start
+        if restore is not None:
+            restore(count)
+        count += 1
+    return total / count
+
+
+"""times the operations of the suite on one structure
+@type make: function
+@param make: the class of the structure, called with an iterable of values
+@type n: int
+@param n: the size of the structure
+@rtype: dict
+@returns: the mean time in nanoseconds of every operation, keyed by name
+"""
+def suiteTimes(make, n):
+    rnd = random.Random(n)
+    positions = [rnd.random() for _ in range(1024)]
+    lst = make(range(n))
+    where = {"random": lambda k: int(positions[k % 1024] * n), "front": lambda k: 0, "back": lambda k: n - 1}
+    times = {}
+    for name, at in sorted(where.items()):
+        times["retrieve_" + name] = nanosPerOp(lambda k: lst.retrieve(at(k)))
+        times["insert_" + name] = nanosPerOp(lambda k: lst.insert(at(k), -1), lambda k: lst.delete(at(k)))
+        times["delete_" + name] = nanosPerOp(lambda k: lst.delete(at(k)), lambda k: lst.insert(at(k), -1))
+    current = [lst]  # split and concat replace the structure by the one they rebuild
+    parts = []
+
+    def split(k):
+        parts[:] = current[0].split(where["random"](k))
+
+    def rejoin(k):
+        left, val, right = parts
+        left.insert(len(left), val)
+        left.concat(right)
+        current[0] = left
+
+    def cut(k):
+        left, val, right = current[0].split(where["random"](k))
+        left.insert(len(left), val)
+        parts[:] = [left, right]
+
+    def concat(k):
+        parts[0].concat(parts[1])
+        current[0] = parts[0]
+    times["split"] = nanosPerOp(split, rejoin)
+    times["concat"] = nanosPerOp(concat, setup=cut)
+    lst = current[0]
+    times["listToArray"] = nanosPerOp(lambda k: lst.listToArray())
+    times["search"] = nanosPerOp(lambda k: lst.search(-2))  # a missing value scans the whole list
+    times["first"] = nanosPerOp(lambda k: lst.first())
+    times["last"] = nanosPerOp(lambda k: lst.last())
+    return times
+
+
+"""compares the results of the suite against saved ones
+@type results: list
+@param results: the results of the suite, see benchSuite
+@type baseline: list
+@param baseline: saved results of the suite
+@type threshold: float
+@param threshold: the tolerated slowdown, 0.25 tolerates operations 25% slower than in the baseline
+@rtype: list
+@returns: the results of the tracked structures that slowed down by more than the threshold, each a tuple
+(structure, n, operation, baseline time, time)
+"""
+def regressions(results, baseline, threshold):
+    saved = dict(((r["structure"], r["n"], r["operation"]), r["ns"]) for r in baseline)
+    slower = []
+    for r in results:
+        key = (r["structure"], r["n"], r["operation"])
+        if r["structure"] in TRACKED_STRUCTURES and key in saved and r["ns"] > saved[key] * (1 + threshold):
+            slower.append(key + (saved[key], r["ns"]))
+    return slower
+
+
+"""times insert, delete and retrieve at random, front and back positions, split, concat, listToArray, search, first
+and last on the lists of the module and on the baselines, prints a summary table and optionally saves the results
+as JSON and checks them against a saved baseline. Every size is timed repeats times, the structures taking turns so
+that a slow spell of the machine hits them all alike, and every operation keeps the fastest of its times: a single
+run of a 50 ms budget is noisy enough to report a spurious regression
+@type sizes: list
+@param sizes: the list sizes to measure
+@type jsonPath: str
+@param jsonPath: the path to save the results to (optional)
+@type baselinePath: str
+@param baselinePath: the path of saved results to check against (optional)
+@type threshold: float
+@param threshold: the tolerated slowdown against the baseline
+@type repeats: int
+@param repeats: the number of runs per size
+@rtype: int
+@returns: the exit status, 1 if an operation of a tracked structure regressed
+"""
+def benchSuite(sizes, jsonPath=None, baselinePath=None, threshold=0.25, repeats=SUITE_REPEATS):
+    results = []
+    for n in sizes:
+        columns = sorted(SUITE_STRUCTURES)
+        table = {}
+        for _ in range(repeats):
+            for name in columns:
+                times = suiteTimes(SUITE_STRUCTURES[name], n)
+                best = table.setdefault(name, times)
+                for operation, ns in times.items():
+                    best[operation] = min(best[operation], ns)
+        print("n = %d, ns per operation" % n)
+        print("%16s" % "operation" + "".join("%20s" % name for name in columns))
+        for operation in sorted(table[columns[0]]):
+            print("%16s" % operation + "".join("%20.0f" % table[name][operation] for name in columns))
+            for name in columns:
+                results.append({"structure": name, "n": n, "operation": operation, "ns": table[name][operation]})
+    if jsonPath is not None:
+        with open(jsonPath, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "repeats": repeats,
+                       "results": results}, f, indent=1)
+    if baselinePath is None:
+        return 0
+    with open(baselinePath) as f:
+        slower = regressions(results, json.load(f)["results"], threshold)
+    for structure, n, operation, before, after in slower:
+        print("REGRESSION %s n=%d %s: %.0f ns -> %.0f ns (+%.0f%%)" % (structure, n, operation, before, after,
+                                                                   100 * (after / before - 1)))
+    return 1 if slower else 0
+
+
+BENCHMARKS = {
+    "memory": benchMemory,
+    "splitconcat": benchSplitConcat,
+    "iteration": benchIteration,
+    "snapshot": benchSnapshot,
+    "chunked": benchChunked,
+    "arrays": benchArrays,
+    "persist": benchPersist,
+    "batch": benchBatch,
+    "threads": benchThreads,
+    "ranges": benchRanges,
+    "stats": benchStats,
+    "deque": benchDeque,
+    "many": benchMany,
+    "updates": benchUpdates,
+    "parallel": benchParallel,
+    "journal": benchJournal,
+    "balance": benchBalance,
+    "concatall": benchConcatAll,
+    "suite": benchSuite,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for AVLTreeList.")
+    parser.add_argument("name", choices=sorted(BENCHMARKS))
+    parser.add_argument("sizes", nargs="*", type=lambda n: int(float(n)))
+    parser.add_argument("--json", help="suite only: save the results to this path")
+    parser.add_argument("--baseline", help="suite only: fail if a tracked operation is slower than in these results")
+    parser.add_argument("--threshold", type=float, default=0.25, help="suite only: the tolerated slowdown")
+    parser.add_argument("--repeats", type=int, default=SUITE_REPEATS,
+                        help="suite only: the runs per size, every operation keeps its fastest")
+    args = parser.parse_args()
+    sizes = args.sizes or [10 ** 3, 10 ** 4, 10 ** 5]
+    if args.name == "suite":
+        sys.exit(benchSuite(sizes, args.json, args.baseline, args.threshold, args.repeats))
+    BENCHMARKS[args.name](sizes)
@@ -0,0 +1,32 @@
+import operator
+
+import pytest
+
+from AVLTreeList import ArrayAVLTreeList, Augmentation, AVLTreeList, ChunkedAVLTreeList, TaggedAVLTreeList
+
+AUGMENTATION = Augmentation(operator.add, 0)  # one instance, so the augmented lists of a test can be joined
+MAKERS = {
+    'avl': AVLTreeList,
+    'wavl': lambda values: AVLTreeList(values, balance="wavl"),
+    'treap': lambda values: AVLTreeList(values, balance="treap"),
+    'augmented': lambda values: AVLTreeList(values, AUGMENTATION),
+    'chunked': lambda values: ChunkedAVLTreeList(values, chunkSize=4),
+    'tagged': TaggedAVLTreeList,
+    'array': ArrayAVLTreeList,
+}
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'without(*kinds): run a test on every kind of list but the given ones')
+
+
+def pytest_generate_tests(metafunc):
+    if 'kind' in metafunc.fixturenames:  # a test taking kind runs once per kind of list
+        marker = metafunc.definition.get_closest_marker('without')
+        excluded = marker.args if marker is not None else ()
+        metafunc.parametrize('kind', [kind for kind in sorted(MAKERS) if kind not in excluded])
+
+
+@pytest.fixture
+def make(kind):
+    return MAKERS[kind]
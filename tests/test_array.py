@@ -0,0 +1,196 @@
+import operator
+import pickle
+import random
+
+import pytest
+
+from AVLTreeList import ArrayAVLTreeList, Augmentation, AVLTreeList
+
+
+@pytest.mark.parametrize('typecode', [None, 'q'])
+def test_list_api_matches_python_list(typecode):
+    rnd = random.Random(0)
+    lst = ArrayAVLTreeList(range(50), typecode)
+    expected = list(range(50))
+    for step in range(3000):
+        n = len(expected)
+        op = rnd.randrange(9)
+        if op == 0:
+            i = rnd.randint(0, n)
+            values = list(range(rnd.randrange(6)))
+            lst.insertMany(i, values)
+            expected[i:i] = values
+        elif op == 1:
+            i = rnd.randint(0, n)
+            j = rnd.randint(i, n)
+            lst.deleteRange(i, j)
+            del expected[i:j]
+        elif op == 2:
+            lst.append(step)
+            expected.append(step)
+        elif op == 3:
+            lst.appendleft(step)
+            expected.insert(0, step)
+        elif op == 4 and n:
+            assert lst.pop() == expected.pop()
+        elif op == 5 and n:
+            assert lst.popleft() == expected.pop(0)
+        elif op == 6:
+            key = slice(rnd.randint(-n - 2, n + 2), rnd.randint(-n - 2, n + 2), rnd.choice([1, 1, 2, -1, -3]))
+            assert lst[key].listToArray() == expected[key]
+            del lst[key]
+            del expected[key]
+        elif op == 7 and n:
+            i = rnd.randrange(-n, n)
+            assert lst[i] == expected[i]
+            del lst[i]
+            del expected[i]
+        else:
+            i = rnd.randint(0, n)
+            j = rnd.randint(i, n)
+            assert list(lst.iterRange(i, j)) == expected[i:j]
+        assert lst.listToArray() == expected
+    assert len(lst.left) < 1500  # deleted handles are reused by later builds
+
+
+def test_unsupported_features_raise_type_error():
+    lst = ArrayAVLTreeList(range(5))
+    with pytest.raises(TypeError):
+        lst.cursor()
+    with pytest.raises(TypeError):
+        lst.snapshot()
+    with pytest.raises(IndexError):
+        ArrayAVLTreeList().pop()
+
+
+@pytest.mark.parametrize('places', [0, ArrayAVLTreeList.BATCH_PLACES])
+@pytest.mark.parametrize('typecode', [None, 'q'])
+def test_avl_tree_list_features(typecode, places, tmp_path, monkeypatch):
+    monkeypatch.setattr(ArrayAVLTreeList, 'BATCH_PLACES', places)  # 0 plans every batch
+    rnd = random.Random(1)
+    path = str(tmp_path / 'array.journal')
+    lst = ArrayAVLTreeList(range(100), typecode, Augmentation(operator.add, 0))
+    lst.enableIndex(True)
+    lst.enableJournal(path)
+    lst.enableStats()
+    expected = list(range(100))
+    for step in range(200):
+        ops = []
+        for _ in range(rnd.randrange(1, 20)):
+            if rnd.randrange(3) == 0 or not expected:
+                i = rnd.randint(0, len(expected))
+                ops.append(("insert", i, step))
+                expected.insert(i, step)
+            elif rnd.randrange(2):
+                i = rnd.randrange(len(expected))
+                ops.append(("delete", i))
+                del expected[i]
+            else:
+                i = rnd.randrange(len(expected))
+                ops.append(("set", i, -step))
+                expected[i] = -step
+        lst.applyBatch(ops)
+        n = len(expected)
+        indices = [rnd.randrange(-n, n) for _ in range(5)]
+        assert lst.retrieveMany(indices) == [expected[i] for i in indices]
+        lst.setMany(indices, [step] * 5)
+        for i in indices:
+            expected[i] = step
+        i = rnd.randint(0, n)
+        j = rnd.randint(i, n)
+        assert lst.rangeQuery(i, j) == sum(expected[i:j])
+        assert lst.indexOfAll(step) == [k for k, val in enumerate(expected) if val == step]
+        assert list(reversed(lst)) == expected[::-1]
+    assert lst.getStats()['calls']['applyBatch'] == 200
+    lst.disableJournal()
+    assert ArrayAVLTreeList.replay(path, ArrayAVLTreeList(None, typecode)).listToArray() == expected
+    copy = pickle.loads(pickle.dumps(lst))
+    assert copy.getStats() is None and copy.indexOfAll(step) == lst.indexOfAll(step)
+    assert copy.rangeQuery(0, len(expected)) == sum(expected)
+
+
+@pytest.mark.parametrize('typecode', [None, 'q'])
+def test_array_list_matches_python_list(typecode):
+    rnd = random.Random(0)
+    lst = ArrayAVLTreeList(range(50), typecode)
+    expected = list(range(50))
+    for step in range(3000):
+        n = len(expected)
+        op = rnd.randrange(4)
+        if op == 0 or n == 0:
+            i = rnd.randint(0, n)
+            lst.insert(i, step)
+            expected.insert(i, step)
+        elif op == 1:
+            i = rnd.randrange(n)
+            lst.delete(i)
+            del expected[i]
+        elif op == 2:
+            i = rnd.randrange(n)
+            assert lst[i] == lst.retrieve(i) == expected[i]
+        else:
+            i = rnd.randrange(n)
+            left, val, right = lst.split(i)
+            left.insert(left.length(), val)
+            left.concat(right)
+            lst = left
+        assert lst.listToArray() == expected
+    assert list(lst) == expected and len(lst) == len(expected)
+    assert (lst.first(), lst.last()) == (expected[0], expected[-1])
+    assert len(lst.left) < 1500  # deleted handles are reused by later inserts
+    assert lst.search(expected[7]) == expected.index(expected[7])
+    assert pickle.loads(pickle.dumps(lst)).listToArray() == expected
+
+
+@pytest.mark.parametrize('typecode', [None, 'q'])
+def test_results_of_reads_have_columns_of_their_own(typecode):
+    lst = ArrayAVLTreeList(range(1000), typecode, Augmentation(operator.add, 0))
+    state = pickle.dumps(lst)
+    for _ in range(20):
+        part = lst[100:900]
+        mapped = lst.parallelMap(operator.neg, 1)
+        assert part.left is not lst.left and mapped.left is not lst.left
+        assert part.rangeQuery(0, 800) == sum(range(100, 900)) and mapped.retrieve(5) == -5
+    assert len(lst.left) == 1001 and len(pickle.dumps(lst)) == len(state)
+    left, val, right = lst.split(500)
+    assert left.left is right.left is lst.left
+    copy = pickle.loads(pickle.dumps(left))  # only the nodes of left are dumped
+    assert len(copy.left) == 501 and copy.listToArray() == list(range(500))
+    left.append(val)
+    left.concat(right)
+    assert left.listToArray() == list(range(1000)) and len(left.left) == 1001
+
+
+def test_shared_tree_code_keeps_the_columns_balanced():
+    rnd = random.Random(0)
+    lst = ArrayAVLTreeList(range(50))
+    expected = list(range(50))
+    for step in range(2000):
+        n = len(expected)
+        op = rnd.randrange(3)
+        if op == 0 or n == 0:
+            i = rnd.randint(0, n)
+            lst.insert(i, step)
+            expected.insert(i, step)
+        elif op == 1:
+            i = rnd.randrange(n)
+            lst.delete(i)
+            del expected[i]
+        else:
+            left, val, right = lst.split(rnd.randrange(n))
+            left.append(val)
+            left.concat(right)
+            lst = left
+        for handle in lst.iterNodes(lst.root):
+            left, right = lst.left[handle], lst.right[handle]
+            assert abs(lst.height[left] - lst.height[right]) <= 1
+            assert lst.height[handle] == max(lst.height[left], lst.height[right]) + 1
+            assert lst.size[handle] == lst.size[left] + lst.size[right] + 1
+            assert all(lst.parent[child] == handle for child in (left, right) if child)
+        assert lst.parent[lst.root] == 0 and lst.height[0] == -1 and lst.size[0] == 0
+        assert lst.listToArray() == expected
+    copy = pickle.loads(pickle.dumps(lst))  # the loaded list binds the tree code to its own columns
+    copy.insert(7, 'x')
+    expected.insert(7, 'x')
+    assert copy.listToArray() == expected
+    assert ArrayAVLTreeList.FixTree is AVLTreeList.FixTree and ArrayAVLTreeList.join is AVLTreeList.join
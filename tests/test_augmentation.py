@@ -0,0 +1,55 @@
+import operator
+import random
+
+import pytest
+
+from AVLTreeList import Augmentation, AVLTreeList
+
+AUGMENTATIONS = {
+    'sum': (Augmentation(operator.add, 0), sum),
+    'max': (Augmentation(max, float('-inf'), abs), lambda values: max(map(abs, values), default=float('-inf'))),
+    'concat': (Augmentation(operator.add, '', str), lambda values: ''.join(map(str, values))),  # not commutative
+}
+
+
+@pytest.mark.parametrize('name', sorted(AUGMENTATIONS))
+def test_range_queries_follow_every_write(name):
+    aug, reference = AUGMENTATIONS[name]
+    rnd = random.Random(name)
+    lst = AVLTreeList(range(-50, 50), aug)
+    expected = list(range(-50, 50))
+    for step in range(400):
+        n = len(expected)
+        op = rnd.randrange(6)
+        if op == 0:
+            i = rnd.randint(0, n)
+            lst.insert(i, step)
+            expected.insert(i, step)
+        elif op == 1 and n:
+            i = rnd.randrange(n)
+            lst.delete(i)
+            del expected[i]
+        elif op == 2 and n:
+            i = rnd.randrange(n)
+            lst.delete(i)
+            lst.insert(i, -step)
+            expected[i] = -step
+        elif op == 3 and n:
+            i = rnd.randrange(n)
+            left, val, right = lst.split(i)
+            right.concat(left)
+            lst = right
+            expected = expected[i + 1:] + expected[:i]
+        elif op == 5 and n:
+            indices = [rnd.randrange(n) for _ in range(3)]
+            lst.setMany(indices, [step, -step, 2 * step])
+            for i, val in zip(indices, [step, -step, 2 * step]):
+                expected[i] = val
+        else:
+            i = rnd.randint(0, n)
+            lst.insertMany(i, range(3))
+            expected[i:i] = range(3)
+        i = rnd.randint(0, len(expected))
+        j = rnd.randint(i, len(expected))
+        assert lst.rangeQuery(i, j) == reference(expected[i:j])
+    assert lst.rangeQuery(0, len(expected)) == reference(expected)
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from AVLTreeList import ArrayAVLTreeList, AVLTreeList, ChunkedAVLTreeList
+
+
+def randomBatch(expected, k, rnd):
+    ops = []
+    for _ in range(k):
+        n = len(expected)
+        choice = rnd.randrange(3)
+        if choice == 0 or n == 0:
+            i = rnd.randint(0, n)
+            ops.append(("insert", i, -i))
+            expected.insert(i, -i)
+        elif choice == 1:
+            i = rnd.randrange(n)
+            ops.append(("delete", i))
+            del expected[i]
+        else:
+            i = rnd.randrange(n)
+            ops.append(("set", i, 2 * i))
+            expected[i] = 2 * i
+    return ops
+
+
+@pytest.mark.parametrize('places', [0, AVLTreeList.BATCH_PLACES])
+def test_batch_matches_python_list(kind, make, places, monkeypatch):
+    for cls in (AVLTreeList, ArrayAVLTreeList):
+        monkeypatch.setattr(cls, 'BATCH_PLACES', places)  # 0 plans every batch
+    rnd = random.Random(kind)
+    for n in (0, 1, 10, 200):
+        lst = make(range(n))
+        expected = list(range(n))
+        for k in (1, 5, 50, 300):
+            ops = randomBatch(expected, k, rnd)
+            lst.applyBatch(iter(ops))
+            assert lst.listToArray() == expected
+        if kind == 'augmented':
+            assert lst.rangeQuery(0, len(expected)) == sum(expected)
+
+
+def test_bad_batch_leaves_list_unchanged(make):
+    lst = make(range(5))
+    with pytest.raises(IndexError):
+        lst.applyBatch([("insert", 5, 0), ("delete", 0), ("set", 5, 0)])
+    with pytest.raises(ValueError):
+        lst.applyBatch([("delete", 0), ("move", 0, 1)])
+    assert lst.listToArray() == list(range(5))
+
+
+def test_batch_fixes_every_ancestor_once():
+    ops = [("insert", 1000 + j, j) for j in range(1000)] + [("delete", 10) for _ in range(500)]
+    lst = AVLTreeList(range(1000))
+    expected = AVLTreeList(range(1000))
+    counter = sum(expected.insert(op[1], op[2]) if op[0] == "insert" else expected.delete(op[1]) for op in ops)
+    assert lst.applyBatch(ops) * 10 < counter
+    assert lst.listToArray() == expected.listToArray()
+
+
+def test_chunked_set_keeps_chunks():
+    lst = ChunkedAVLTreeList(range(100), chunkSize=8)
+    chunks = [len(node.value) for node in lst.iterNodes(lst.root)]
+    lst.applyBatch([("set", i, -i) for i in range(0, 100, 3)])
+    assert [len(node.value) for node in lst.iterNodes(lst.root)] == chunks
+    assert lst.listToArray() == [-i if i % 3 == 0 else i for i in range(100)]
+
+
+def test_only_runs_are_planned():
+    lst = AVLTreeList(range(1000))
+    assert not lst.scatteredBatch([("insert", 500, j) for j in range(100)])
+    assert not lst.scatteredBatch([("insert", 500 + j, j) for j in range(100)] + [("delete", 10)] * 100)
+    assert lst.scatteredBatch([("insert", 7 * j, j) for j in range(100)])
+    assert lst.scatteredBatch([("set", j, j) for j in range(100)])
+    ops = [("insert", 500, 0), ("delete", 20), ("set", 300, 1)] * 30 + [("insert", 400 + j, j) for j in range(300)]
+    expected = AVLTreeList(range(1000))
+    expected.applyInOrder(ops)
+    assert not lst.scatteredBatch(ops)
+    lst.applyBatch(ops)
+    assert lst.listToArray() == expected.listToArray()
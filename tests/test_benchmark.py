@@ -0,0 +1,65 @@
+import functools
+import json
+import random
+
+import pytest
+
+import benchmark
+
+
+@pytest.mark.parametrize('name', ['list', 'BlockList'])
+def test_baselines_behave_like_the_list(name, monkeypatch):
+    monkeypatch.setattr(benchmark.BlockList, 'LOAD', 4)  # small blocks, so the edits cross block boundaries
+    rnd = random.Random(0)
+    lst = benchmark.SUITE_STRUCTURES[name](range(50))
+    expected = list(range(50))
+    for step in range(500):
+        n = len(expected)
+        op = rnd.randrange(4)
+        if op == 0 or n < 2:
+            i = rnd.randint(0, n)
+            lst.insert(i, -step)
+            expected.insert(i, -step)
+        elif op == 1:
+            i = rnd.randrange(n)
+            lst.delete(i)
+            del expected[i]
+        elif op == 2:
+            i = rnd.randrange(n)
+            left, val, right = lst.split(i)
+            assert (left.listToArray(), val, right.listToArray()) == (expected[:i], expected[i], expected[i + 1:])
+            left.insert(len(left), val)
+            left.concat(right)
+            lst = left
+        else:
+            i = rnd.randrange(n)
+            assert lst.retrieve(i) == expected[i] and lst.search(expected[i]) == expected.index(expected[i])
+        assert lst.listToArray() == expected and len(lst) == len(expected)
+        assert (lst.first(), lst.last()) == (expected[0], expected[-1])
+
+
+def test_suite_saves_and_checks_results(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(benchmark, 'nanosPerOp', functools.partial(benchmark.nanosPerOp, budget=0))
+    path = str(tmp_path / 'results.json')
+    assert benchmark.benchSuite([100], jsonPath=path, repeats=1) == 0
+    with open(path) as f:
+        saved = json.load(f)
+    operations = set(r['operation'] for r in saved['results'])
+    assert {'insert_random', 'split', 'concat', 'search', 'first'} <= operations
+    assert set(r['structure'] for r in saved['results']) == set(benchmark.SUITE_STRUCTURES)
+    for r in saved['results']:  # a baseline ten times faster than any run
+        r['ns'] /= 10
+    with open(path, 'w') as f:
+        json.dump(saved, f)
+    assert benchmark.benchSuite([100], baselinePath=path, repeats=1) == 1
+    reported = [line for line in capsys.readouterr().out.splitlines() if line.startswith('REGRESSION')]
+    assert reported and all(line.split()[1] in benchmark.TRACKED_STRUCTURES for line in reported)
+
+
+def test_regressions_respect_the_threshold():
+    baseline = [{"structure": "AVLTreeList", "n": 10, "operation": "split", "ns": 100.0},
+                {"structure": "list", "n": 10, "operation": "split", "ns": 100.0}]
+    results = [{"structure": "AVLTreeList", "n": 10, "operation": "split", "ns": 120.0},
+               {"structure": "list", "n": 10, "operation": "split", "ns": 500.0}]
+    assert benchmark.regressions(results, baseline, 0.25) == []
+    assert benchmark.regressions(results, baseline, 0.1) == [("AVLTreeList", 10, "split", 100.0, 120.0)]
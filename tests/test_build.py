@@ -0,0 +1,37 @@
+import operator
+
+import pytest
+
+from AVLTreeList import Augmentation, AVLTreeList
+
+
+def checkAVL(node):
+    if node.isVirtual():
+        return -1, 0
+    leftHeight, leftSize = checkAVL(node.left)
+    rightHeight, rightSize = checkAVL(node.right)
+    for child in (node.left, node.right):
+        assert child.isVirtual() or child.parent is node
+    assert abs(leftHeight - rightHeight) <= 1
+    assert node.height == max(leftHeight, rightHeight) + 1 and node.size == leftSize + rightSize + 1
+    return node.height, node.size
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 3, 7, 8, 9, 100, 1023, 1024, 5000])
+def test_build_from_a_generator_is_balanced(n):
+    lst = AVLTreeList(val for val in range(n))
+    checkAVL(lst.root)
+    assert lst.root.parent is None
+    assert lst.listToArray() == list(range(n))
+    assert lst.length() == n
+    assert AVLTreeList.fromIterable(iter(range(n))).listToArray() == list(range(n))
+
+
+def test_build_makes_no_rotation():
+    lst = AVLTreeList()
+    lst.enableStats()
+    lst.build(range(3000))
+    assert lst.getStats()['rotations'] == {'single': 0, 'double': 0, 'treap': 0}
+    checkAVL(lst.root)
+    augmented = AVLTreeList(range(3000), Augmentation(operator.add, 0))
+    assert augmented.rangeQuery(0, 3000) == sum(range(3000))
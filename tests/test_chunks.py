@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from AVLTreeList import ChunkedAVLTreeList
+
+
+@pytest.mark.parametrize('typecode', [None, 'l'])
+def test_structural_edits_keep_chunks_half_full(typecode):
+    rnd = random.Random(0)
+    chunkSize = 16
+    lst = ChunkedAVLTreeList(range(chunkSize * 40), chunkSize, typecode)
+    expected = list(range(chunkSize * 40))
+    for step in range(2000):
+        n = len(expected)
+        op = rnd.randrange(4)
+        if op == 0:
+            i = rnd.randint(0, n)
+            values = list(range(rnd.randrange(1, 20)))
+            lst.insertMany(i, values)
+            expected[i:i] = values
+        elif op == 1 and n > 10:
+            i = rnd.randrange(n - 5)
+            j = i + rnd.randrange(1, 5)
+            lst.deleteRange(i, j)
+            del expected[i:j]
+        elif op == 2:
+            left, right = lst.splitBefore(rnd.randint(0, n))[:2]
+            left.joinList(right)
+            lst = left
+        else:
+            lengths = [rnd.randrange(5) for _ in range(3)]
+            lst.concatAll([ChunkedAVLTreeList(range(m), chunkSize, typecode) for m in lengths])
+            for m in lengths:
+                expected.extend(range(m))
+        assert lst.listToArray() == expected
+        chunks = [len(node.value) for node in lst.iterNodes(lst.root)]
+        assert len(chunks) == 1 or min(chunks) >= chunkSize // 2
+
+
+@pytest.mark.parametrize('typecode', [None, 'l'])
+def test_deletes_merge_emptied_chunks(typecode):
+    chunkSize = 64
+    lst = ChunkedAVLTreeList(range(chunkSize * 100), chunkSize, typecode)
+    for k in range(100):  # empties every chunk but one item, from left to right
+        for _ in range(chunkSize - 1):
+            lst.delete(k + 1 if k + 1 < lst.length() else k)
+    assert lst.listToArray() == list(range(0, chunkSize * 100, chunkSize))
+    chunks = [len(node.value) for node in lst.iterNodes(lst.root)]
+    assert len(chunks) <= 100 // (chunkSize // 4) + 1
+
+
+def test_node_per_value_features_raise_type_error():
+    lst = ChunkedAVLTreeList(range(10), 4)
+    with pytest.raises(TypeError):
+        lst.enableIndex()
+    with pytest.raises(TypeError):
+        lst.cursor()
+
+
+@pytest.mark.parametrize('typecode', [None, 'l'])
+def test_chunked_list_matches_python_list(typecode):
+    rnd = random.Random(0)
+    chunkSize = 16
+    lst = ChunkedAVLTreeList(range(chunkSize * 40), chunkSize, typecode)
+    expected = list(range(chunkSize * 40))
+    for step in range(2000):
+        n = len(expected)
+        op = rnd.randrange(5)
+        if op == 0 or n == 0:
+            i = rnd.randint(0, n)
+            lst.insert(i, step)
+            expected.insert(i, step)
+        elif op == 1:
+            i = rnd.randrange(n)
+            lst.delete(i)
+            del expected[i]
+        elif op == 2:
+            i = rnd.randint(0, n)
+            values = list(range(rnd.randrange(1, 20)))
+            lst.insertMany(i, values)
+            expected[i:i] = values
+        elif op == 3:
+            i = rnd.randint(0, n)
+            j = rnd.randint(i, min(n, i + 20))
+            lst.deleteRange(i, j)
+            del expected[i:j]
+        else:
+            i = rnd.randrange(n)
+            left, val, right = lst.split(i)
+            left.insert(left.length(), val)
+            left.concat(right)
+            lst = left
+        assert lst.listToArray() == expected
+    assert [lst.retrieve(i) for i in range(len(expected))] == expected
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from AVLTreeList import AVLTreeList
+
+
+def checkAVL(node):
+    if node.isVirtual():
+        return -1, 0
+    leftHeight, leftSize = checkAVL(node.left)
+    rightHeight, rightSize = checkAVL(node.right)
+    for child in (node.left, node.right):
+        assert child.isVirtual() or child.parent is node
+    assert abs(leftHeight - rightHeight) <= 1
+    assert node.height == max(leftHeight, rightHeight) + 1 and node.size == leftSize + rightSize + 1
+    return node.height, node.size
+
+
+@pytest.mark.without('array')  # array lists have no concatAll
+@pytest.mark.parametrize('stream', [False, True])
+def test_concat_all_matches_sequential_concat(kind, make, stream):
+    rnd = random.Random(kind)
+    for count in (0, 1, 2, 10, 100):
+        lengths = [rnd.choice([0, 1, 2, 5, 50, 300]) for _ in range(count + 1)]
+        starts = [sum(lengths[:k]) for k in range(count + 1)]
+        lists = [make(range(start, start + m)) for start, m in zip(starts, lengths)]
+        lst = lists[0]
+        if stream:
+            lst.concatStream(fragment for fragment in lists[1:])
+        else:
+            lst.concatAll(lists[1:])
+        assert lst.listToArray() == list(range(sum(lengths)))
+        assert all(fragment.length() == 0 for fragment in lists[1:])
+        if kind == 'avl':
+            checkAVL(lst.root)
+        if kind == 'augmented':
+            assert lst.rangeQuery(0, lst.length()) == sum(range(sum(lengths)))
+
+
+def test_bad_list_leaves_every_list_unchanged():
+    lst = AVLTreeList(range(5))
+    others = [AVLTreeList(range(3)), AVLTreeList(range(2), balance="wavl")]
+    with pytest.raises(ValueError):
+        lst.concatAll(others)
+    frozen = AVLTreeList(range(4)).snapshot()
+    with pytest.raises(TypeError):
+        lst.concatAll([others[0], frozen])
+    assert lst.listToArray() == list(range(5)) and others[0].listToArray() == list(range(3))
+    assert others[1].listToArray() == list(range(2)) and frozen.listToArray() == list(range(4))
+
+
+@pytest.mark.without('array')  # array lists have no snapshots
+@pytest.mark.parametrize('stream', [False, True])
+def test_concat_all_with_snapshots_of_the_lists(kind, make, stream):
+    rnd = random.Random(kind)
+    for _ in range(100):
+        lengths = [rnd.choice([0, 1, 2, 5, 20]) for _ in range(rnd.randint(2, 6))]
+        starts = [sum(lengths[:k]) for k in range(len(lengths))]
+        lists = [make(range(start, start + m)) for start, m in zip(starts, lengths)]
+        snapshots = [(fragment.snapshot(), fragment.listToArray()) for fragment in lists if rnd.random() < 0.5]
+        lst = lists[0]
+        if stream:
+            lst.concatStream(fragment for fragment in lists[1:])
+        else:
+            lst.concatAll(lists[1:])
+        expected = list(range(sum(lengths)))
+        for _ in range(10):
+            if expected and rnd.random() < 0.5:
+                i = rnd.randrange(len(expected))
+                lst.delete(i)
+                del expected[i]
+            else:
+                i = rnd.randint(0, len(expected))
+                lst.insert(i, -1)
+                expected.insert(i, -1)
+            assert lst.listToArray() == expected
+        for snapshot, values in snapshots:
+            assert snapshot.listToArray() == values
@@ -0,0 +1,187 @@
+import random
+import sys
+import threading
+
+import pytest
+
+from AVLTreeList import (AffineMap, ArrayAVLTreeList, AVLTreeList, ConcurrentAVLTreeList, ConcurrentCursor,
+                         TaggedAVLTreeList)
+
+
+@pytest.fixture(autouse=True)
+def frequentSwitches():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # lets the threads interleave inside single reads
+    yield
+    sys.setswitchinterval(interval)
+
+
+def readConcurrently(shared, expected, threads=8, reads=2000):
+    errors = []
+
+    def reader(seed):
+        rnd = random.Random(seed)
+        try:
+            for _ in range(reads):
+                i = rnd.randrange(len(expected))
+                if shared.retrieve(i) != expected[i]:
+                    errors.append((i, expected[i]))
+        except Exception as error:
+            errors.append(error)
+    workers = [threading.Thread(target=reader, args=(seed,)) for seed in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return errors
+
+
+def test_tagged_reads():
+    n = 3000
+    lst = TaggedAVLTreeList(range(n))
+    expected = list(range(n))
+    rnd = random.Random(0)
+    for _ in range(50):
+        i = rnd.randrange(n)
+        j = rnd.randrange(i, n + 1)
+        lst.reverseRange(i, j)
+        expected[i:j] = expected[i:j][::-1]
+        i = rnd.randrange(n)
+        j = rnd.randrange(i, n + 1)
+        lst.mapRange(i, j, AffineMap(1, 1))
+        expected[i:j] = [x + 1 for x in expected[i:j]]
+    shared = ConcurrentAVLTreeList(lst)
+    assert readConcurrently(shared, expected) == []
+    assert shared.listToArray() == expected
+
+
+def test_lazy_reads(tmp_path):
+    n = 20000
+    path = str(tmp_path / "list")
+    AVLTreeList(range(n)).dump(path, 'q')
+    shared = ConcurrentAVLTreeList(AVLTreeList.load(path, mmap=True))
+    assert readConcurrently(shared, list(range(n))) == []
+    assert shared.listToArray() == list(range(n))
+
+
+def test_stats_reads():
+    n = 1000
+    lst = AVLTreeList(range(n))
+    lst.enableStats()
+    shared = ConcurrentAVLTreeList(lst)
+    assert readConcurrently(shared, list(range(n)), threads=8, reads=1000) == []
+    assert lst.getStats()['calls']['retrieve'] == 8 * 1000
+
+
+def test_slices_are_shared_lists():
+    shared = ConcurrentAVLTreeList(AVLTreeList(range(10)))
+    for part in (shared[2:8:2], shared.slice(2, 5)):
+        assert isinstance(part, ConcurrentAVLTreeList) and part.lock is not shared.lock
+    part = shared[2:5]
+    part.append(10)
+    assert part.listToArray() == [2, 3, 4, 10] and shared.listToArray() == list(range(10))
+
+
+def test_reads_during_writes():
+    n = 1000
+    shared = ConcurrentAVLTreeList(AVLTreeList(range(n)))
+    done = threading.Event()
+
+    def writer():
+        k = 0
+        while not done.is_set():
+            shared.insert(n, k)  # after the items the readers check, and rotated through them
+            shared.delete(n)
+            k += 1
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        assert readConcurrently(shared, list(range(n)), threads=4, reads=1000) == []
+    finally:
+        done.set()
+        thread.join()
+    assert shared.listToArray() == list(range(n)) and len(shared) == n
+
+
+@pytest.mark.parametrize('stats', [False, True])
+def test_array_slices_under_their_own_locks(stats):
+    lst = ArrayAVLTreeList(range(50))
+    if stats:
+        lst.enableStats()
+    shared = ConcurrentAVLTreeList(lst)
+    errors = []
+
+    def slicer():
+        try:
+            for k in range(200):
+                part = shared[0:50]
+                part.append(k)  # under the lock of part only
+                if part.listToArray() != list(range(50)) + [k]:
+                    errors.append(k)
+        except Exception as error:
+            errors.append(error)
+
+    def writer():
+        try:
+            for k in range(200):
+                shared.insert(50, k)  # after the slices, and rotated through them
+                shared.delete(50)
+        except Exception as error:
+            errors.append(error)
+    workers = [threading.Thread(target=slicer) for _ in range(6)] + [threading.Thread(target=writer)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert errors == [] and shared.listToArray() == list(range(50))
+
+
+def test_cursors_take_the_lock():
+    n = 1000
+    shared = ConcurrentAVLTreeList(AVLTreeList(range(n)))
+    errors = []
+
+    def writer(cursor, start):
+        try:
+            for k in range(300):
+                cursor.insertBefore(-k)
+                cursor.moveBy(-1)
+                cursor.delete()  # back on the item it started on
+                if cursor.getValue() != start:
+                    errors.append((start, k))
+        except Exception as error:
+            errors.append(error)
+
+    def walker():
+        cursor = shared.cursor(0)
+        try:
+            for _ in range(3):
+                cursor.moveTo(0)
+                for k in range(n // 2):
+                    if cursor.getValue() != k:
+                        errors.append(k)
+                    cursor.moveBy(1)
+        except Exception as error:
+            errors.append(error)
+    workers = [threading.Thread(target=writer, args=(shared.cursor(start), start)) for start in (600, 700, 800)]
+    workers += [threading.Thread(target=walker) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert errors == [] and shared.listToArray() == list(range(n))
+    cursor = shared.cursor(5)
+    assert isinstance(cursor, ConcurrentCursor)
+    values = []
+    shared.lock.acquireWrite()
+    try:
+        worker = threading.Thread(target=lambda: values.append(cursor.getValue()))
+        worker.start()
+        worker.join(0.2)
+        assert worker.is_alive() and values == []  # waits for the lock
+    finally:
+        shared.lock.releaseWrite()
+    worker.join()
+    assert values == [5]
+    with pytest.raises(TypeError):
+        ConcurrentAVLTreeList(TaggedAVLTreeList(range(5))).cursor()
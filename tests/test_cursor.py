@@ -0,0 +1,48 @@
+import random
+
+from AVLTreeList import AVLTreeList
+
+
+def test_cursor_matches_python_list():
+    rnd = random.Random(0)
+    lst = AVLTreeList(range(300))
+    expected = list(range(300))
+    cursor = lst.cursor(150)
+    index = 150
+    for step in range(3000):
+        op = rnd.randrange(6)
+        if op == 0:
+            k = rnd.randint(-min(index, 20), min(len(expected) - index, 20))
+            cursor.moveBy(k)
+            index += k
+        elif op == 1:
+            cursor.insertBefore(-step)
+            expected.insert(index, -step)
+            index += 1
+        elif op == 2 and index < len(expected):
+            cursor.insertAfter(-step)
+            expected.insert(index + 1, -step)
+        elif op == 3 and index < len(expected):
+            cursor.delete()
+            del expected[index]
+        elif op == 4 and index < len(expected):
+            cursor.setValue(step)
+            expected[index] = step
+        else:
+            index = rnd.randint(0, len(expected))
+            cursor.moveTo(index)
+        assert cursor.getIndex() == index
+        assert cursor.atEnd() == (index == len(expected))
+        assert cursor.getValue() == (expected[index] if index < len(expected) else None)
+    assert lst.listToArray() == expected
+
+
+def test_cursor_stays_on_its_item():
+    lst = AVLTreeList(range(100))
+    cursor = lst.cursor(50)
+    for i in range(40):
+        lst.insert(0, -i)
+        lst.delete(lst.length() - 1)
+        lst.insert(lst.length() // 3, -i)
+    assert cursor.getValue() == 50
+    assert lst.retrieve(cursor.getIndex()) == 50
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from AVLTreeList import AVLNode, AVLTreeList, ChunkedAVLTreeList
+
+
+@pytest.mark.parametrize('typecode', [None, 'q', 'd'])
+@pytest.mark.parametrize('mmap', [False, True])
+def test_dump_and_load_round_trip(tmp_path, typecode, mmap):
+    path = str(tmp_path / 'list')
+    values = list(range(-500, 500)) if typecode != 'd' else [k / 4 for k in range(1000)]
+    if typecode is None:
+        values = [(k, str(k)) for k in values]
+    AVLTreeList(values).dump(path, typecode)
+    lst = AVLTreeList.load(path, mmap)
+    assert lst.retrieve(700) == values[700]
+    assert lst.length() == len(values)
+    assert lst.listToArray() == values
+    rnd = random.Random(0)
+    for _ in range(200):  # writes to a lazy list load the nodes they reach
+        i = rnd.randrange(lst.length())
+        lst.delete(i)
+        del values[i]
+        lst.insert(i // 2, -1)
+        values.insert(i // 2, -1)
+    assert lst.listToArray() == values
+
+
+def test_load_checks_the_file(tmp_path):
+    path = str(tmp_path / 'list')
+    with open(path, 'wb') as f:
+        f.write(b'not a list file at all')
+    with pytest.raises(ValueError):
+        AVLTreeList.load(path)
+    AVLTreeList(range(10)).dump(path)
+    with pytest.raises(ValueError):
+        ChunkedAVLTreeList.load(path, mmap=True)
+    assert ChunkedAVLTreeList.load(path).listToArray() == list(range(10))
+
+
+@pytest.mark.parametrize('typecode', [None, 'q'])
+def test_dump_over_the_mapped_file(tmp_path, typecode):
+    path = str(tmp_path / 'list')
+    AVLTreeList(range(1000)).dump(path, typecode)
+    lst = AVLTreeList.load(path, mmap=True)
+    assert lst.retrieve(10) == 10
+    lst.insert(0, -1)
+    lst.dump(path, typecode)  # the list keeps reading the old file while the new one is written
+    assert lst.listToArray() == [-1] + list(range(1000))
+    assert AVLTreeList.load(path).listToArray() == [-1] + list(range(1000))
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ['list']
+
+
+def test_close_loads_the_rest_and_closes_the_map(tmp_path):
+    path = str(tmp_path / 'list')
+    AVLTreeList(range(1000)).dump(path, 'q')
+    lst = AVLTreeList.load(path, mmap=True)
+    source = AVLNode.left.__get__(lst.getRoot())[0]
+    snapshot = lst.snapshot()
+    lst.close()
+    assert source.buffer.closed and not lst.readsWrite()
+    assert lst.listToArray() == snapshot.listToArray() == list(range(1000))
+    other = AVLTreeList.load(path, mmap=True)
+    source = AVLNode.left.__get__(other.getRoot())[0]
+    left, val, right = other.split(500)
+    left.close()
+    assert not source.buffer.closed  # right still has nodes in the file
+    right.close()
+    assert source.buffer.closed
+    assert left.listToArray() + [val] + right.listToArray() == list(range(1000))
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from AVLTreeList import AVLTreeList
+
+
+def test_ends_follow_every_write(kind, make):
+    rnd = random.Random(kind)
+    lst = make(range(20))
+    expected = list(range(20))
+    for step in range(3000):
+        n = len(expected)
+        op = rnd.randrange(6)
+        if op == 0:
+            lst.append(step)
+            expected.append(step)
+        elif op == 1:
+            lst.appendleft(step)
+            expected.insert(0, step)
+        elif op == 2 and n:
+            assert lst.pop() == expected.pop()
+        elif op == 3 and n:
+            assert lst.popleft() == expected.pop(0)
+        elif op == 4:
+            i = rnd.randint(0, n)
+            lst.insert(i, step)
+            expected.insert(i, step)
+        elif n:
+            i = rnd.randrange(n)
+            lst.delete(i)
+            del expected[i]
+        assert lst.first() == (expected[0] if expected else None)
+        assert lst.last() == (expected[-1] if expected else None)
+    assert lst.listToArray() == expected
+    while expected:
+        assert lst.popleft() == expected.pop(0)
+    with pytest.raises(IndexError):
+        lst.pop()
+    with pytest.raises(IndexError):
+        lst.popleft()
+
+
+def test_cached_ends_survive_split_and_concat():
+    rnd = random.Random(0)
+    lst = AVLTreeList(range(100))
+    expected = list(range(100))
+    for _ in range(300):
+        i = rnd.randrange(len(expected))
+        left, val, right = lst.split(i)
+        for part, values in ((left, expected[:i]), (right, expected[i + 1:])):
+            assert (part.first(), part.last()) == ((values[0], values[-1]) if values else (None, None))
+        right.append(val)
+        right.concat(left)
+        expected = expected[i + 1:] + [expected[i]] + expected[:i]
+        lst = right
+        assert lst.firstNode() is lst.getMin(lst.root) and lst.lastNode() is lst.getMax(lst.root)
+    assert lst.listToArray() == expected
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from AVLTreeList import AVLTreeList
+
+
+@pytest.mark.parametrize('byEquality', [True, False])
+def test_index_follows_every_write(byEquality):
+    rnd = random.Random(0)
+    values = ['v%d' % k for k in range(20)]
+    lst = AVLTreeList(rnd.choice(values) for _ in range(200))
+    lst.enableIndex(byEquality)
+    expected = lst.listToArray()
+    for step in range(500):
+        op = rnd.randrange(7)
+        n = len(expected)
+        if op == 0:
+            i = rnd.randint(0, n)
+            val = rnd.choice(values)
+            lst.insert(i, val)
+            expected.insert(i, val)
+        elif op == 1 and n:
+            i = rnd.randrange(n)
+            lst.delete(i)
+            del expected[i]
+        elif op == 2 and n:
+            i = rnd.randrange(n)
+            val = rnd.choice(values)
+            lst.delete(i)
+            lst.insert(i, val)
+            expected[i] = val
+        elif op == 3 and n:
+            i = rnd.randrange(n)
+            left, val, right = lst.split(i)
+            left.concat(right)
+            left.insert(left.length(), val)
+            lst = left
+            expected = expected[:i] + expected[i + 1:] + [expected[i]]
+        elif op == 4:
+            i = rnd.randint(0, n)
+            j = rnd.randint(i, n)
+            lst.deleteRange(i, j)
+            del expected[i:j]
+        elif op == 6 and n:
+            indices = [rnd.randrange(n) for _ in range(3)]
+            block = [rnd.choice(values) for _ in indices]
+            lst.setMany(indices, block)
+            for i, val in zip(indices, block):
+                expected[i] = val
+        else:
+            i = rnd.randint(0, n)
+            block = [rnd.choice(values) for _ in range(5)]
+            lst.insertMany(i, block)
+            expected[i:i] = block
+        val = rnd.choice(values)
+        assert lst.indexOfAll(val) == [k for k, item in enumerate(expected) if item is val]
+        assert lst.search(val) == (expected.index(val) if val in expected else -1)
+        assert (val in lst) == (val in expected)
+    for node in lst.iterNodes(lst.root):
+        assert expected[lst.rank(node)] is node.value
+
+
+def test_identity_and_equality_matching():
+    a, b = [1], [1]
+    lst = AVLTreeList([a, b, a])
+    lst.enableIndex()
+    assert lst.indexOfAll(a) == [0, 2] and lst.search(b) == 1 and [1] not in lst
+    lst.disableIndex()
+    assert lst.search(b) == 1 and lst.indexOfAll(a) == [0, 2]
+    hashable = AVLTreeList([(1,), (2,), (1,)])
+    hashable.enableIndex(True)
+    assert hashable.indexOfAll((1,)) == [0, 2]
@@ -0,0 +1,38 @@
+import random
+
+from AVLTreeList import AVLTreeList
+
+
+def checkAVL(node):
+    if node.isVirtual():
+        return -1, 0
+    leftHeight, leftSize = checkAVL(node.left)
+    rightHeight, rightSize = checkAVL(node.right)
+    for child in (node.left, node.right):
+        assert child.isVirtual() or child.parent is node
+    assert abs(leftHeight - rightHeight) <= 1
+    assert node.height == max(leftHeight, rightHeight) + 1 and node.size == leftSize + rightSize + 1
+    return node.height, node.size
+
+
+def test_insert_many_matches_python_list():
+    rnd = random.Random(0)
+    lst = AVLTreeList(range(20))
+    expected = list(range(20))
+    for step in range(300):
+        i = rnd.randint(0, len(expected))
+        values = [(step, k) for k in range(rnd.choice([0, 1, 2, 5, 40]))]
+        lst.insertMany(i, (val for val in values))
+        expected[i:i] = values
+        checkAVL(lst.root)
+        assert lst.root.parent is None
+    assert lst.listToArray() == expected
+
+
+def test_insert_many_keeps_the_index():
+    lst = AVLTreeList(['a', 'b', 'c'])
+    lst.enableIndex(True)
+    lst.insertMany(1, ['x', 'y', 'x'])
+    lst.insertMany(6, ['z'])
+    assert lst.listToArray() == ['a', 'x', 'y', 'x', 'b', 'c', 'z']
+    assert lst.indexOfAll('x') == [1, 3] and lst.search('z') == 6 and lst.search('c') == 5
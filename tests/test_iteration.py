@@ -0,0 +1,25 @@
+import random
+
+import pytest
+
+from AVLTreeList import AVLTreeList, ChunkedAVLTreeList, TaggedAVLTreeList
+
+
+@pytest.mark.parametrize('make', [AVLTreeList, TaggedAVLTreeList, lambda values: ChunkedAVLTreeList(values, 8)],
+                         ids=['avl', 'tagged', 'chunked'])
+def test_iteration_matches_python_list(make):
+    rnd = random.Random(0)
+    for n in (0, 1, 2, 10, 1000):
+        lst = make(range(n))
+        expected = list(range(n))
+        for _ in range(n // 10):
+            i = rnd.randrange(len(expected))
+            lst.delete(i)
+            del expected[i]
+        assert list(lst) == expected
+        assert list(reversed(lst)) == expected[::-1]
+        assert len(lst) == len(expected)
+        for _ in range(20):
+            i = rnd.randint(0, len(expected))
+            j = rnd.randint(i, len(expected))
+            assert list(lst.iterRange(i, j)) == expected[i:j]
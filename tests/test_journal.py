@@ -0,0 +1,114 @@
+import asyncio
+import random
+from contextlib import aclosing
+
+from AVLTreeList import AffineMap, AVLTreeList, Journal, TaggedAVLTreeList
+
+
+def test_replay_covers_map_range(tmp_path):
+    path = str(tmp_path / 'tagged.journal')
+    lst = TaggedAVLTreeList(range(5))
+    lst.enableJournal(path)
+    lst.mapRange(0, 5, AffineMap(2, 0))
+    lst.insert(1, 0)
+    lst.reverseRange(2, 6)
+    lst.disableJournal()
+    assert TaggedAVLTreeList.replay(path).listToArray() == lst.listToArray()
+
+
+def test_replay_covers_cursor_writes(tmp_path):
+    path = str(tmp_path / 'cursor.journal')
+    rnd = random.Random(0)
+    lst = AVLTreeList(range(50))
+    lst.enableJournal(path)
+    cursor = lst.cursor(10)
+    writes = 0
+    for step in range(300):
+        op = rnd.randrange(5)
+        if op == 0 or lst.length() == 0:
+            cursor.insertBefore(step)
+        elif op == 1 and not cursor.atEnd():
+            cursor.insertAfter(step)
+        elif op == 2 and not cursor.atEnd():
+            cursor.delete()
+        elif op == 3 and not cursor.atEnd():
+            cursor.setValue(-step)
+        else:
+            cursor.moveTo(rnd.randint(0, lst.length()))
+            continue
+        writes += 1
+        assert len(list(Journal.read(path))) == writes + 1  # flushed once written, after the build change
+    assert AVLTreeList.replay(path).listToArray() == lst.listToArray()
+    lst.disableJournal()
+
+
+def test_concat_stream_is_recorded_as_it_is_read(tmp_path):
+    path = str(tmp_path / 'stream.journal')
+    lst = AVLTreeList(range(3))
+    lst.enableJournal(path)
+    seen = []
+
+    def fragments():
+        for k in range(4):
+            seen.append(len(list(Journal.read(path))))
+            yield AVLTreeList(range(10 * k, 10 * k + k))
+        yield AVLTreeList([0], balance="wavl")  # rejected: the lists before it stay joined
+    try:
+        lst.concatStream(fragments())
+    except ValueError:
+        pass
+    assert seen == [1, 2, 3, 4]
+    lst.concat(AVLTreeList([-1]))
+    lst.concatAll([AVLTreeList([-2]), AVLTreeList([-3, -4])])
+    changes = list(Journal.read(path))[1:]
+    assert changes == [('concat', [])] + [('concat', list(range(10 * k, 10 * k + k))) for k in range(1, 4)] + \
+        [('concat', [-1]), ('concat', [-2]), ('concat', [-3, -4])]
+    assert AVLTreeList.replay(path).listToArray() == lst.listToArray()
+
+
+def test_replay_matches_the_list(tmp_path):
+    path = str(tmp_path / 'list.journal')
+    rnd = random.Random(0)
+    lst = AVLTreeList(range(50))
+    lst.enableJournal(path)
+    for step in range(500):
+        n = lst.length()
+        op = rnd.randrange(6)
+        if op == 0 or n == 0:
+            lst.insert(rnd.randint(0, n), step)
+        elif op == 1:
+            lst.delete(rnd.randrange(n))
+        elif op == 2:
+            lst.append(step)
+        elif op == 3:
+            lst.popleft()
+        elif op == 4:
+            lst.insertMany(rnd.randint(0, n), range(step, step + 3))
+        else:
+            i = rnd.randint(0, n)
+            lst.deleteRange(i, rnd.randint(i, n))
+    lst.disableJournal()
+    assert AVLTreeList.replay(path).listToArray() == lst.listToArray()
+
+
+def test_changes_feed_a_replica():
+    async def follow(lst, replica, count):
+        async with aclosing(lst.changes()) as changes:
+            async for change in changes:
+                replica.applyChange(change)
+                count -= 1
+                if count == 0:
+                    return
+
+    async def main():
+        lst = AVLTreeList(range(5))
+        replica = AVLTreeList(range(5))
+        follower = asyncio.ensure_future(follow(lst, replica, 3))
+        await asyncio.sleep(0)  # lets the follower subscribe
+        lst.insert(0, -1)
+        lst.delete(3)
+        lst.append(9)
+        await follower
+        assert replica.listToArray() == lst.listToArray() == [-1, 0, 1, 3, 4, 9]
+        assert lst.journal is None  # the list stops journaling once its last subscription ends
+    asyncio.run(main())
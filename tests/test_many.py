@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from AVLTreeList import AVLTreeList
+
+
+def test_many_matches_python_list(kind, make):
+    rnd = random.Random(kind)
+    for n in (1, 7, 300):
+        lst = make(range(n))
+        expected = list(range(n))
+        for k in (0, 1, 5, 100, 1000):
+            indices = [rnd.randrange(-n, n) for _ in range(k)]
+            assert lst.retrieveMany(indices) == [expected[i] for i in indices]
+            values = [rnd.randrange(1000) for _ in indices]
+            lst.setMany(indices, values)
+            for i, val in zip(indices, values):
+                expected[i] = val
+            assert lst.listToArray() == expected
+        if kind == 'augmented':
+            assert lst.rangeQuery(0, n) == sum(expected)
+
+
+def test_bad_indices_leave_list_unchanged(make):
+    lst = make(range(10))
+    with pytest.raises(IndexError):
+        lst.retrieveMany([0, 10])
+    with pytest.raises(IndexError):
+        lst.setMany([3, -11], [1, 2])
+    with pytest.raises(ValueError):
+        lst.setMany([1, 2, 3], [1, 2])
+    assert lst.listToArray() == list(range(10))
+
+
+def test_numpy_indices_and_values():
+    numpy = pytest.importorskip('numpy')
+    lst = AVLTreeList(range(100))
+    indices = numpy.array([5, -1, 42, 5])
+    result = lst.retrieveMany(indices, asArray=True)
+    assert isinstance(result, numpy.ndarray) and result.tolist() == [5, 99, 42, 5]
+    lst.setMany(indices, numpy.array([1, 2, 3, 4]))
+    assert lst.retrieveMany([5, 99, 42]) == [4, 2, 3]
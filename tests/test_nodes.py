@@ -0,0 +1,34 @@
+import pytest
+
+from AVLTreeList import AVLNode, AVLTreeList, VIRTUAL
+
+
+def test_missing_children_share_the_virtual_leaf():
+    lst = AVLTreeList()
+    for i in range(200):
+        lst.insert(i // 2, i)
+    for i in range(0, 100, 3):
+        lst.delete(i)
+    left, val, right = lst.split(40)
+    left.concat(right)
+    nodes = [left.root]
+    for node in nodes:  # grows level by level as it is walked
+        nodes.extend(child for child in (node.left, node.right) if child.isRealNode())
+    assert len(nodes) == left.length() == 165
+    leaves = [child for node in nodes for child in (node.left, node.right) if child.isVirtual()]
+    assert len(leaves) == len(nodes) + 1
+    assert all(child is VIRTUAL for child in leaves)
+    assert VIRTUAL.parent is None and VIRTUAL.height == -1 and VIRTUAL.size == 0
+
+
+def test_virtual_leaf_is_immutable_and_nodes_have_slots():
+    with pytest.raises(AttributeError):
+        VIRTUAL.parent = AVLNode(0)
+    with pytest.raises(AttributeError):
+        VIRTUAL.size = 1
+    node = AVLNode(1)
+    node.makeReal()
+    assert node.left is VIRTUAL and node.right is VIRTUAL
+    assert not hasattr(node, '__dict__')
+    with pytest.raises(AttributeError):
+        node.extra = 1
@@ -0,0 +1,26 @@
+import operator
+from functools import reduce
+
+import pytest
+
+from AVLTreeList import ArrayAVLTreeList, Augmentation, AVLTreeList, ChunkedAVLTreeList
+
+
+@pytest.mark.parametrize('typecode', [None, 'q'])
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parallel_matches_sequential(workers, typecode):
+    for n in (0, 1, 1001):
+        lst = AVLTreeList(range(n), Augmentation(operator.add, 0))
+        mapped = lst.parallelMap(operator.neg, workers, typecode)
+        assert mapped.listToArray() == [-val for val in range(n)]
+        assert mapped.augmentation is lst.augmentation and mapped.rangeQuery(0, n) == -sum(range(n))
+        assert lst.parallelReduce(operator.add, 0, workers, typecode) == sum(range(n))
+        assert lst.parallelReduce(max, float('-inf'), workers) == reduce(max, range(n), float('-inf'))
+
+
+@pytest.mark.parametrize('make', [lambda values: ChunkedAVLTreeList(values, chunkSize=8), ArrayAVLTreeList])
+def test_parallel_keeps_the_list_kind(make):
+    lst = make(range(100))
+    mapped = lst.parallelMap(abs, 2)
+    assert type(mapped) is type(lst) and mapped.listToArray() == list(range(100))
+    assert lst.parallelReduce(operator.add, 0, 2) == sum(range(100))
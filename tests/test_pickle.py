@@ -0,0 +1,38 @@
+import operator
+import pickle
+
+from AVLTreeList import Augmentation, AVLTreeList
+
+
+def test_augmented_list_round_trip():
+    lst = AVLTreeList(range(100), Augmentation(operator.add, 0))
+    lst.enableStats()
+    copy = pickle.loads(pickle.dumps(lst))
+    assert copy.listToArray() == list(range(100))
+    assert copy.rangeQuery(10, 20) == sum(range(10, 20))
+    assert copy.nodeClass is copy.augmentation.nodeClass
+    assert copy.root.augmentation is copy.augmentation
+    copy.insert(0, 1000)
+    copy.delete(50)
+    values = copy.listToArray()
+    assert copy.rangeQuery(0, len(values)) == sum(values)
+    assert lst.rangeQuery(0, 100) == sum(range(100))
+
+
+def test_lists_sharing_an_augmentation():
+    aug = Augmentation(max, float('-inf'), abs)
+    left, right = pickle.loads(pickle.dumps([AVLTreeList([-5, 2], aug), AVLTreeList([3, -1], aug)]))
+    assert left.augmentation is right.augmentation
+    left.concat(right)
+    assert left.listToArray() == [-5, 2, 3, -1]
+    assert left.rangeQuery(1, 4) == 3
+
+
+def test_list_round_trip():
+    lst = AVLTreeList(range(100000))
+    copy = pickle.loads(pickle.dumps(lst))
+    assert copy.listToArray() == list(range(100000))
+    copy.insert(500, -1)
+    copy.delete(0)
+    assert copy.retrieve(499) == -1 and copy.length() == 100000
+    assert lst.listToArray() == list(range(100000))
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from AVLTreeList import AVLTreeList
+
+
+def checkAVL(node):
+    if node.isVirtual():
+        return -1, 0
+    leftHeight, leftSize = checkAVL(node.left)
+    rightHeight, rightSize = checkAVL(node.right)
+    for child in (node.left, node.right):
+        assert child.isVirtual() or child.parent is node
+    assert abs(leftHeight - rightHeight) <= 1
+    assert node.height == max(leftHeight, rightHeight) + 1 and node.size == leftSize + rightSize + 1
+    return node.height, node.size
+
+
+def test_ranges_match_python_list():
+    rnd = random.Random(0)
+    lst = AVLTreeList(range(2000))
+    expected = list(range(2000))
+    for step in range(200):
+        n = len(expected)
+        i = rnd.randint(0, n)
+        j = rnd.randint(i, min(n, i + 50))
+        op = rnd.randrange(3)
+        if op == 0:
+            lst.deleteRange(i, j)
+            del expected[i:j]
+        elif op == 1:
+            extracted = lst.extractRange(i, j)
+            assert extracted.listToArray() == expected[i:j]
+            checkAVL(extracted.root)
+            del expected[i:j]
+        else:
+            copied = lst.slice(i, j)
+            assert copied.listToArray() == expected[i:j]
+            copied.insert(0, -1)
+        checkAVL(lst.root)
+        assert lst.listToArray() == expected
+
+
+@pytest.mark.parametrize('step', [1, 2, 3, -1, -4])
+def test_slice_syntax(step):
+    rnd = random.Random(step)
+    for _ in range(50):
+        n = rnd.randrange(30)
+        lst = AVLTreeList(range(n))
+        expected = list(range(n))
+        key = slice(rnd.randint(-n - 3, n + 3), rnd.randint(-n - 3, n + 3), step)
+        assert lst[key].listToArray() == expected[key]
+        del lst[key]
+        del expected[key]
+        assert lst.listToArray() == expected
+        checkAVL(lst.root)
+        if expected:
+            i = rnd.randrange(-len(expected), len(expected))
+            assert lst[i] == expected[i]
+            del lst[i]
+            del expected[i]
+            assert lst.listToArray() == expected
+    with pytest.raises(IndexError):
+        AVLTreeList(range(3))[3]
@@ -0,0 +1,54 @@
+import operator
+import random
+
+from AVLTreeList import Augmentation, AVLTreeList
+
+
+def checkAVL(node):
+    if node.isVirtual():
+        return -1, 0
+    leftHeight, leftSize = checkAVL(node.left)
+    rightHeight, rightSize = checkAVL(node.right)
+    for child in (node.left, node.right):
+        assert child.isVirtual() or child.parent is node
+    assert abs(leftHeight - rightHeight) <= 1
+    assert node.height == max(leftHeight, rightHeight) + 1 and node.size == leftSize + rightSize + 1
+    return node.height, node.size
+
+
+def test_early_stop_counts_like_a_full_climb():
+    rnd = random.Random(0)
+    lst = AVLTreeList(range(200))
+    full = AVLTreeList(range(200), Augmentation(operator.add, 0))  # climbs to the root through FixTree
+    expected = list(range(200))
+    for step in range(3000):
+        if rnd.random() < 0.5 or len(expected) < 2:
+            i = rnd.randint(0, len(expected))
+            assert lst.insert(i, step) == full.insert(i, step)
+            expected.insert(i, step)
+        else:
+            i = rnd.randrange(len(expected))
+            assert lst.delete(i) == full.delete(i)
+            del expected[i]
+        assert lst.root.parent is None
+        checkAVL(lst.root)
+    assert lst.listToArray() == full.listToArray() == expected
+    assert full.rangeQuery(0, len(expected)) == sum(expected)
+
+
+def test_cursors_stay_on_their_items_through_deletes():
+    rnd = random.Random(1)
+    lst = AVLTreeList(range(500))
+    expected = list(range(500))
+    kept = set(rnd.sample(range(500), 20))
+    cursors = [lst.cursor(i) for i in sorted(kept)]
+    while len(expected) > len(kept):
+        i = rnd.randrange(len(expected))
+        if expected[i] in kept:
+            continue
+        lst.delete(i)
+        del expected[i]
+        checkAVL(lst.root)
+        for cursor in cursors:
+            assert expected[cursor.getIndex()] == cursor.getValue()
+    assert [cursor.getValue() for cursor in cursors] == sorted(kept) == expected
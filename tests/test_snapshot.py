@@ -0,0 +1,181 @@
+import random
+
+import pytest
+
+from AVLTreeList import AffineMap, AVLTreeList, TaggedAVLTreeList
+
+
+def randomWrite(lst, expected, rnd):
+    n = len(expected)
+    op = rnd.randrange(8)
+    if op == 0 or n == 0:
+        i = rnd.randint(0, n)
+        lst.insert(i, -i)
+        expected.insert(i, -i)
+    elif op == 1:
+        i = rnd.randrange(n)
+        lst.delete(i)
+        del expected[i]
+    elif op == 2:
+        lst.append(n)
+        expected.append(n)
+    elif op == 3:
+        assert lst.popleft() == expected.pop(0)
+    elif op == 4:
+        i = rnd.randint(0, n)
+        values = list(range(rnd.randrange(5)))
+        lst.insertMany(i, values)
+        expected[i:i] = values
+    elif op == 5:
+        i = rnd.randint(0, n)
+        j = rnd.randint(i, n)
+        lst.deleteRange(i, j)
+        del expected[i:j]
+    elif op == 6:
+        indices = [rnd.randrange(n) for _ in range(3)]
+        lst.setMany(indices, [7] * 3)
+        for i in indices:
+            expected[i] = 7
+    elif isinstance(lst, TaggedAVLTreeList):
+        i = rnd.randint(0, n)
+        j = rnd.randint(i, n)
+        lst.mapRange(i, j, AffineMap(2, 1))
+        expected[i:j] = [2 * x + 1 for x in expected[i:j]]
+    else:
+        i = rnd.randrange(n)
+        left, val, right = lst.split(i)
+        left.append(val)
+        left.concat(right)
+        return left
+    return lst
+
+
+@pytest.mark.without('array')  # array lists have no snapshots
+def test_snapshots_never_change(kind, make):
+    rnd = random.Random(kind)
+    lst = make(range(100))
+    expected = list(range(100))
+    snapshots = []
+    for step in range(600):
+        if step % 20 == 0:
+            snapshots.append((lst.snapshot(), list(expected)))
+        lst = randomWrite(lst, expected, rnd)
+        assert lst.listToArray() == expected
+    for snapshot, values in snapshots:
+        assert snapshot.listToArray() == values
+        assert list(reversed(snapshot)) == values[::-1]
+        assert list(snapshot.iterRange(1, len(values) - 1)) == values[1:-1]
+
+
+def test_write_copies_only_its_path():
+    lst = AVLTreeList(range(1 << 16))
+    snapshot = lst.snapshot()
+    generation = lst.generation
+    lst.insert(30000, -1)
+    assert lst.generation - generation <= lst.root.getHeight() + 1  # every copy moves the generation
+    generation = lst.generation
+    lst.insert(30000, -2)
+    assert lst.generation - generation <= 2  # the path is already copied, but for a rotation
+    assert snapshot.length() == 1 << 16 and snapshot.retrieve(30000) == 30000
+
+
+def test_cursors_and_snapshots():
+    lst = AVLTreeList(range(10))
+    cursor = lst.cursor(3)
+    snapshot = lst.snapshot()
+    cursor.insertBefore(-1)
+    cursor.setValue(-3)
+    assert cursor.getIndex() == 4
+    assert lst.listToArray() == [0, 1, 2, -1, -3, 4, 5, 6, 7, 8, 9]
+    assert snapshot.listToArray() == list(range(10))
+    lst.snapshot()
+    lst.setMany([cursor.getIndex()], [0])  # copies the node of the cursor
+    with pytest.raises(RuntimeError):
+        cursor.getValue()
+    frozen = snapshot.cursor(2)
+    frozen.moveBy(5)
+    assert (frozen.getIndex(), frozen.getValue()) == (7, 7)
+    with pytest.raises(IndexError):
+        frozen.moveBy(4)
+    with pytest.raises(TypeError):
+        snapshot.rank(snapshot.getRoot())
+
+
+def test_cursors_above_the_write_path():
+    lst = AVLTreeList(range(15))
+    cursor = lst.cursor(3)
+    snapshot = lst.snapshot()
+    lst.setMany([2], ['x'])  # copies the node of the cursor and the nodes below it on the path to 2
+    with pytest.raises(RuntimeError):
+        cursor.getValue()
+    with pytest.raises(RuntimeError):
+        cursor.setValue('y')
+    cursor.moveTo(3)
+    cursor.setValue('y')
+    assert lst.listToArray() == [0, 1, 'x', 'y'] + list(range(4, 15))
+    assert snapshot.listToArray() == list(range(15))
+
+
+@pytest.mark.parametrize('balance', ['avl', 'wavl', 'treap'])
+def test_cursors_stay_valid_or_raise_after_snapshots(balance):
+    rnd = random.Random(balance)
+    lst = AVLTreeList(range(64), balance=balance)
+    expected = list(range(64))
+    snapshots = []
+    cursor, index = lst.cursor(10), 10
+    for step in range(2000):
+        if rnd.random() < 0.05:
+            snapshots.append((lst.snapshot(), list(expected)))
+        op = rnd.randrange(3)
+        i = rnd.randrange(len(expected))
+        if op == 0:
+            lst.insert(i, -step)
+            expected.insert(i, -step)
+            index += i <= index
+        elif op == 1 and i != index:
+            lst.delete(i)
+            del expected[i]
+            index -= i < index
+        else:
+            lst.setMany([i], [-step])
+            expected[i] = -step
+        try:
+            assert (cursor.getIndex(), cursor.getValue()) == (index, expected[index])
+        except RuntimeError:
+            cursor.moveTo(index)
+        if rnd.random() < 0.2:
+            index = rnd.randrange(len(expected))
+            cursor.moveTo(index)
+    assert lst.listToArray() == expected
+    for snapshot, values in snapshots:
+        assert snapshot.listToArray() == values
+
+
+def test_epochs_are_per_list():
+    lst = AVLTreeList(range(1000))
+    other = AVLTreeList(range(1000))
+    snapshot = other.snapshot()
+    generation = lst.generation
+    lst.insert(500, -1)
+    assert lst.generation == generation  # the snapshot of another list shares none of its nodes
+    other.insert(500, -1)
+    assert other.generation > 0
+    del snapshot
+    generation = other.generation
+    other.insert(200, -2)
+    other.delete(700)
+    assert other.generation == generation  # no snapshot is left to share its nodes
+
+
+@pytest.mark.without('array')
+def test_joined_lists_keep_their_snapshots(kind, make):
+    rnd = random.Random(kind)
+    lst = make(range(50))
+    other = make(range(100, 150))
+    snapshot = other.snapshot()
+    lst.concat(other)
+    expected = list(range(50)) + list(range(100, 150))
+    for _ in range(100):
+        lst = randomWrite(lst, expected, rnd)
+    assert lst.listToArray() == expected
+    assert snapshot.listToArray() == list(range(100, 150))
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from AVLTreeList import AVLTreeList
+
+
+def checkAVL(node):
+    if node.isVirtual():
+        return -1, 0
+    leftHeight, leftSize = checkAVL(node.left)
+    rightHeight, rightSize = checkAVL(node.right)
+    for child in (node.left, node.right):
+        assert child.isVirtual() or child.parent is node
+    assert abs(leftHeight - rightHeight) <= 1
+    assert node.height == max(leftHeight, rightHeight) + 1 and node.size == leftSize + rightSize + 1
+    return node.height, node.size
+
+
+@pytest.mark.parametrize('n', [1, 2, 5, 33])
+def test_split_at_every_index(n):
+    for i in range(n):
+        left, val, right = AVLTreeList(range(n)).split(i)
+        assert (left.listToArray(), val, right.listToArray()) == (list(range(i)), i, list(range(i + 1, n)))
+        checkAVL(left.root)
+        checkAVL(right.root)
+        assert left.root.parent is None and right.root.parent is None
+
+
+def test_concat_returns_the_height_difference():
+    rnd = random.Random(0)
+    for _ in range(100):
+        m, n = rnd.choice([0, 1, 3, 100, 3000]), rnd.choice([0, 1, 3, 100, 3000])
+        left, right = AVLTreeList(range(m)), AVLTreeList(range(m, m + n))
+        diff = abs(left.root.getHeight() - right.root.getHeight())
+        assert left.concat(right) == diff
+        assert left.listToArray() == list(range(m + n))
+        checkAVL(left.root)
+
+
+def test_split_and_concat_round_trip():
+    rnd = random.Random(1)
+    lst = AVLTreeList(range(500))
+    expected = list(range(500))
+    for _ in range(200):
+        i = rnd.randrange(len(expected))
+        left, val, right = lst.split(i)
+        right.insert(right.length(), val)
+        right.concat(left)
+        lst = right
+        expected = expected[i + 1:] + [expected[i]] + expected[:i]
+        checkAVL(lst.root)
+    assert lst.listToArray() == expected
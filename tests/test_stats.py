@@ -0,0 +1,48 @@
+import pickle
+
+import pytest
+
+from AVLTreeList import AVLTreeList, ChunkedAVLTreeList, TreapNode
+
+
+@pytest.mark.parametrize('lst', [AVLTreeList(range(1000)), AVLTreeList(range(1000), balance="wavl"),
+                                 ChunkedAVLTreeList(range(1000), chunkSize=8)], ids=['avl', 'wavl', 'chunked'])
+def test_every_descent_is_counted(lst):
+    lst.enableStats()
+    for i in range(100, 200):
+        lst.insert(i, -i)
+        lst.delete(2 * i)
+        lst.retrieve(i)
+    depths = lst.getStats()['descentDepth']
+    assert sum(depths.values()) == 300
+    assert max(depths) <= lst.root.getHeight()
+
+
+def test_allocations_keep_the_node_class():
+    lst = AVLTreeList(range(10), balance="treap")
+    lst.enableStats()
+    lst.insert(3, -1)
+    lst.append(-2)
+    assert lst.getStats()['allocations'] == 2
+    assert issubclass(lst.nodeClass, TreapNode) and isinstance(lst.root, TreapNode)
+    copy = pickle.loads(pickle.dumps(lst))
+    assert copy.nodeClass is TreapNode and copy.listToArray() == lst.listToArray()
+    lst.disableStats()
+    assert lst.nodeClass is TreapNode
+
+
+def test_stats_count_calls_rotations_and_allocations():
+    timed = []
+    lst = AVLTreeList()
+    lst.enableStats(lambda name, seconds: timed.append(name))
+    for i in range(100):
+        lst.insert(i, i)  # every insert at the end rotates, but for the first ones
+    for i in range(50):
+        lst.retrieve(i)
+    stats = lst.getStats()
+    assert stats['calls']['insert'] == 100 and stats['calls']['retrieve'] == 50
+    assert sum(stats['latency']['insert'].values()) == 100 and timed.count('insert') == 100
+    assert stats['allocations'] == 100 and stats['rotations']['single'] > 0
+    lst.disableStats()
+    assert lst.getStats() is None and 'insert' not in lst.__dict__
+    assert lst.listToArray() == list(range(100))
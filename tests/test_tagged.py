@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from AVLTreeList import AffineMap, TaggedAVLTreeList
+
+
+def test_range_tags_match_python_list():
+    rnd = random.Random(0)
+    lst = TaggedAVLTreeList(range(300))
+    expected = list(range(300))
+    snapshot = lst.snapshot()
+    for _ in range(500):
+        n = len(expected)
+        i = rnd.randint(0, n)
+        j = rnd.randint(i, n)
+        op = rnd.randrange(4)
+        if op == 0:
+            lst.reverseRange(i, j)
+            expected[i:j] = expected[i:j][::-1]
+        elif op == 1:
+            lst.mapRange(i, j, AffineMap(2, -1))
+            expected[i:j] = [2 * val - 1 for val in expected[i:j]]
+        elif op == 2:
+            lst.insert(i, -i)
+            expected.insert(i, -i)
+        elif n:
+            lst.delete(i % n)
+            del expected[i % n]
+        if rnd.random() < 0.1:
+            k = rnd.randrange(len(expected))
+            assert lst.retrieve(k) == expected[k]
+    assert lst.listToArray() == expected
+    assert snapshot.listToArray() == list(range(300))
+
+
+def test_node_per_value_features_raise_type_error():
+    lst = TaggedAVLTreeList(range(10))
+    with pytest.raises(TypeError):
+        lst.enableIndex()
+    with pytest.raises(TypeError):
+        lst.cursor()
@@ -0,0 +1,56 @@
+import random
+
+from AVLTreeList import AVLTreeList
+
+
+def checkTreap(node):
+    if node.isVirtual():
+        return -1, 0
+    leftHeight, leftSize = checkTreap(node.left)
+    rightHeight, rightSize = checkTreap(node.right)
+    for child in (node.left, node.right):
+        assert child.isVirtual() or (child.priority <= node.priority and child.parent is node)
+    assert node.height == max(leftHeight, rightHeight) + 1 and node.size == leftSize + rightSize + 1
+    return node.height, node.size
+
+
+def test_every_rotation_is_counted():
+    rnd = random.Random(0)
+    lst = AVLTreeList(range(500), balance="treap")
+    rotations = [0]
+
+    def counting(rotate):
+        def countedRotate(node):
+            rotations[0] += 1
+            rotate(node)
+        return countedRotate
+    lst.rotateLeft = counting(lst.rotateLeft)
+    lst.rotateRight = counting(lst.rotateRight)
+    lst.enableStats()
+    returned = 0
+    for _ in range(2000):
+        if rnd.random() < 0.5:
+            returned += lst.insert(rnd.randint(0, lst.length()), 0)
+        else:
+            returned += lst.delete(rnd.randrange(lst.length()))
+    assert returned == rotations[0]
+    assert lst.getStats()['rotations'] == {'single': 0, 'double': 0, 'treap': rotations[0]}
+
+
+def test_split_and_concat_keep_heap_order():
+    rnd = random.Random(1)
+    lst = AVLTreeList(range(1000), balance="treap")
+    expected = list(range(1000))
+    checkTreap(lst.root)
+    for _ in range(200):
+        i = rnd.randrange(len(expected))
+        left, val, right = lst.split(i)
+        checkTreap(left.root)
+        checkTreap(right.root)
+        assert (left.listToArray(), val, right.listToArray()) == (expected[:i], expected[i], expected[i + 1:])
+        right.concat(left)
+        right.append(val)
+        expected = expected[i + 1:] + expected[:i + 1]
+        lst = right
+        checkTreap(lst.root)
+    assert lst.listToArray() == expected